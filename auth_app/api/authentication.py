@@ -1,13 +1,21 @@
 """Custom JWT authentication for handling token-based authentication via cookies.
 
 This module extends the Django REST Framework Simple JWT authentication to support
-token extraction from cookies, with added logging for debugging and monitoring.
+token extraction from cookies. Outcomes are recorded as counters in core.metrics
+and failures are logged through a rate-limited sampler instead of per request.
+Depending on the JWT_USER_RESOLUTION setting, users are loaded from the database,
+built from the token claims or resolved through the user cache.
 """
 
 import logging
+from core import metrics
+from django.conf import settings
 from django.utils.translation import gettext_lazy as _
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework_simplejwt.exceptions import InvalidToken, AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from ..user_cache import get_cached_user
+from .tokens import ClaimsTokenUser, has_user_claims
 
 logger = logging.getLogger(__name__)
 
@@ -30,24 +38,56 @@ class CookieJWTAuthentication(JWTAuthentication):
         if header is None:
             # Check for access token in cookies if no Authorization header
             raw_token = request.COOKIES.get('access_token')
-            if raw_token is None:
-                logger.warning("No access token found in cookies")
-                return None
         else:
             # Extract raw token from Authorization header
             raw_token = self.get_raw_token(header)
 
         if raw_token is None:
-            logger.warning("No token found in header or cookies")
+            metrics.increment('auth.missing_token')
             return None
 
         try:
             # Validate token and retrieve associated user
             validated_token = self.get_validated_token(raw_token)
             user = self.get_user(validated_token)
-            logger.info(f"Successfully authenticated user: {user.username}")
-            return user, validated_token
         except (InvalidToken, AuthenticationFailed) as e:
-            # Log token validation errors (e.g., expired or invalid token)
-            logger.error(f"Token validation failed: {str(e)}")
-            return None
\ No newline at end of file
+            # Count token validation errors (e.g., expired or invalid token) and log a sample
+            metrics.increment('auth.invalid_token')
+            metrics.log_sampled(logger, logging.WARNING, 'auth.invalid_token', 'Token validation failed: %s', e)
+            return None
+        metrics.increment('auth.success')
+        return user, validated_token
+
+    def get_user(self, validated_token):
+        """Resolve the user of a validated token according to JWT_USER_RESOLUTION.
+
+        In 'token' mode, tokens issued before user claims were embedded fall back
+        to the database lookup.
+
+        Args:
+            validated_token: The validated access token.
+
+        Returns:
+            User or ClaimsTokenUser: The authenticated user.
+
+        Raises:
+            InvalidToken: If the token contains no user identifier.
+            AuthenticationFailed: If the user does not exist or is inactive.
+        """
+        mode = getattr(settings, 'JWT_USER_RESOLUTION', 'db')
+        if mode == 'token' and has_user_claims(validated_token):
+            user = ClaimsTokenUser(validated_token)
+        elif mode == 'cache':
+            try:
+                user_id = validated_token[api_settings.USER_ID_CLAIM]
+            except KeyError:
+                raise InvalidToken(_("Token contained no recognizable user identification"))
+            user = get_cached_user(user_id)
+            if user is None:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        else:
+            return super().get_user(validated_token)
+
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user
@@ -7,8 +7,13 @@ authentication.
 
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
 from rest_framework import serializers
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework.settings import api_settings
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from ..hashers import verify_password
+from ..users import get_user_by_email
+from .tokens import UserClaimsRefreshToken
 
 
 class RegistrationSerializer(serializers.ModelSerializer):
@@ -22,7 +27,9 @@ class RegistrationSerializer(serializers.ModelSerializer):
         extra_kwargs = {'password': {'write_only': True}}
 
     def validate(self, attrs):
-        """Validate that passwords match and email is unique.
+        """Validate that passwords match.
+
+        Email uniqueness is enforced by the database index when the user is created.
 
         Args:
             attrs (dict): The input data to validate.
@@ -31,14 +38,11 @@ class RegistrationSerializer(serializers.ModelSerializer):
             dict: Validated attributes.
 
         Raises:
-            ValidationError: If passwords don't match or email already exists.
+            ValidationError: If passwords don't match.
         """
         if attrs['password'] != attrs['confirmed_password']:
             raise ValidationError("Passwords do not match")
         
-        if User.objects.filter(email=attrs['email']).exists():
-            raise ValidationError("Email already exists")
-        
         return attrs
 
     def create(self, validated_data):
@@ -49,6 +53,9 @@ class RegistrationSerializer(serializers.ModelSerializer):
 
         Returns:
             User: The created user instance.
+
+        Raises:
+            ValidationError: If the email (or username) already exists.
         """
         user = User(
             username=validated_data['email'],  # Use email as username
@@ -56,7 +63,11 @@ class RegistrationSerializer(serializers.ModelSerializer):
         )
         user.set_password(validated_data['password'])
         user.is_active = False  # Require activation before login
-        user.save()
+        try:
+            with transaction.atomic():
+                user.save()  # The unique email index rejects duplicates without a prior lookup
+        except IntegrityError:
+            raise serializers.ValidationError({api_settings.NON_FIELD_ERRORS_KEY: ["Email already exists"]})
         return user
 
 
@@ -80,18 +91,17 @@ class CookieTokenObtainPairSerializers(serializers.Serializer):
         email = attrs.get("email")
         password = attrs.get("password")
 
-        try:
-            user = User.objects.get(email=email)
-        except User.DoesNotExist:
+        user = get_user_by_email(email)
+        if user is None:
             raise serializers.ValidationError("Wrong email or password")
 
-        if not user.check_password(password):
+        if not verify_password(user, password):  # Hashes on the bounded pool and upgrades old hashes
             raise serializers.ValidationError("Wrong email or password")
 
         if not user.is_active:
             raise serializers.ValidationError("Account not activated")
 
-        refresh = RefreshToken.for_user(user)
+        refresh = UserClaimsRefreshToken.for_user(user)  # Embeds user claims for stateless auth
         return {
             'refresh': str(refresh),
             'access': str(refresh.access_token),
@@ -99,6 +109,11 @@ class CookieTokenObtainPairSerializers(serializers.Serializer):
         }
 
 
+class CookieTokenRefreshSerializer(TokenRefreshSerializer):
+    """Serializer for token refresh that checks the blacklist through Redis."""
+    token_class = UserClaimsRefreshToken
+
+
 class PasswordResetSerializer(serializers.Serializer):
     """Serializer for initiating a password reset via email."""
     email = serializers.EmailField(required=True)
@@ -0,0 +1,182 @@
+"""Redis sliding-window throttles for the authentication endpoints.
+
+Each throttle check is a single atomic Lua call that trims a per-key sorted set
+of request timestamps to the current window, counts it and records the request
+if it is within the limit. Memory per key is bounded by the rate limit. Views opt
+in by setting `throttle_scope`; rates are read from DEFAULT_THROTTLE_RATES under
+`<scope>_ip`, `<scope>_email` and `<scope>_lockout`, and accept a period
+multiplier such as '5/15m'. Client IPs only honour X-Forwarded-For for as many
+proxies as REST_FRAMEWORK['NUM_PROXIES'] trusts. While Redis is unreachable the
+throttles fail open and log a warning, so authentication keeps working unthrottled.
+"""
+
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django_redis import get_redis_connection
+from redis.exceptions import RedisError
+from rest_framework.throttling import SimpleRateThrottle
+import logging
+import re
+import uuid
+
+SLIDING_WINDOW_SCRIPT = """
+local now = redis.call('TIME')
+now = tonumber(now[1]) * 1000 + math.floor(tonumber(now[2]) / 1000)
+local limit, window, cost = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - window)
+if redis.call('ZCARD', KEYS[1]) < limit then
+    if cost > 0 then
+        redis.call('ZADD', KEYS[1], now, ARGV[4])
+        redis.call('PEXPIRE', KEYS[1], window)
+    end
+    return {1, 0}
+end
+local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+return {0, tonumber(oldest[2]) + window - now}
+"""
+
+RATE_PERIOD = re.compile(r'(\d*)([smhd])\w*')
+
+_script = None
+
+logger = logging.getLogger(__name__)
+
+
+def sliding_window(key, limit, window, cost=1):
+    """Check and record a request in a Redis sliding window.
+
+    Args:
+        key (str): The cache key of the window.
+        limit (int): The number of requests allowed per window.
+        window (int): The window length in seconds.
+        cost (int): 1 to record the request if allowed, 0 to only check the limit.
+
+    Returns:
+        tuple: (allowed, wait) where wait is the number of seconds until the
+            next request is allowed. Requests are allowed if Redis fails.
+    """
+    global _script
+    if _script is None:
+        _script = get_redis_connection('default').register_script(SLIDING_WINDOW_SCRIPT)
+    try:
+        allowed, wait_ms = _script(keys=[cache.make_key(key)], args=[limit, window * 1000, cost, uuid.uuid4().hex])
+    except RedisError as e:
+        logger.warning('Throttle %s not applied, Redis failed: %s', key, e)
+        return True, None
+    return bool(allowed), wait_ms / 1000
+
+
+class RedisSlidingWindowThrottle(SimpleRateThrottle):
+    """Scoped throttle counting requests in a Redis sliding window.
+
+    Subclasses set `suffix` and implement `get_ident_value` to choose what the
+    window is keyed by.
+    """
+    scope_attr = 'throttle_scope'
+    suffix = None
+    cost = 1
+
+    def __init__(self):
+        """Defer reading the rate until the view's scope is known."""
+        self.wait_seconds = None
+
+    def parse_rate(self, rate):
+        """Parse a rate like '10/m' or '5/15m' into (requests, seconds).
+
+        Raises:
+            ImproperlyConfigured: If the rate allows less than one request.
+        """
+        if rate is None:
+            return (None, None)
+        num, period = rate.split('/')
+        if int(num) < 1:
+            raise ImproperlyConfigured(f"Throttle rate '{rate}' must allow at least one request.")
+        multiplier, unit = RATE_PERIOD.fullmatch(period).groups()
+        return int(num), int(multiplier or 1) * {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}[unit]
+
+    def bind(self, view):
+        """Resolve scope and rate from the view; return False if the view is not throttled."""
+        scope = getattr(view, self.scope_attr, None)
+        if not scope:
+            return False
+        self.scope = f'{scope}_{self.suffix}'
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return True
+
+    def get_ident_value(self, request):
+        """Return the value the window is keyed by, or None to skip throttling."""
+        raise NotImplementedError
+
+    def get_cache_key(self, request, view):
+        """Return the cache key of the request's window."""
+        ident = self.get_ident_value(request)
+        if not ident:
+            return None
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
+
+    def allow_request(self, request, view):
+        """Check the request against the sliding window in one Redis call.
+
+        Args:
+            request: The HTTP request object.
+            view: The view handling the request.
+
+        Returns:
+            bool: True if the request is allowed.
+        """
+        if not self.bind(view):
+            return True
+        key = self.get_cache_key(request, view)
+        if key is None:
+            return True
+        allowed, self.wait_seconds = sliding_window(key, self.num_requests, self.duration, self.cost)
+        return allowed
+
+    def wait(self):
+        """Return the number of seconds until the next request is allowed."""
+        return self.wait_seconds
+
+
+class IPRateThrottle(RedisSlidingWindowThrottle):
+    """Throttle requests per client IP address."""
+    suffix = 'ip'
+
+    def get_ident_value(self, request):
+        """Return the client IP address, trusting X-Forwarded-For only as far as NUM_PROXIES."""
+        return self.get_ident(request)
+
+
+class EmailRateThrottle(RedisSlidingWindowThrottle):
+    """Throttle requests per submitted email address."""
+    suffix = 'email'
+
+    def get_ident_value(self, request):
+        """Return the normalized email address from the request body."""
+        email = request.data.get('email') if hasattr(request.data, 'get') else None
+        if not isinstance(email, str):
+            return None
+        return email.strip().lower()[:254] or None
+
+
+class LoginLockoutThrottle(EmailRateThrottle):
+    """Lock an email address out of login after too many failed attempts.
+
+    The throttle only checks the window; failures are recorded by the view
+    through `record_failure`.
+    """
+    suffix = 'lockout'
+    cost = 0
+
+    def record_failure(self, request, view):
+        """Record a failed login for the request's email address.
+
+        Args:
+            request: The HTTP request object.
+            view: The login view.
+        """
+        if not self.bind(view):
+            return
+        key = self.get_cache_key(request, view)
+        if key is not None:
+            sliding_window(key, self.num_requests, self.duration)
@@ -0,0 +1,76 @@
+"""JWT token classes carrying user claims for stateless authentication.
+
+This module extends Simple JWT's refresh token so that the tokens issued at login
+embed the user fields the API needs on every request. Access tokens created from
+such a refresh token copy those claims, which lets CookieJWTAuthentication build a
+lightweight user from the token alone instead of querying the database. Blacklist
+checks of these refresh tokens go through the Redis-backed blacklist service.
+"""
+
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from .. import blacklist
+
+USER_CLAIMS = ('username', 'is_active', 'is_staff')  # User fields embedded in issued tokens
+
+
+class UserClaimsRefreshToken(RefreshToken):
+    """Refresh token that embeds the user claims listed in USER_CLAIMS."""
+
+    def check_blacklist(self):
+        """Raise TokenError if the token is blacklisted, without querying the database.
+
+        Raises:
+            TokenError: If the token is blacklisted.
+        """
+        if blacklist.is_blacklisted(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self):
+        """Blacklist the token in Redis and in the token tables.
+
+        Returns:
+            tuple: The BlacklistedToken and whether it was created.
+        """
+        blacklist.add(self.payload[api_settings.JTI_CLAIM], self.payload['exp'])
+        return super().blacklist()
+
+    @classmethod
+    def for_user(cls, user):
+        """Create a refresh token for the user with the user claims attached.
+
+        Args:
+            user: The User instance the token is issued for.
+
+        Returns:
+            UserClaimsRefreshToken: The new refresh token.
+        """
+        token = super().for_user(user)
+        for claim in USER_CLAIMS:
+            token[claim] = getattr(user, claim)
+        return token
+
+
+class ClaimsTokenUser(TokenUser):
+    """Stateless user backed by the claims of a validated access token."""
+
+    @cached_property
+    def is_active(self):
+        """Return whether the user was active when the token was issued."""
+        return self.token.get('is_active', False)
+
+
+def has_user_claims(token):
+    """Return whether a token carries all claims needed for a token user.
+
+    Args:
+        token: The validated token.
+
+    Returns:
+        bool: True if every claim in USER_CLAIMS is present.
+    """
+    return all(claim in token for claim in USER_CLAIMS)
@@ -6,28 +6,31 @@ Framework and Simple JWT for token-based authentication.
 """
 
 from django.conf import settings
-from django.core.mail import send_mail 
-from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode 
-from django.utils.encoding import force_str, force_bytes 
+from django.utils.http import urlsafe_base64_decode 
+from django.utils.encoding import force_str 
 from django.contrib.auth.tokens import default_token_generator, PasswordResetTokenGenerator
 from django.contrib.auth.models import User  
 from rest_framework.views import APIView  
 from rest_framework.response import Response  
 from rest_framework import status  
 from rest_framework.permissions import AllowAny
+from rest_framework.exceptions import ValidationError
 from rest_framework_simplejwt.views import TokenRefreshView 
-from rest_framework_simplejwt.serializers import TokenRefreshSerializer
 from rest_framework_simplejwt.tokens import UntypedToken, TokenError  
 from rest_framework_simplejwt.exceptions import InvalidToken  
-from rest_framework_simplejwt.token_blacklist.models import OutstandingToken, BlacklistedToken 
-from .serializers import RegistrationSerializer, CookieTokenObtainPairSerializers, PasswordResetSerializer, PasswordConfirmSerializer  
-import django_rq
+from ..blacklist import blacklist_token
+from ..emails import send_templated_email, user_link
+from ..users import get_user_by_email
+from .throttling import EmailRateThrottle, IPRateThrottle, LoginLockoutThrottle
+from .serializers import RegistrationSerializer, CookieTokenObtainPairSerializers, CookieTokenRefreshSerializer, PasswordResetSerializer, PasswordConfirmSerializer  
 
 
 class RegistrationView(APIView):
     """Handle user registration via email and password."""
     authentication_classes = []  
     permission_classes = [AllowAny] 
+    throttle_classes = [IPRateThrottle, EmailRateThrottle]
+    throttle_scope = 'register'
 
     def post(self, request): 
         """Process registration requests and create inactive users.
@@ -79,6 +82,8 @@ class CookieTokenObtainPairView(APIView):
     """Handle user login with cookie-based JWT tokens."""
     authentication_classes = [] 
     permission_classes = [AllowAny]
+    throttle_classes = [IPRateThrottle, EmailRateThrottle, LoginLockoutThrottle]
+    throttle_scope = 'login'
 
     def post(self, request, *args, **kwargs):
         """Process login requests and set JWT tokens in cookies.
@@ -92,7 +97,11 @@ class CookieTokenObtainPairView(APIView):
             Response: Success response with user info and tokens set in cookies.
         """
         serializer = CookieTokenObtainPairSerializers(data=request.data)  
-        serializer.is_valid(raise_exception=True) 
+        try:
+            serializer.is_valid(raise_exception=True) 
+        except ValidationError:
+            LoginLockoutThrottle().record_failure(request, self)  # Count towards the email lockout
+            raise
         
         response = Response({  
             "detail": "Login successful",  
@@ -142,10 +151,7 @@ class LogoutView(APIView):
         except (InvalidToken, TokenError): 
             return Response({'detail': 'Invalid refresh token'}, status=status.HTTP_400_BAD_REQUEST)
 
-        # Blacklist the refresh token if it exists
-        outstanding_token = OutstandingToken.objects.filter(user_id=token['user_id'], token=refresh_token).first()
-        if outstanding_token:
-            BlacklistedToken.objects.get_or_create(token=outstanding_token)
+        blacklist_token(token)  # Blacklist the refresh token by its jti
 
         response = Response({'detail': 'Log-Out successfully! All Tokens will be deleted. Refresh token is now invalid.'})
         response.delete_cookie('access_token') 
@@ -169,7 +175,7 @@ class TokenRefreshViewCustom(TokenRefreshView):
         if not refresh_token: 
             return Response({"detail": "Refresh token missing."}, status=status.HTTP_400_BAD_REQUEST)
 
-        serializer = TokenRefreshSerializer(data={"refresh": refresh_token})
+        serializer = CookieTokenRefreshSerializer(data={"refresh": refresh_token})
 
         try:
             serializer.is_valid(raise_exception=True)
@@ -194,28 +200,22 @@ class TokenRefreshViewCustom(TokenRefreshView):
 
 
 def send_reset_email_task(instance):
-    """Queue a password reset email task for a user.
+    """Queue a password reset email for a user.
 
     Args:
         instance: The User instance to send the reset email for.
     """
-    uid = urlsafe_base64_encode(force_bytes(instance.pk))  
-    token = PasswordResetTokenGenerator().make_token(instance) 
-    frontend_url = 'http://localhost:5500'
-    reset_link = f"{frontend_url}/pages/auth/confirm_password.html?uid={uid}&token={token}"
-    send_mail(
-        'Reset Your Password', 
-        f'Click here to reset your password: {reset_link}',
-        settings.DEFAULT_FROM_EMAIL, 
-        [instance.email],
-    )
+    reset_link = user_link('/pages/auth/confirm_password.html', instance, PasswordResetTokenGenerator())
+    send_templated_email('password_reset', instance.email, {'link': reset_link})
 
 
 class PasswordResetView(APIView):
     """Handle password reset requests by sending reset emails."""
+    throttle_classes = [IPRateThrottle, EmailRateThrottle]
+    throttle_scope = 'password_reset'
 
     def post(self, request):
-        """Process password reset requests and queue email tasks.
+        """Process password reset requests and queue reset emails.
 
         Args:
             request: The HTTP request object containing the email.
@@ -226,25 +226,14 @@ class PasswordResetView(APIView):
         serializer = PasswordResetSerializer(data=request.data) 
         if serializer.is_valid():  
             email = serializer.validated_data['email']
-            try:
-                user = User.objects.get(email=email)  
-            except User.DoesNotExist:
-                user = None  
+            user = get_user_by_email(email)  # Single probe of the unique email index
 
             # Always simulate sending email, even for non-existent users
             if user:
-                if getattr(settings, 'TESTING', False): 
-                    send_reset_email_task(user)
-                else:
-                    django_rq.enqueue(send_reset_email_task, user)
+                send_reset_email_task(user)
             else:
                 # Simulate email for non-existent users to prevent enumeration
-                if getattr(settings, 'TESTING', False):
-                    send_mail('Reset Your Password', 'If an account exists, a reset link has been sent.', 
-                    settings.DEFAULT_FROM_EMAIL, [email])
-                else:
-                    django_rq.enqueue(send_mail, 'Reset Your Password', 'If an account exists, a reset link has been sent.', 
-                    settings.DEFAULT_FROM_EMAIL, [email])
+                send_templated_email('password_reset_unknown', email)
 
             return Response({'detail': 'An email has been sent to reset your password.'}, status=status.HTTP_200_OK)
 
@@ -0,0 +1,227 @@
+"""Redis-backed refresh token blacklist with an in-process Bloom filter.
+
+Blacklisted refresh tokens are stored in Redis as one key per jti that expires
+together with the token, and appended to a Redis stream. Every process keeps a
+Bloom filter of the blacklisted jtis that it updates from the stream at most once
+per TOKEN_BLACKLIST_SYNC_INTERVAL seconds, so most blacklist checks are answered
+without a database or Redis round trip. Only Bloom filter hits are confirmed
+against the per-jti key. While Redis is unavailable, checks fall back to the
+Simple JWT blacklist table, which every blacklisted token is also recorded in.
+A self-rescheduling RQ job prunes expired rows from the
+Simple JWT token tables in batches and trims the stream.
+"""
+
+from datetime import timedelta
+from django.conf import settings
+from django.core.cache import cache
+from django_redis import get_redis_connection
+from django_redis.exceptions import ConnectionInterrupted
+from redis.exceptions import RedisError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.utils import aware_utcnow
+import django_rq
+import hashlib
+import itertools
+import logging
+import math
+import threading
+import time
+
+PRUNE_JOB_ID = 'prune_expired_tokens'  # Fixed job ID so only one prune chain is scheduled
+REDIS_ERRORS = (RedisError, ConnectionInterrupted)  # Raised by raw connections and by the cache API
+
+logger = logging.getLogger(__name__)
+
+
+def blacklist_key(jti):
+    """Return the cache key marking a jti as blacklisted.
+
+    Args:
+        jti (str): The token identifier.
+
+    Returns:
+        str: The cache key for the jti.
+    """
+    return f'token_blacklist:{jti}'
+
+
+def stream_key():
+    """Return the Redis key of the stream of blacklisted jtis."""
+    return cache.make_key('token_blacklist:stream')
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings."""
+
+    def __init__(self, capacity, error_rate):
+        """Size the filter for the expected number of items and false positive rate.
+
+        Args:
+            capacity (int): The expected number of items.
+            error_rate (float): The accepted false positive rate at capacity.
+        """
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item):
+        """Yield the bit positions of an item using double hashing."""
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+        for index in range(self.hash_count):
+            yield (first + index * second) % self.size
+
+    def add(self, item):
+        """Add an item to the filter."""
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item):
+        """Return False if the item was never added, True if it probably was."""
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class BlacklistFilter:
+    """Process-local Bloom filter kept in sync with the blacklist stream."""
+
+    def __init__(self):
+        """Create an empty filter that syncs on first use."""
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Drop the filter contents and force a full rebuild on the next sync."""
+        self.bloom = BloomFilter(settings.TOKEN_BLACKLIST_BLOOM_CAPACITY, settings.TOKEN_BLACKLIST_BLOOM_ERROR_RATE)
+        self.last_id = '-'
+        self.next_sync = 0.0
+        self.next_rebuild = time.monotonic() + settings.TOKEN_BLACKLIST_REBUILD_INTERVAL
+
+    def sync(self):
+        """Read new stream entries into the filter if the sync interval has passed."""
+        now = time.monotonic()
+        if now < self.next_sync:
+            return
+        with self.lock:
+            if now < self.next_sync:
+                return
+            if now >= self.next_rebuild:
+                self.reset()  # Rebuild periodically so pruned jtis leave the filter
+            connection = get_redis_connection('default')
+            while True:
+                start = self.last_id if self.last_id == '-' else f'({self.last_id}'
+                entries = connection.xrange(stream_key(), min=start, count=10000)
+                for entry_id, fields in entries:
+                    self.bloom.add(fields[b'jti'].decode())
+                    self.last_id = entry_id.decode()
+                if len(entries) < 10000:
+                    break
+            self.next_sync = time.monotonic() + settings.TOKEN_BLACKLIST_SYNC_INTERVAL
+
+    def __contains__(self, jti):
+        """Return whether the jti may be blacklisted."""
+        self.sync()
+        return jti in self.bloom
+
+
+_filter = BlacklistFilter()
+
+
+def add(jti, exp):
+    """Blacklist a jti until its token expires.
+
+    If Redis is unavailable the jti is only recorded by the caller in the token
+    tables; the prune job copies it to Redis once Redis is back.
+
+    Args:
+        jti (str): The token identifier.
+        exp (int): The expiry of the token as a Unix timestamp.
+    """
+    timeout = int(exp - time.time())
+    if timeout <= 0:
+        return  # Expired tokens are rejected anyway
+    _filter.bloom.add(jti)  # Visible to this process without waiting for a sync
+    try:
+        cache.set(blacklist_key(jti), 1, timeout=timeout)
+        get_redis_connection('default').xadd(stream_key(), {'jti': jti})
+    except REDIS_ERRORS as e:
+        logger.warning('Could not blacklist token %s in Redis: %s', jti, e)
+
+
+def is_blacklisted(jti):
+    """Return whether a jti is blacklisted.
+
+    Args:
+        jti (str): The token identifier.
+
+    Returns:
+        bool: True if the token was blacklisted and has not expired yet.
+    """
+    try:
+        if jti not in _filter:
+            return False
+        return cache.get(blacklist_key(jti)) is not None
+    except REDIS_ERRORS:
+        return BlacklistedToken.objects.filter(token__jti=jti).exists()  # Redis is down; ask the token tables
+
+
+def blacklist_token(token):
+    """Blacklist a refresh token in Redis and record it in the token tables.
+
+    Args:
+        token: The validated refresh token.
+    """
+    jti = token[api_settings.JTI_CLAIM]
+    add(jti, token['exp'])
+    outstanding_token = OutstandingToken.objects.filter(jti=jti).first()
+    if outstanding_token:
+        BlacklistedToken.objects.get_or_create(token=outstanding_token)
+
+
+def prune_expired_tokens(batch_size=None):
+    """Delete expired outstanding and blacklisted tokens in batches and trim the stream.
+
+    Blacklisted jtis that have not expired are re-added to Redis, so the blacklist
+    recovers if the Redis data was lost.
+
+    Args:
+        batch_size (int, optional): Rows deleted per batch.
+
+    Returns:
+        int: The number of outstanding tokens deleted.
+    """
+    batch_size = batch_size or settings.TOKEN_PRUNE_BATCH_SIZE
+    now = aware_utcnow()
+    deleted = 0
+    while True:
+        ids = list(OutstandingToken.objects.filter(expires_at__lte=now).values_list('id', flat=True)[:batch_size])
+        if not ids:
+            break
+        BlacklistedToken.objects.filter(token_id__in=ids).delete()
+        OutstandingToken.objects.filter(id__in=ids).delete()
+        deleted += len(ids)
+
+    oldest = now - api_settings.REFRESH_TOKEN_LIFETIME  # Entries before this belong to expired tokens
+    get_redis_connection('default').xtrim(stream_key(), minid=int(oldest.timestamp() * 1000), approximate=True)
+    blacklisted = BlacklistedToken.objects.values_list('token__jti', 'token__expires_at').iterator(chunk_size=batch_size)
+    while batch := list(itertools.islice(blacklisted, batch_size)):
+        present = cache.get_many([blacklist_key(jti) for jti, _ in batch])  # One round trip per batch
+        for jti, expires_at in batch:
+            if blacklist_key(jti) not in present:
+                add(jti, expires_at.timestamp())
+    return deleted
+
+
+def prune_expired_tokens_job():
+    """Prune the token tables and schedule the next run, also if this run fails."""
+    try:
+        prune_expired_tokens()
+    finally:
+        schedule_prune()
+
+
+def schedule_prune():
+    """Schedule the next prune job; requires an RQ worker started with --with-scheduler."""
+    django_rq.get_queue('default').enqueue_in(
+        timedelta(seconds=settings.TOKEN_PRUNE_INTERVAL), prune_expired_tokens_job, job_id=PRUNE_JOB_ID
+    )
@@ -0,0 +1,91 @@
+"""Rendering of the transactional emails sent by the auth_app.
+
+Each email has a plain text and an HTML template under
+`auth_app/templates/auth_app/emails/`. The templates are compiled once per process
+and cached, so a message only costs two template renders. Links point to the
+frontend at FRONTEND_URL. Rendered messages are handed to the batched mail outbox.
+"""
+
+from django.conf import settings
+from django.contrib.auth.tokens import default_token_generator
+from django.template.loader import get_template
+from django.utils.encoding import force_bytes
+from django.utils.http import urlencode, urlsafe_base64_encode
+from functools import lru_cache
+from .mailer import queue_mail
+
+SUBJECTS = {
+    'activation': 'Activate Your Account',
+    'password_reset': 'Reset Your Password',
+    'password_reset_unknown': 'Reset Your Password',
+}
+
+
+@lru_cache(maxsize=None)
+def get_email_templates(name):
+    """Return the compiled text and HTML templates of an email.
+
+    Args:
+        name (str): The email name, e.g. 'activation'.
+
+    Returns:
+        tuple: The text and HTML templates.
+    """
+    return (
+        get_template(f'auth_app/emails/{name}.txt'),
+        get_template(f'auth_app/emails/{name}.html'),
+    )
+
+
+def render_email(name, context):
+    """Render the subject, text body and HTML body of an email.
+
+    Args:
+        name (str): The email name, e.g. 'activation'.
+        context (dict): The template context.
+
+    Returns:
+        tuple: The subject, text body and HTML body.
+    """
+    text_template, html_template = get_email_templates(name)
+    return SUBJECTS[name], text_template.render(context), html_template.render(context)
+
+
+def frontend_link(path, **params):
+    """Build an absolute frontend URL.
+
+    Args:
+        path (str): The frontend page path, e.g. '/pages/auth/activate.html'.
+        **params: Query string parameters.
+
+    Returns:
+        str: The URL below FRONTEND_URL.
+    """
+    return f"{settings.FRONTEND_URL.rstrip('/')}{path}?{urlencode(params)}"
+
+
+def send_templated_email(name, email, context=None):
+    """Render an email and queue it for delivery.
+
+    Args:
+        name (str): The email name, e.g. 'activation'.
+        email (str): The recipient address.
+        context (dict, optional): The template context.
+    """
+    subject, text, html = render_email(name, context or {})
+    queue_mail(subject, text, settings.DEFAULT_FROM_EMAIL, [email], html)
+
+
+def user_link(path, user, token_generator=default_token_generator):
+    """Build a frontend link carrying the user's encoded ID and a one-time token.
+
+    Args:
+        path (str): The frontend page path.
+        user: The User the link is for.
+        token_generator: The token generator to create the token with.
+
+    Returns:
+        str: The link with uid and token query parameters.
+    """
+    uid = urlsafe_base64_encode(force_bytes(user.pk))  # Encode user ID for URL
+    return frontend_link(path, uid=uid, token=token_generator.make_token(user))
@@ -0,0 +1,68 @@
+"""Password hashing for login and registration.
+
+This module provides an Argon2 hasher whose cost parameters come from settings,
+so they can be tuned with the calibrate_hasher command without code changes, and
+a password check that runs hashing on a bounded thread pool. Hashes made with an
+older algorithm or older parameters are upgraded on the next successful login.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher, check_password, get_hasher, identify_hasher, make_password
+import os
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """Argon2 hasher configured through the ARGON2_* settings."""
+
+    @property
+    def time_cost(self):
+        """Return the number of Argon2 iterations."""
+        return settings.ARGON2_TIME_COST
+
+    @property
+    def memory_cost(self):
+        """Return the Argon2 memory usage in KiB."""
+        return settings.ARGON2_MEMORY_COST
+
+    @property
+    def parallelism(self):
+        """Return the number of Argon2 lanes."""
+        return settings.ARGON2_PARALLELISM
+
+
+_pool = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS or os.cpu_count(),
+    thread_name_prefix='password-hash',
+)
+
+
+def verify_password(user, raw_password):
+    """Check a password on the hashing pool and upgrade outdated hashes.
+
+    Hashing runs on a bounded thread pool, so the CPU and Argon2 memory spent on
+    concurrent logins is capped by PASSWORD_HASH_WORKERS rather than by the number
+    of request threads or ASGI connections. Argon2 and PBKDF2 release the GIL while
+    hashing, so the pool uses all configured cores. The upgraded hash is saved in
+    the calling thread, which owns the request's database connection.
+
+    Args:
+        user: The User whose password is checked.
+        raw_password (str): The password to check.
+
+    Returns:
+        bool: True if the password is correct.
+    """
+    encoded = user.password
+    if not _pool.submit(check_password, raw_password, encoded).result():
+        return False
+
+    preferred = get_hasher('default')
+    try:
+        hasher = identify_hasher(encoded)
+    except ValueError:
+        return True
+    if hasher.algorithm != preferred.algorithm or preferred.must_update(encoded):
+        user.password = _pool.submit(make_password, raw_password).result()
+        user.save(update_fields=['password'])
+    return True
@@ -0,0 +1,248 @@
+"""Batched delivery of transactional mail through a Redis outbox.
+
+Messages are pushed onto a Redis list instead of being sent from the request or a
+per-message RQ job. A single drain job moves them in batches to a processing list
+and sends each batch over one persistent connection of the configured
+EMAIL_BACKEND; a message leaves the processing list only once it was sent or
+deferred, and a drain first returns messages left there by a crashed drain to the
+outbox. Messages that fail for any reason are retried with exponential backoff
+from a Redis sorted set and moved to a failed list after MAIL_MAX_ATTEMPTS. Each
+drain reports its throughput in messages/sec.
+"""
+
+from core import metrics
+from datetime import timedelta
+from django.conf import settings
+from django.core.cache import cache
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django_redis import get_redis_connection
+from redis.exceptions import LockError
+import django_rq
+import json
+import logging
+import smtplib
+import time
+
+DRAIN_JOB_ID = 'mail_drain_retry'  # Fixed job ID so only one retry drain is scheduled
+
+logger = logging.getLogger(__name__)
+
+
+def outbox_key():
+    """Return the Redis key of the list of queued messages."""
+    return cache.make_key('mail:outbox')
+
+
+def processing_key():
+    """Return the Redis key of the list of messages the running drain is sending."""
+    return cache.make_key('mail:processing')
+
+
+def retry_key():
+    """Return the Redis key of the sorted set of messages waiting for a retry."""
+    return cache.make_key('mail:retry')
+
+
+def failed_key():
+    """Return the Redis key of the list of messages that exhausted their retries."""
+    return cache.make_key('mail:failed')
+
+
+def drain_flag_key():
+    """Return the Redis key marking that a drain job is queued or running."""
+    return cache.make_key('mail:drain_scheduled')
+
+
+def drain_lock_key():
+    """Return the Redis key of the lock held by the running drain."""
+    return cache.make_key('mail:drain_lock')
+
+
+def queue_mail(subject, message, from_email, recipient_list, html_message=None):
+    """Queue a message for batched delivery and make sure a drain job runs.
+
+    The arguments mirror django.core.mail.send_mail.
+
+    Args:
+        subject (str): The subject line.
+        message (str): The plain text body.
+        from_email (str): The sender; None for DEFAULT_FROM_EMAIL.
+        recipient_list (list): The recipient addresses.
+        html_message (str, optional): An HTML alternative of the body.
+    """
+    payload = {
+        'subject': subject,
+        'body': message,
+        'html_body': html_message,
+        'from_email': from_email or settings.DEFAULT_FROM_EMAIL,
+        'to': list(recipient_list),
+        'attempts': 0,
+    }
+    get_redis_connection('default').rpush(outbox_key(), json.dumps(payload))
+    schedule_drain()
+
+
+def schedule_drain():
+    """Start a drain job unless one is already queued or running."""
+    if getattr(settings, 'TESTING', False):
+        drain_outbox()  # Deliver synchronously during tests
+        return
+    if get_redis_connection('default').set(drain_flag_key(), 1, nx=True, ex=settings.MAIL_DRAIN_LOCK_TIMEOUT):
+        django_rq.enqueue(drain_outbox)
+
+
+def build_message(message, connection):
+    """Build an email message from a queued payload.
+
+    Args:
+        message (dict): The queued payload.
+        connection: The mail backend connection to send with.
+
+    Returns:
+        EmailMultiAlternatives: The message ready to send.
+    """
+    email = EmailMultiAlternatives(
+        message['subject'], message['body'], message['from_email'], message['to'], connection=connection
+    )
+    if message.get('html_body'):
+        email.attach_alternative(message['html_body'], 'text/html')
+    return email
+
+
+def release_due_retries(redis):
+    """Move messages whose retry time has come back onto the outbox."""
+    due = redis.zrangebyscore(retry_key(), '-inf', time.time())
+    if due:
+        pipe = redis.pipeline()
+        for raw in due:
+            pipe.zrem(retry_key(), raw)
+        claimed = [raw for raw, removed in zip(due, pipe.execute()) if removed]  # Skip those claimed by another drain
+        if claimed:
+            redis.rpush(outbox_key(), *claimed)
+
+
+def defer(redis, message):
+    """Schedule a failed message for a retry with exponential backoff, or give up on it."""
+    message['attempts'] += 1
+    if message['attempts'] >= settings.MAIL_MAX_ATTEMPTS:
+        redis.rpush(failed_key(), json.dumps(message))
+        return 'failed'
+    retry_at = time.time() + settings.MAIL_RETRY_BACKOFF * 2 ** (message['attempts'] - 1)
+    redis.zadd(retry_key(), {json.dumps(message): retry_at})
+    return 'retried'
+
+
+def settle_failure(redis, raw):
+    """Defer a message that could not be sent; unreadable payloads go straight to the failed list.
+
+    Returns:
+        str: 'retried' or 'failed'.
+    """
+    try:
+        return defer(redis, json.loads(raw))
+    except (ValueError, TypeError, KeyError):
+        redis.rpush(failed_key(), raw)
+        return 'failed'
+
+
+def send_batch(redis, batch, stats):
+    """Send messages over one backend connection, deferring those that fail.
+
+    Each message is removed from the processing list once it was sent or deferred,
+    so a crash leaves the unsent rest of the batch there.
+
+    Args:
+        redis: The Redis connection holding the outbox.
+        batch (list): The raw queued payloads, as moved to the processing list.
+        stats (dict): Counters of sent, retried and failed messages to update.
+    """
+    connection = get_connection()
+    pending = list(batch)
+    try:
+        connection.open()
+        while pending:
+            raw = pending.pop(0)
+            try:
+                build_message(json.loads(raw), connection).send()
+                stats['sent'] += 1
+            except (smtplib.SMTPException, OSError):
+                stats[settle_failure(redis, raw)] += 1
+                connection.close()  # Reconnect for the rest of the batch
+                connection.open()
+            except Exception:
+                logger.exception('Could not send queued mail')  # E.g. a malformed payload
+                stats[settle_failure(redis, raw)] += 1
+            finally:
+                redis.lrem(processing_key(), 1, raw)
+    except (smtplib.SMTPException, OSError):
+        for raw in pending:
+            stats[settle_failure(redis, raw)] += 1  # The backend is unreachable
+            redis.lrem(processing_key(), 1, raw)
+    finally:
+        connection.close()
+
+
+def claim_batch(redis, batch_size):
+    """Move up to batch_size messages from the outbox to the processing list.
+
+    Returns:
+        list: The raw payloads moved, in queue order.
+    """
+    pipe = redis.pipeline(transaction=False)
+    for _ in range(batch_size):
+        pipe.lmove(outbox_key(), processing_key(), 'LEFT', 'RIGHT')
+    return [raw for raw in pipe.execute() if raw is not None]
+
+
+def requeue_stale(redis):
+    """Return messages left in the processing list by a crashed drain to the front of the outbox."""
+    while redis.lmove(processing_key(), outbox_key(), 'RIGHT', 'LEFT') is not None:
+        pass
+
+
+def drain_outbox(batch_size=None):
+    """Send all queued messages in batches over persistent backend connections.
+
+    Args:
+        batch_size (int, optional): Messages popped and sent per connection.
+
+    Returns:
+        dict: Counts of sent, retried and failed messages, the elapsed seconds and
+            the throughput in messages/sec.
+    """
+    batch_size = batch_size or settings.MAIL_BATCH_SIZE
+    redis = get_redis_connection('default')
+    stats = {'sent': 0, 'retried': 0, 'failed': 0}
+    start = time.perf_counter()
+    lock = redis.lock(drain_lock_key(), timeout=settings.MAIL_DRAIN_LOCK_TIMEOUT)
+    if not lock.acquire(blocking=False):
+        return {**stats, 'elapsed': 0.0, 'rate': 0.0}  # The running drain picks up the outbox
+    try:
+        requeue_stale(redis)  # Only the lock holder uses the processing list
+        release_due_retries(redis)
+        while True:
+            batch = claim_batch(redis, batch_size)
+            if not batch:
+                break
+            send_batch(redis, batch, stats)
+            lock.reacquire()  # Keep the lock for long drains
+    finally:
+        redis.delete(drain_flag_key())
+        try:
+            lock.release()
+        except LockError:
+            pass  # Expired during a stalled drain and possibly taken over
+        if redis.llen(outbox_key()):
+            schedule_drain()  # Messages queued after the last batch or during a failed drain
+        next_retry = redis.zrange(retry_key(), 0, 0, withscores=True)
+        if next_retry and not getattr(settings, 'TESTING', False):
+            delay = max(1, int(next_retry[0][1] - time.time()))
+            django_rq.get_queue('default').enqueue_in(timedelta(seconds=delay), drain_outbox, job_id=DRAIN_JOB_ID)
+
+    stats['elapsed'] = time.perf_counter() - start
+    stats['rate'] = stats['sent'] / stats['elapsed'] if stats['elapsed'] else 0.0
+    metrics.increment('mail.sent', stats['sent'])
+    if stats['sent'] or stats['retried'] or stats['failed']:
+        print(f"Mail drain: sent {stats['sent']}, retried {stats['retried']}, failed {stats['failed']} "
+              f"in {stats['elapsed']:.2f}s ({stats['rate']:.1f} messages/sec)")
+    return stats
@@ -0,0 +1,63 @@
+"""Management command load-testing the login serializer.
+
+The command creates temporary active users hashed with the configured default
+hasher, runs the login validation from several threads for a fixed number of
+logins and reports logins per second overall and per hashing core. The users and
+the tokens issued to them are deleted afterwards.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+from ...api.serializers import CookieTokenObtainPairSerializers
+import os
+import time
+
+PASSWORD = 'bench-login-password'
+
+
+class Command(BaseCommand):
+    """Measure login throughput with the configured password hasher."""
+    help = 'Load-test login validation and report logins/sec per core.'
+
+    def add_arguments(self, parser):
+        """Register command line options for the users, logins and threads."""
+        parser.add_argument('--users', type=int, default=50, help='Number of temporary users.')
+        parser.add_argument('--logins', type=int, default=200, help='Total number of logins.')
+        parser.add_argument('--threads', type=int, default=8, help='Concurrent login threads.')
+
+    def handle(self, *args, **options):
+        """Create the users, run the logins concurrently and clean up."""
+        password = make_password(PASSWORD)
+        users = User.objects.bulk_create([
+            User(username=f'bench-login-{index}@example.com', email=f'bench-login-{index}@example.com',
+                 password=password, is_active=True)
+            for index in range(options['users'])
+        ])
+        emails = [user.email for user in users]
+        try:
+            with ThreadPoolExecutor(max_workers=options['threads']) as pool:
+                start = time.perf_counter()
+                results = list(pool.map(self.login, (emails[index % len(emails)] for index in range(options['logins']))))
+                elapsed = time.perf_counter() - start
+        finally:
+            OutstandingToken.objects.filter(user__in=users).delete()
+            User.objects.filter(pk__in=[user.pk for user in users]).delete()
+
+        cores = min(settings.PASSWORD_HASH_WORKERS or os.cpu_count(), os.cpu_count())
+        rate = options['logins'] / elapsed
+        self.stdout.write(f'hasher          {password.split("$", 1)[0]}')
+        self.stdout.write(f'failed logins   {results.count(False)}')
+        self.stdout.write(f'logins/sec      {rate:,.1f}')
+        self.stdout.write(f'logins/sec/core {rate / cores:,.1f} ({cores} hashing cores)')
+
+    def login(self, email):
+        """Validate one login and close the thread's database connection."""
+        try:
+            return CookieTokenObtainPairSerializers(data={'email': email, 'password': PASSWORD}).is_valid()
+        finally:
+            connection.close()
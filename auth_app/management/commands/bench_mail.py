@@ -0,0 +1,59 @@
+"""Management command benchmarking transactional mail delivery.
+
+The command sends synthetic messages once with one send_mail call per message,
+which opens a new backend connection each time, and once through the Redis outbox,
+which the mail drain sends in batches over persistent connections. Both runs use
+the given email backend and report messages/sec. The outbox run uses its own
+cache key prefix, so queued production mail is neither drained into the benchmark
+backend nor mixed with the synthetic messages.
+"""
+
+from core.metrics import METRICS_KEY
+from django.conf import settings
+from django.core.cache import cache
+from django.core.mail import send_mail
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+from django_redis import get_redis_connection
+from ...mailer import drain_lock_key, drain_outbox, failed_key, outbox_key, processing_key, retry_key
+import json
+import time
+
+
+class Command(BaseCommand):
+    """Compare per-message send_mail with the batched mail drain."""
+    help = 'Benchmark per-message send_mail against the batched Redis mail outbox in messages/sec.'
+
+    def add_arguments(self, parser):
+        """Register command line options for the message count, batch size and backend."""
+        parser.add_argument('--messages', type=int, default=1000, help='Number of synthetic messages.')
+        parser.add_argument('--batch-size', type=int, default=None, help='Messages sent per connection.')
+        parser.add_argument('--backend', default='django.core.mail.backends.locmem.EmailBackend',
+                            help='Email backend, e.g. the SMTP backend pointed at a test server.')
+
+    def handle(self, *args, **options):
+        """Send the messages both ways and print the throughput."""
+        count = options['messages']
+        messages = [
+            {'subject': 'Benchmark', 'body': f'Message {index}', 'html_body': None,
+             'from_email': 'bench@example.com', 'to': [f'user{index}@example.com'], 'attempts': 0}
+            for index in range(count)
+        ]
+        with override_settings(EMAIL_BACKEND=options['backend']):
+            start = time.perf_counter()
+            for message in messages:
+                send_mail(message['subject'], message['body'], message['from_email'], message['to'])
+            elapsed = time.perf_counter() - start
+            self.stdout.write(f'send_mail per message {count / elapsed:>12,.1f} messages/sec')
+
+        caches = {'default': {**settings.CACHES['default'], 'KEY_PREFIX': 'bench_mail'}}  # Separate outbox keys
+        with override_settings(EMAIL_BACKEND=options['backend'], CACHES=caches, TESTING=True):
+            redis = get_redis_connection('default')
+            keys = [outbox_key(), processing_key(), retry_key(), failed_key(), drain_lock_key(), cache.make_key(METRICS_KEY)]
+            redis.delete(*keys)
+            try:
+                redis.rpush(outbox_key(), *[json.dumps(message) for message in messages])
+                stats = drain_outbox(options['batch_size'])
+            finally:
+                redis.delete(*keys)
+            self.stdout.write(f'batched mail drain    {stats["rate"]:>12,.1f} messages/sec')
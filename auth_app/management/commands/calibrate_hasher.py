@@ -0,0 +1,49 @@
+"""Management command calibrating the Argon2 password hasher.
+
+For every memory cost given, the command increases the Argon2 time cost until a
+single hash takes at least the target duration on this machine, then prints the
+resulting hash time, hashes per second per core and the matching ARGON2_* settings.
+Run it on the production hardware and copy the chosen line into the environment.
+"""
+
+from argon2 import PasswordHasher
+from django.core.management.base import BaseCommand
+import statistics
+import time
+
+
+class Command(BaseCommand):
+    """Find Argon2 cost parameters that meet a target hash duration."""
+    help = 'Calibrate Argon2 time and memory costs against a target hash duration.'
+
+    def add_arguments(self, parser):
+        """Register command line options for the target and the candidate costs."""
+        parser.add_argument('--target-ms', type=float, default=50.0, help='Target duration of one hash in ms.')
+        parser.add_argument('--memory-cost', type=int, nargs='+', default=[19456, 47104, 65536],
+                            help='Candidate memory costs in KiB.')
+        parser.add_argument('--parallelism', type=int, default=1, help='Argon2 lanes.')
+        parser.add_argument('--max-time-cost', type=int, default=10, help='Highest time cost to try.')
+
+    def handle(self, *args, **options):
+        """Time every candidate memory cost and print the calibrated settings."""
+        target = options['target_ms'] / 1000
+        for memory_cost in options['memory_cost']:
+            for time_cost in range(1, options['max_time_cost'] + 1):
+                elapsed = self.time_hash(time_cost, memory_cost, options['parallelism'])
+                if elapsed >= target:
+                    break
+            self.stdout.write(
+                f'{elapsed * 1000:7.1f} ms  {options["parallelism"] / elapsed:7.1f} hashes/sec/core  '
+                f'ARGON2_TIME_COST={time_cost} ARGON2_MEMORY_COST={memory_cost} '
+                f'ARGON2_PARALLELISM={options["parallelism"]}'
+            )
+
+    def time_hash(self, time_cost, memory_cost, parallelism, repeat=5):
+        """Return the median duration of one hash with the given costs, in seconds."""
+        hasher = PasswordHasher(time_cost=time_cost, memory_cost=memory_cost, parallelism=parallelism)
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            hasher.hash('calibration-password')
+            timings.append(time.perf_counter() - start)
+        return statistics.median(timings)
@@ -0,0 +1,28 @@
+"""Management command pruning expired refresh tokens.
+
+The command deletes expired rows from the Simple JWT outstanding and blacklisted
+token tables in batches. With --schedule it starts the self-rescheduling RQ prune
+job instead, which requires an RQ worker running with --with-scheduler.
+"""
+
+from django.core.management.base import BaseCommand
+from ...blacklist import prune_expired_tokens, schedule_prune
+
+
+class Command(BaseCommand):
+    """Prune expired outstanding and blacklisted tokens."""
+    help = 'Delete expired outstanding and blacklisted tokens in batches, or schedule the prune job.'
+
+    def add_arguments(self, parser):
+        """Register command line options for the batch size and scheduling."""
+        parser.add_argument('--batch-size', type=int, default=None, help='Rows deleted per batch.')
+        parser.add_argument('--schedule', action='store_true', help='Schedule the recurring RQ prune job.')
+
+    def handle(self, *args, **options):
+        """Prune the token tables now or schedule the recurring job."""
+        if options['schedule']:
+            schedule_prune()
+            self.stdout.write('Scheduled the token prune job.')
+            return
+        deleted = prune_expired_tokens(options['batch_size'])
+        self.stdout.write(f'Deleted {deleted} expired outstanding tokens.')
@@ -0,0 +1,46 @@
+"""Add a unique, case-insensitive index on auth_user.email.
+
+The index is built with CREATE INDEX CONCURRENTLY so existing deployments keep
+accepting writes while it is created. Blank emails (e.g. superusers created
+without one) are excluded from the index. The migration refuses to run while
+case-insensitive duplicates exist, listing them so they can be merged first.
+"""
+
+from django.db import migrations
+from django.db.models import Count
+from django.db.models.functions import Upper
+
+INDEX_NAME = 'auth_user_email_upper_uniq'
+
+
+def check_duplicate_emails(apps, schema_editor):
+    """Abort the migration if case-insensitive duplicate emails exist."""
+    User = apps.get_model('auth', 'User')
+    duplicates = list(
+        User.objects.exclude(email='')
+        .values(email_upper=Upper('email'))
+        .annotate(count=Count('id'))
+        .filter(count__gt=1)
+        .values_list('email_upper', flat=True)[:20]
+    )
+    if duplicates:
+        raise RuntimeError(
+            'Cannot add a unique email index, duplicate emails exist: ' + ', '.join(duplicates)
+        )
+
+
+class Migration(migrations.Migration):
+    atomic = False  # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_duplicate_emails, migrations.RunPython.noop),
+        migrations.RunSQL(
+            f"CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS {INDEX_NAME} "
+            f"ON auth_user (UPPER(email::text)) WHERE email <> ''",
+            f"DROP INDEX CONCURRENTLY IF EXISTS {INDEX_NAME}",
+        ),
+    ]
@@ -1,36 +1,25 @@
 """Signal handlers for the auth_app application.
 
 This module defines signals to send activation emails for newly created inactive users,
-using Django's signal framework and RQ for asynchronous task queuing.
+using Django's signal framework and the batched Redis mail outbox. It also drops
+users from the authentication user cache whenever they are saved or deleted.
 """
 
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver 
 from django.contrib.auth.models import User
-from django.core.mail import send_mail 
-from django.conf import settings 
-from django.utils.http import urlsafe_base64_encode 
-from django.utils.encoding import force_bytes 
-from django.contrib.auth.tokens import default_token_generator
-import django_rq  
+from .emails import send_templated_email, user_link
+from .user_cache import invalidate_user
 
 
 def send_email_task(instance):  
-    """Send an account activation email for the given user.
+    """Queue an account activation email for the given user.
 
     Args:
         instance: The User instance to send the activation email for.
     """
-    uid = urlsafe_base64_encode(force_bytes(instance.pk))  # Encode user ID for URL
-    token = default_token_generator.make_token(instance)  # Generate activation token
-    frontend_url = 'http://localhost:5500'
-    activation_link = f"{frontend_url}/pages/auth/activate.html?uid={uid}&token={token}"  
-    send_mail(  
-        'Activate Your Account',  
-        f'Click here: {activation_link}', 
-        settings.DEFAULT_FROM_EMAIL,  
-        [instance.email],  
-    )
+    activation_link = user_link('/pages/auth/activate.html', instance)  # Carries uid and activation token
+    send_templated_email('activation', instance.email, {'link': activation_link})
 
 @receiver(post_save, sender=User)  
 def send_activation_email(sender, instance, created, **kwargs):
@@ -43,7 +32,17 @@ def send_activation_email(sender, instance, created, **kwargs):
         **kwargs: Additional signal arguments.
     """ 
     if created and not instance.is_active: 
-        if getattr(settings, 'TESTING', False): 
-            send_email_task(instance)  # Run synchronously during tests
-        else:
-            django_rq.enqueue(send_email_task, instance)  # Queue email task asynchronously
\ No newline at end of file
+        send_email_task(instance)  # Queues the email; the mail drain job delivers it
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    """Drop a saved or deleted user from the authentication user cache.
+
+    Args:
+        sender: The model class that sent the signal (User).
+        instance: The User instance being saved or deleted.
+        **kwargs: Additional signal arguments.
+    """
+    invalidate_user(instance.pk)
@@ -0,0 +1,97 @@
+"""Unit tests for the cookie JWT authentication user resolution modes.
+
+This module contains test cases to verify that authenticated requests resolve
+their user from the token claims or the user cache without database queries, and
+that inactive or deactivated users are rejected.
+"""
+
+from auth_app import user_cache
+from auth_app.api.tokens import UserClaimsRefreshToken
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+class CookieJWTAuthenticationTestCase(APITestCase):
+    """Test case for the user resolution modes of CookieJWTAuthentication."""
+
+    def setUp(self):
+        """Set up an active user with an access token cookie carrying user claims."""
+        self.user = User.objects.create_user(
+            username='test@example.com',
+            email='test@example.com',
+            password='testpass123',
+            is_active=True
+        )
+        self.client.cookies['access_token'] = str(UserClaimsRefreshToken.for_user(self.user).access_token)
+
+    def tearDown(self):
+        """Clear the per-process user cache and the shared cache."""
+        user_cache._local_users.clear()
+        cache.clear()
+
+    def get_user_queries(self):
+        """Request the category list twice and return the queries of the second request."""
+        self.client.get('/api/categories/')  # Warm the category list and user caches
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/categories/')
+        self.assertEqual(response.status_code, 200)
+        return [query['sql'] for query in queries if 'auth_user' in query['sql']]
+
+    def test_db_mode_queries_user(self):
+        """Test that the default mode loads the user from the database."""
+        self.assertEqual(len(self.get_user_queries()), 1)
+
+    @override_settings(JWT_USER_RESOLUTION='token')
+    def test_token_mode_without_queries(self):
+        """Test that token mode authenticates without a user query."""
+        self.assertEqual(self.get_user_queries(), [])
+
+    @override_settings(JWT_USER_RESOLUTION='token')
+    def test_token_mode_falls_back_for_tokens_without_claims(self):
+        """Test that tokens without user claims are resolved from the database."""
+        self.client.cookies['access_token'] = str(RefreshToken.for_user(self.user).access_token)
+        self.assertEqual(len(self.get_user_queries()), 1)
+
+    @override_settings(JWT_USER_RESOLUTION='token')
+    def test_token_mode_rejects_inactive_claim(self):
+        """Test that a token issued for an inactive user is rejected."""
+        self.user.is_active = False
+        self.client.cookies['access_token'] = str(UserClaimsRefreshToken.for_user(self.user).access_token)
+        response = self.client.get('/api/categories/')
+        self.assertEqual(response.status_code, 401)
+
+    @override_settings(JWT_USER_RESOLUTION='cache')
+    def test_cache_mode_without_queries(self):
+        """Test that cache mode authenticates repeated requests without a user query."""
+        self.assertEqual(self.get_user_queries(), [])
+
+    @override_settings(JWT_USER_RESOLUTION='cache')
+    def test_cache_mode_stores_no_password_hash(self):
+        """Test that the shared cache only holds the fields needed for authentication."""
+        self.assertEqual(self.client.get('/api/categories/').status_code, 200)
+        cached = cache.get(user_cache.user_cache_key(self.user.pk))
+        self.assertEqual(set(cached), set(user_cache.CACHED_FIELDS))
+        self.assertNotIn(self.user.password, repr(cached))
+        self.assertEqual(user_cache.get_cached_user(self.user.pk).password, '')
+
+    @override_settings(JWT_USER_RESOLUTION='cache')
+    def test_cache_mode_invalidated_on_deactivation(self):
+        """Test that deactivating a user takes effect on the next request."""
+        self.assertEqual(self.client.get('/api/categories/').status_code, 200)
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.get('/api/categories/')
+        self.assertEqual(response.status_code, 401)
+
+    @override_settings(JWT_USER_RESOLUTION='cache')
+    def test_cache_mode_rejects_deleted_user(self):
+        """Test that a deleted user is no longer authenticated."""
+        self.assertEqual(self.client.get('/api/categories/').status_code, 200)
+        self.user.delete()
+        response = self.client.get('/api/categories/')
+        self.assertEqual(response.status_code, 401)
@@ -0,0 +1,108 @@
+"""Unit tests for the Redis-backed refresh token blacklist.
+
+This module contains test cases to verify the Bloom filter, that blacklist checks
+are answered without database queries, that other processes see blacklisted
+tokens after a sync, that checks fall back to the token tables while Redis is
+down, and that expired tokens are pruned in batches.
+"""
+
+from auth_app import blacklist
+from auth_app.api.tokens import UserClaimsRefreshToken
+from datetime import timedelta
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from redis.exceptions import ConnectionError as RedisConnectionError
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.utils import aware_utcnow
+from unittest import mock
+
+
+class BlacklistTestCase(TestCase):
+    """Test case for the refresh token blacklist service."""
+
+    def setUp(self):
+        """Set up an active user with a refresh token and an empty filter."""
+        cache.clear()
+        blacklist._filter.reset()
+        self.user = User.objects.create_user(username='test@example.com', email='test@example.com', password='testpass123')
+        self.token = UserClaimsRefreshToken.for_user(self.user)
+
+    def tearDown(self):
+        """Clear the blacklist from the shared cache."""
+        cache.clear()
+
+    def test_bloom_filter_has_no_false_negatives(self):
+        """Test that every added item is reported as present."""
+        bloom = blacklist.BloomFilter(1000, 0.01)
+        items = [f'jti-{index}' for index in range(1000)]
+        for item in items:
+            bloom.add(item)
+        self.assertTrue(all(item in bloom for item in items))
+        false_positives = sum(f'other-{index}' in bloom for index in range(1000))
+        self.assertLess(false_positives, 50)
+
+    def test_check_blacklist_without_queries(self):
+        """Test that verifying a refresh token does not query the token tables."""
+        with CaptureQueriesContext(connection) as queries:
+            UserClaimsRefreshToken(str(self.token))
+        self.assertEqual(len(queries), 0)
+
+    def test_blacklisted_token_is_rejected(self):
+        """Test that a blacklisted token is rejected and recorded in the tables."""
+        self.token.blacklist()
+        self.assertTrue(BlacklistedToken.objects.filter(token__jti=self.token['jti']).exists())
+        with self.assertRaises(TokenError):
+            UserClaimsRefreshToken(str(self.token))
+
+    @override_settings(TOKEN_BLACKLIST_SYNC_INTERVAL=60)
+    def test_other_processes_see_blacklist_after_sync(self):
+        """Test that a process picks up jtis blacklisted elsewhere from the stream."""
+        self.assertFalse(blacklist.is_blacklisted(self.token['jti']))  # Syncs an empty stream
+        blacklist.add(self.token['jti'], self.token['exp'])
+        blacklist._filter.reset()  # Simulate another process with its own filter
+        self.assertTrue(blacklist.is_blacklisted(self.token['jti']))
+
+    def test_falls_back_to_tables_without_redis(self):
+        """Test that blacklisting and checks use the token tables while Redis is unreachable."""
+        with mock.patch('auth_app.blacklist.get_redis_connection', side_effect=RedisConnectionError('down')):
+            blacklist._filter.reset()
+            self.assertFalse(blacklist.is_blacklisted(self.token['jti']))
+            self.token.blacklist()
+            blacklist._filter.reset()  # Another process, which cannot sync its filter
+            with self.assertRaises(TokenError):
+                UserClaimsRefreshToken(str(self.token))
+
+    def test_prune_job_reschedules_after_failure(self):
+        """Test that a failing prune run still schedules the next one."""
+        with mock.patch('auth_app.blacklist.prune_expired_tokens', side_effect=RuntimeError), \
+                mock.patch('auth_app.blacklist.schedule_prune') as schedule:
+            with self.assertRaises(RuntimeError):
+                blacklist.prune_expired_tokens_job()
+        schedule.assert_called_once_with()
+
+    def test_prune_expired_tokens(self):
+        """Test that expired rows are deleted in batches and valid ones are kept."""
+        expired = [UserClaimsRefreshToken.for_user(self.user) for _ in range(5)]
+        OutstandingToken.objects.filter(jti__in=[token['jti'] for token in expired]).update(
+            expires_at=aware_utcnow() - timedelta(minutes=1)
+        )
+        expired[0].blacklist()
+        self.assertEqual(blacklist.prune_expired_tokens(batch_size=2), 5)
+        self.assertEqual(list(OutstandingToken.objects.values_list('jti', flat=True)), [self.token['jti']])
+        self.assertFalse(BlacklistedToken.objects.exists())
+
+    def test_prune_restores_lost_entries_in_batches(self):
+        """Test that blacklisted jtis missing from Redis are re-added with one lookup per batch."""
+        tokens = [UserClaimsRefreshToken.for_user(self.user) for _ in range(5)]
+        for token in tokens:
+            token.blacklist()
+        cache.delete_many([blacklist.blacklist_key(token['jti']) for token in tokens[:3]])  # Redis data lost
+        with mock.patch.object(cache, 'get_many', wraps=cache.get_many) as get_many:
+            blacklist.prune_expired_tokens(batch_size=2)
+        self.assertEqual(get_many.call_count, 3)
+        for token in tokens:
+            self.assertIsNotNone(cache.get(blacklist.blacklist_key(token['jti'])))
@@ -0,0 +1,35 @@
+"""Unit tests for transactional email rendering.
+
+This module contains test cases to verify that emails render text and HTML parts
+with links below FRONTEND_URL and that compiled templates are reused.
+"""
+
+from auth_app import emails
+from django.test import SimpleTestCase, override_settings
+from unittest import mock
+
+
+class EmailRenderingTestCase(SimpleTestCase):
+    """Test case for the email rendering module."""
+
+    @override_settings(FRONTEND_URL='https://videoflix.example.com/')
+    def test_links_use_frontend_url(self):
+        """Test that links are built from FRONTEND_URL with encoded parameters."""
+        link = emails.frontend_link('/pages/auth/activate.html', uid='MQ', token='a-b')
+        self.assertEqual(link, 'https://videoflix.example.com/pages/auth/activate.html?uid=MQ&token=a-b')
+
+    def test_render_text_and_html(self):
+        """Test that both parts are rendered and the link is only escaped in HTML."""
+        link = 'http://localhost:5500/pages/auth/activate.html?uid=MQ&token=abc'
+        subject, text, html = emails.render_email('activation', {'link': link})
+        self.assertEqual(subject, 'Activate Your Account')
+        self.assertIn(link, text)
+        self.assertIn('href="http://localhost:5500/pages/auth/activate.html?uid=MQ&amp;token=abc"', html)
+
+    def test_templates_are_compiled_once(self):
+        """Test that repeated renders reuse the cached compiled templates."""
+        emails.get_email_templates.cache_clear()
+        with mock.patch.object(emails, 'get_template', wraps=emails.get_template) as get_template:
+            for _ in range(3):
+                emails.render_email('password_reset', {'link': 'http://localhost:5500/'})
+        self.assertEqual(get_template.call_count, 2)
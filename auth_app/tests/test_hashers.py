@@ -0,0 +1,57 @@
+"""Unit tests for the tuned Argon2 hasher and the login password check.
+
+This module contains test cases to verify that new passwords use the tuned Argon2
+parameters and that PBKDF2 or outdated Argon2 hashes are upgraded on login.
+"""
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+
+class PasswordHasherTestCase(APITestCase):
+    """Test case for password hashing and hash upgrades on login."""
+
+    def create_user(self, password_hash):
+        """Create an active user with the given password hash."""
+        return User.objects.create(
+            username='test@example.com',
+            email='test@example.com',
+            password=password_hash,
+            is_active=True
+        )
+
+    def login(self, password='testpass123'):
+        """Log in as the test user and return the response."""
+        return self.client.post('/api/login/', {'email': 'test@example.com', 'password': password})
+
+    @override_settings(ARGON2_TIME_COST=1, ARGON2_MEMORY_COST=8192, ARGON2_PARALLELISM=1)
+    def test_new_passwords_use_tuned_argon2(self):
+        """Test that new hashes carry the configured Argon2 parameters."""
+        self.assertTrue(make_password('testpass123').startswith('argon2$argon2id$v=19$m=8192,t=1,p=1$'))
+
+    def test_pbkdf2_hash_is_upgraded_on_login(self):
+        """Test that a PBKDF2 hash is replaced with Argon2 after a successful login."""
+        user = self.create_user(make_password('testpass123', hasher='pbkdf2_sha256'))
+        self.assertEqual(self.login().status_code, 200)
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith('argon2$'))
+        self.assertEqual(self.login().status_code, 200)
+
+    def test_failed_login_keeps_hash(self):
+        """Test that a wrong password does not rewrite the stored hash."""
+        password_hash = make_password('testpass123', hasher='pbkdf2_sha256')
+        user = self.create_user(password_hash)
+        self.assertEqual(self.login('wrong').status_code, 400)
+        user.refresh_from_db()
+        self.assertEqual(user.password, password_hash)
+
+    @override_settings(ARGON2_MEMORY_COST=16384)
+    def test_changed_parameters_are_upgraded_on_login(self):
+        """Test that a hash with outdated Argon2 costs is rehashed on login."""
+        with self.settings(ARGON2_MEMORY_COST=8192):
+            user = self.create_user(make_password('testpass123'))
+        self.assertEqual(self.login().status_code, 200)
+        user.refresh_from_db()
+        self.assertIn('m=16384,', user.password)
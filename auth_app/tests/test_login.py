@@ -40,4 +40,10 @@ class LoginTestCase(APITestCase):
         self.client.credentials()  # Clear any authentication headers
         data = {'email': 'test@example.com', 'password': 'testpass123'}
         response = self.client.post('/api/login/', data)
-        self.assertEqual(response.status_code, 200)  # Verify no 401 error
\ No newline at end of file
+        self.assertEqual(response.status_code, 200)  # Verify no 401 error
+
+    def test_login_email_case_insensitive(self):
+        """Test login with an email that differs only in letter case."""
+        data = {'email': 'TEST@example.com', 'password': 'testpass123'}
+        response = self.client.post('/api/login/', data)
+        self.assertEqual(response.status_code, 200)
@@ -5,7 +5,9 @@ including successful logout, missing refresh token, and invalid token scenarios.
 """
 
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from rest_framework.test import APITestCase
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
 from rest_framework_simplejwt.tokens import RefreshToken
 
 
@@ -23,6 +25,10 @@ class LogoutTestCase(APITestCase):
         self.refresh_token = str(RefreshToken.for_user(self.user))  # Generate refresh token
         self.client.cookies['refresh_token'] = self.refresh_token  # Set refresh token cookie
 
+    def tearDown(self):
+        """Clear the blacklisted tokens from the shared cache."""
+        cache.clear()
+
     def test_logout_success(self):
         """Test successful logout with valid refresh token."""
         response = self.client.post('/api/logout/')
@@ -31,6 +37,14 @@ class LogoutTestCase(APITestCase):
         self.assertEqual(response.cookies.get('access_token').value, '')  # Verify access token cookie is cleared
         self.assertEqual(response.cookies.get('refresh_token').value, '')  # Verify refresh token cookie is cleared
 
+    def test_logout_blacklists_refresh_token(self):
+        """Test that the refresh token can no longer be used after logout."""
+        self.client.post('/api/logout/')
+        self.assertTrue(BlacklistedToken.objects.filter(token__token=self.refresh_token).exists())
+        self.client.cookies['refresh_token'] = self.refresh_token
+        response = self.client.post('/api/token/refresh/')
+        self.assertEqual(response.status_code, 401)
+
     def test_logout_no_token(self):
         """Test logout failure when refresh token is missing."""
         self.client.cookies.clear()
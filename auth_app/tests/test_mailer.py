@@ -0,0 +1,126 @@
+"""Unit tests for the batched Redis mail outbox.
+
+This module contains test cases to verify that queued messages are sent in batches
+over one connection each, that failed messages are retried with backoff and that
+messages are given up on after the maximum number of attempts, and that no
+message is lost when a message or the drain itself fails.
+"""
+
+from auth_app import mailer
+from django.core import mail
+from django.core.cache import cache
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import TestCase, override_settings
+from django_redis import get_redis_connection
+from unittest import mock
+import json
+import smtplib
+
+
+class FailingEmailBackend(EmailBackend):
+    """Email backend that fails to send every message."""
+
+    def send_messages(self, messages):
+        """Raise an SMTP error instead of sending."""
+        raise smtplib.SMTPServerDisconnected('Connection unexpectedly closed')
+
+
+@override_settings(
+    EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+    TESTING=True,
+    MAIL_RETRY_BACKOFF=0,
+    MAIL_MAX_ATTEMPTS=2
+)
+class MailerTestCase(TestCase):
+    """Test case for the mail outbox and drain."""
+
+    def setUp(self):
+        """Start from an empty outbox."""
+        cache.clear()
+        mail.outbox = []
+        self.redis = get_redis_connection('default')
+
+    def tearDown(self):
+        """Clear the outbox from the shared cache."""
+        cache.clear()
+
+    def queue(self, count):
+        """Queue messages without triggering a drain."""
+        with mock.patch.object(mailer, 'schedule_drain'):
+            for index in range(count):
+                mailer.queue_mail('Subject', f'Body {index}', None, [f'user{index}@example.com'], '<p>Body</p>')
+
+    def test_queue_mail_delivers(self):
+        """Test that a queued message is delivered with its HTML alternative."""
+        mailer.queue_mail('Subject', 'Body', None, ['user@example.com'], '<p>Body</p>')
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['user@example.com'])
+        self.assertEqual(mail.outbox[0].alternatives[0][1], 'text/html')
+
+    def test_drain_sends_batches_over_one_connection(self):
+        """Test that every batch opens exactly one backend connection."""
+        self.queue(5)
+        with mock.patch.object(mailer, 'get_connection', wraps=mailer.get_connection) as get_connection:
+            stats = mailer.drain_outbox(batch_size=2)
+        self.assertEqual(stats['sent'], 5)
+        self.assertEqual(get_connection.call_count, 3)
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertEqual(self.redis.llen(mailer.outbox_key()), 0)
+
+    def test_failed_messages_are_retried_then_given_up(self):
+        """Test that failures are retried with backoff and end in the failed list."""
+        self.queue(1)
+        with self.settings(EMAIL_BACKEND='auth_app.tests.test_mailer.FailingEmailBackend'):
+            self.assertEqual(mailer.drain_outbox()['retried'], 1)
+            self.assertEqual(self.redis.zcard(mailer.retry_key()), 1)
+            self.assertEqual(mailer.drain_outbox()['failed'], 1)
+        self.assertEqual(self.redis.zcard(mailer.retry_key()), 0)
+        self.assertEqual(self.redis.llen(mailer.failed_key()), 1)
+
+    def test_retried_message_is_sent_when_backend_recovers(self):
+        """Test that a deferred message is delivered by a later drain."""
+        self.queue(1)
+        with self.settings(EMAIL_BACKEND='auth_app.tests.test_mailer.FailingEmailBackend'):
+            mailer.drain_outbox()
+        self.assertEqual(mailer.drain_outbox()['sent'], 1)
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_unexpected_error_defers_only_that_message(self):
+        """Test that a non-SMTP error defers the failing message and the rest of the batch is sent."""
+        self.queue(3)
+        build_message = mailer.build_message
+
+        def fail_second(message, connection):
+            if message['body'] == 'Body 1':
+                raise KeyError('html_body')
+            return build_message(message, connection)
+
+        with mock.patch.object(mailer, 'build_message', side_effect=fail_second), \
+                self.assertLogs('auth_app.mailer', 'ERROR'):
+            stats = mailer.drain_outbox(batch_size=3)
+        self.assertEqual((stats['sent'], stats['retried']), (2, 1))
+        self.assertEqual(self.redis.llen(mailer.processing_key()), 0)
+        self.assertEqual(self.redis.zcard(mailer.retry_key()), 1)
+
+    def test_crashed_drain_loses_no_mail(self):
+        """Test that a drain crashing mid-batch clears its flag and a later drain sends the rest."""
+        self.queue(3)
+        self.redis.set(mailer.drain_flag_key(), 1)
+        with mock.patch.object(mailer, 'send_batch', side_effect=SystemExit), \
+                mock.patch.object(mailer, 'schedule_drain'):
+            with self.assertRaises(SystemExit):
+                mailer.drain_outbox(batch_size=2)  # Like a killed worker after claiming a batch
+        self.assertFalse(self.redis.exists(mailer.drain_flag_key()))
+        self.assertEqual(self.redis.llen(mailer.processing_key()), 2)
+
+        self.assertEqual(mailer.drain_outbox()['sent'], 3)
+        self.assertEqual([message.body for message in mail.outbox], ['Body 0', 'Body 1', 'Body 2'])
+
+    def test_malformed_payload_is_moved_to_failed(self):
+        """Test that an unreadable payload ends in the failed list instead of blocking the outbox."""
+        self.redis.rpush(mailer.outbox_key(), 'not json', json.dumps({'attempts': 0}))
+        with self.assertLogs('auth_app.mailer', 'ERROR'):
+            stats = mailer.drain_outbox()
+        self.assertEqual(stats['failed'] + stats['retried'], 2)
+        self.assertEqual(self.redis.llen(mailer.outbox_key()), 0)
+        self.assertEqual(self.redis.llen(mailer.processing_key()), 0)
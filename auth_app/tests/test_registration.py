@@ -54,4 +54,18 @@ class RegistrationTestCase(APITestCase):
             'confirmed_password': 'testpass123'
         }
         response = self.client.post('/api/register/', data)
-        self.assertEqual(response.status_code, 400)
\ No newline at end of file
+        self.assertEqual(response.status_code, 400)
+
+    def test_registration_existing_email_different_case(self):
+        """Test registration failure when the email differs only in letter case."""
+        User.objects.create_user(username='existing', email='Test@Example.com', password='pass', is_active=False)
+        mail.outbox = []  # Drop the activation email of the existing user
+        data = {
+            'email': 'test@example.com',
+            'password': 'testpass123',
+            'confirmed_password': 'testpass123'
+        }
+        response = self.client.post('/api/register/', data)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['non_field_errors'], ['Email already exists'])
+        self.assertEqual(len(mail.outbox), 0)  # Verify no activation email was sent
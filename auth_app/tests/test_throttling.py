@@ -0,0 +1,102 @@
+"""Unit tests for the Redis sliding-window throttles of the auth endpoints.
+
+This module contains test cases to verify per-IP and per-email rate limits, the
+login lockout after repeated failures, that spoofed X-Forwarded-For headers do
+not escape the IP limit, that the throttles fail open without Redis, and rate
+parsing with period multipliers.
+"""
+
+from auth_app.api.throttling import IPRateThrottle
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.test import override_settings
+from redis.exceptions import ConnectionError as RedisConnectionError
+from rest_framework.test import APITestCase
+from unittest import mock
+
+
+@override_settings(
+    EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+    TESTING=True
+)
+class ThrottlingTestCase(APITestCase):
+    """Test case for the auth endpoint throttles."""
+
+    def setUp(self):
+        """Set up an active user and start from empty throttle windows."""
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='test@example.com',
+            email='test@example.com',
+            password='testpass123',
+            is_active=True
+        )
+
+    def tearDown(self):
+        """Clear the throttle windows from the shared cache."""
+        cache.clear()
+
+    def test_login_throttled_per_ip(self):
+        """Test that logins beyond the IP rate get 429 with Retry-After."""
+        with mock.patch.dict(IPRateThrottle.THROTTLE_RATES, {'login_ip': '2/m'}):
+            for email in ['a@example.com', 'b@example.com']:
+                self.assertEqual(self.client.post('/api/login/', {'email': email, 'password': 'x'}).status_code, 400)
+            response = self.client.post('/api/login/', {'email': 'test@example.com', 'password': 'testpass123'})
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
+
+    def test_spoofed_forwarded_for_is_ignored(self):
+        """Test that changing X-Forwarded-For per request does not reset the IP limit."""
+        with mock.patch.dict(IPRateThrottle.THROTTLE_RATES, {'login_ip': '2/m'}):
+            responses = [
+                self.client.post('/api/login/', {'email': f'{index}@example.com', 'password': 'x'},
+                                 HTTP_X_FORWARDED_FOR=f'203.0.113.{index}')
+                for index in range(3)
+            ]
+        self.assertEqual([response.status_code for response in responses], [400, 400, 429])
+
+    def test_register_throttled_per_email(self):
+        """Test that the email limit applies across IPs and letter case."""
+        data = {'email': 'new@example.com', 'password': 'testpass123', 'confirmed_password': 'testpass123'}
+        with mock.patch.dict(IPRateThrottle.THROTTLE_RATES, {'register_email': '1/h'}):
+            self.assertEqual(self.client.post('/api/register/', data, REMOTE_ADDR='10.0.0.1').status_code, 201)
+            data['email'] = ' NEW@example.com'
+            response = self.client.post('/api/register/', data, REMOTE_ADDR='10.0.0.2')
+        self.assertEqual(response.status_code, 429)
+
+    def test_login_lockout_after_failures(self):
+        """Test that repeated failed logins lock the email out, even with the right password."""
+        with mock.patch.dict(IPRateThrottle.THROTTLE_RATES, {'login_lockout': '2/15m'}):
+            self.assertEqual(self.client.post('/api/login/', {'email': 'test@example.com', 'password': 'testpass123'}).status_code, 200)
+            for _ in range(2):
+                self.assertEqual(self.client.post('/api/login/', {'email': 'test@example.com', 'password': 'x'}).status_code, 400)
+            response = self.client.post('/api/login/', {'email': 'test@example.com', 'password': 'testpass123'})
+            self.assertEqual(response.status_code, 429)
+            self.assertGreater(int(response['Retry-After']), 800)
+            other = self.client.post('/api/login/', {'email': 'other@example.com', 'password': 'x'})
+        self.assertEqual(other.status_code, 400)
+
+    def test_throttles_fail_open_without_redis(self):
+        """Test that login still works, unthrottled, while Redis is unreachable."""
+        script = mock.Mock(side_effect=RedisConnectionError('down'))
+        with mock.patch('auth_app.api.throttling._script', script), \
+                mock.patch.dict(IPRateThrottle.THROTTLE_RATES, {'login_ip': '1/m'}), \
+                self.assertLogs('auth_app.api.throttling', 'WARNING'):
+            responses = [
+                self.client.post('/api/login/', {'email': 'test@example.com', 'password': password})
+                for password in ['x', 'testpass123']
+            ]
+        self.assertEqual([response.status_code for response in responses], [400, 200])
+        self.assertTrue(script.called)
+
+    def test_parse_rate_with_multiplier(self):
+        """Test that rates accept a multiplier on the period."""
+        throttle = IPRateThrottle()
+        self.assertEqual(throttle.parse_rate('5/15m'), (5, 900))
+        self.assertEqual(throttle.parse_rate('10/hour'), (10, 3600))
+
+    def test_parse_rate_rejects_zero(self):
+        """Test that a rate allowing no requests is rejected as a configuration error."""
+        with self.assertRaises(ImproperlyConfigured):
+            IPRateThrottle().parse_rate('0/m')
@@ -0,0 +1,74 @@
+"""Two-level cache for resolving authenticated users by ID.
+
+This module keeps recently resolved users in a small per-process cache with a
+short TTL, backed by the shared Redis cache. Authenticated requests can then
+resolve their user without a database query. Only the fields listed in
+CACHED_FIELDS are stored, so password hashes never reach the shared cache, and
+users are rebuilt from them as unsaved, read-only User instances. Entries are invalidated by the User
+save and delete signals; other processes drop their local copy once its short TTL
+expires.
+"""
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+import time
+
+LOCAL_MAX_ENTRIES = 10000  # Bound on the per-process cache size
+CACHED_FIELDS = ('id', 'username', 'email', 'is_active', 'is_staff', 'is_superuser')  # Needed for authentication
+
+_local_users = {}  # user_id -> (expires_at, user)
+
+
+def user_cache_key(user_id):
+    """Return the shared cache key of a user.
+
+    Args:
+        user_id: The ID of the user.
+
+    Returns:
+        str: The cache key for the user.
+    """
+    return f'auth_user:{user_id}'
+
+
+def get_cached_user(user_id):
+    """Return the user with the given ID from the per-process cache, Redis or the database.
+
+    Cached users only carry CACHED_FIELDS, are shared between requests and must
+    be treated as read-only.
+
+    Args:
+        user_id: The ID of the user, as stored in the token.
+
+    Returns:
+        User or None: The user, or None if no such user exists.
+    """
+    user_id = str(user_id)
+    now = time.monotonic()
+    entry = _local_users.get(user_id)
+    if entry and entry[0] > now:
+        return entry[1]
+
+    fields = cache.get(user_cache_key(user_id))
+    if fields is None:
+        fields = User.objects.filter(pk=user_id).values(*CACHED_FIELDS).first()
+        if fields is None:
+            return None
+        cache.set(user_cache_key(user_id), fields, timeout=settings.JWT_USER_CACHE_TTL)
+    user = User(**fields)  # Carries no password hash; never saved
+
+    if len(_local_users) >= LOCAL_MAX_ENTRIES:
+        _local_users.clear()  # Cheap bound; entries are repopulated from Redis
+    _local_users[user_id] = (now + settings.JWT_USER_CACHE_LOCAL_TTL, user)
+    return user
+
+
+def invalidate_user(user_id):
+    """Drop a user from the per-process and shared caches.
+
+    Args:
+        user_id: The ID of the user.
+    """
+    _local_users.pop(str(user_id), None)
+    cache.delete(user_cache_key(user_id))
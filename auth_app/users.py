@@ -0,0 +1,32 @@
+"""User lookups backed by the unique, case-insensitive email index.
+
+Emails are matched with the same UPPER(email) expression and blank-email
+predicate as the auth_user_email_upper_uniq index, so every lookup is a single
+index probe and matches at most one user.
+"""
+
+from django.contrib.auth.models import User
+
+
+def users_with_email(email):
+    """Return a queryset of users whose email matches case-insensitively.
+
+    Args:
+        email (str): The email address to look up.
+
+    Returns:
+        QuerySet: Users with the email; at most one thanks to the unique index.
+    """
+    return User.objects.filter(email__iexact=email).exclude(email='')
+
+
+def get_user_by_email(email):
+    """Return the user with the given email, or None.
+
+    Args:
+        email (str): The email address to look up.
+
+    Returns:
+        User or None: The matching user.
+    """
+    return users_with_email(email).first()
@@ -2,42 +2,48 @@
 
 set -e
 
-echo "Warte auf PostgreSQL auf $DB_HOST:$DB_PORT..."
-
-# -q für "quiet" (keine Ausgabe außer Fehlern)
-# Die Schleife läuft, solange pg_isready *nicht* erfolgreich ist (Exit-Code != 0)
-while ! pg_isready -h "$DB_HOST" -p "$DB_PORT" -q; do
-  echo "PostgreSQL ist nicht erreichbar - schlafe 1 Sekunde"
-  sleep 1
-done
-
-echo "PostgreSQL ist bereit - fahre fort..."
-
-# Deine originalen Befehle (ohne wait_for_db)
-python manage.py collectstatic --noinput
-python manage.py makemigrations
-python manage.py migrate
-
-# Create a superuser using environment variables
-# (Dein Superuser-Erstellungs-Code bleibt gleich)
-python manage.py shell <<EOF
-import os
-from django.contrib.auth import get_user_model
-
-User = get_user_model()
-username = os.environ.get('DJANGO_SUPERUSER_USERNAME', 'admin')
-email = os.environ.get('DJANGO_SUPERUSER_EMAIL', 'admin@example.com')
-password = os.environ.get('DJANGO_SUPERUSER_PASSWORD', 'adminpassword')
-
-if not User.objects.filter(username=username).exists():
-    print(f"Creating superuser '{username}'...")
-    # Korrekter Aufruf: username hier übergeben
-    User.objects.create_superuser(username=username, email=email, password=password)
-    print(f"Superuser '{username}' created.")
-else:
-    print(f"Superuser '{username}' already exists.")
-EOF
-
-python manage.py rqworker default &
-
-exec gunicorn core.wsgi:application --bind 0.0.0.0:8000 --reload
+# Startzeit des Containers; der Readiness-Endpunkt meldet daraus die Kaltstartzeit
+export CONTAINER_STARTED_AT="${CONTAINER_STARTED_AT:-$(date +%s.%N)}"
+
+# Rolle dieses Containers:
+#   release - einmal pro Deployment: Migrationen, collectstatic, Superuser (unter Advisory Lock)
+#   web     - gunicorn, startet ohne Vorbereitungsschritte
+#   worker  - RQ-Worker
+# Alle Rollen laufen aus demselben Image und werden getrennt skaliert.
+ROLE="${1:-web}"
+
+wait_for_db() {
+  echo "Warte auf PostgreSQL auf $DB_HOST:$DB_PORT..."
+
+  # -q für "quiet" (keine Ausgabe außer Fehlern)
+  # Die Schleife läuft, solange pg_isready *nicht* erfolgreich ist (Exit-Code != 0)
+  while ! pg_isready -h "$DB_HOST" -p "$DB_PORT" -q; do
+    echo "PostgreSQL ist nicht erreichbar - schlafe 1 Sekunde"
+    sleep 1
+  done
+
+  echo "PostgreSQL ist bereit - fahre fort..."
+}
+
+case "$ROLE" in
+  release)
+    wait_for_db
+    exec python manage.py release
+    ;;
+  web)
+    # Keine Vorbereitung: bereit ist der Container, sobald /api/health/ready/ 200 liefert.
+    # Worker-Klasse, Anzahl Worker/Threads, Preload und Keepalive stehen in gunicorn.conf.py
+    exec gunicorn
+    ;;
+  worker)
+    wait_for_db
+    python manage.py prune_tokens --schedule
+    python manage.py sweep_media --schedule
+    python manage.py tier_media --schedule
+    exec python manage.py rqworker default --with-scheduler
+    ;;
+  *)
+    echo "Unbekannte Rolle: $ROLE (erwartet: release, web oder worker)" >&2
+    exit 1
+    ;;
+esac
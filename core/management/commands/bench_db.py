@@ -0,0 +1,80 @@
+"""Management command benchmarking request latency with different connection handling.
+
+The command replays the database side of a segment request, which is the
+rendition inventory lookup of HLSSegmentView, in the connection lifecycle Django
+applies to every request: stale connections are closed when a request starts and
+ends. It reports latency percentiles and requests per second with a new connection
+per request, with persistent connections, and with psycopg's connection pool.
+Point DB_HOST and DB_PORT at a PgBouncer to measure it instead of PostgreSQL.
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.db.utils import load_backend
+from video_content_app.models import Rendition
+import statistics
+import time
+
+
+class Command(BaseCommand):
+    """Benchmark per-request database latency with and without connection reuse."""
+    help = 'Benchmark segment request database latency with new, persistent and pooled connections.'
+
+    def add_arguments(self, parser):
+        """Register command line options for the number of requests and the video."""
+        parser.add_argument('--requests', type=int, default=500, help='Simulated requests per variant.')
+        parser.add_argument('--video', type=int, default=1, help='Video ID to look up.')
+
+    def handle(self, *args, **options):
+        """Time every variant and print a summary line for each."""
+        query = (
+            Rendition.objects.filter(video_id=options['video'], resolution='480p')
+            .values_list('id', 'segment_count', 'tier', 'video__hls_layout')[:1]
+        )
+        sql, params = query.query.sql_with_params()
+        variants = [
+            ('new connection', {'CONN_MAX_AGE': 0}),
+            ('persistent', {'CONN_MAX_AGE': 60, 'CONN_HEALTH_CHECKS': True}),
+            ('psycopg pool', {'CONN_MAX_AGE': 0, 'pool': {'min_size': 1, 'max_size': 2}}),
+        ]
+        for name, overrides in variants:
+            connection = self.connection(**overrides)
+            try:
+                timings = self.run(connection, sql, params, options['requests'])
+            finally:
+                connection.close()
+                if connection.pool:
+                    connection.close_pool()
+            self.stdout.write(
+                f'{name:<16} p50={statistics.median(timings) * 1000:.3f}ms '
+                f'p95={statistics.quantiles(timings, n=20)[-1] * 1000:.3f}ms '
+                f'{len(timings) / sum(timings):,.0f} requests/sec'
+            )
+
+    def connection(self, pool=None, **overrides):
+        """Return a separate database connection with modified connection settings."""
+        settings_dict = {**connections['default'].settings_dict, **overrides}
+        options = {key: value for key, value in settings_dict['OPTIONS'].items() if key != 'pool'}
+        if pool:
+            options['pool'] = pool
+        settings_dict['OPTIONS'] = options
+        connection = load_backend(settings_dict['ENGINE']).DatabaseWrapper(settings_dict, alias='bench')
+        connections['bench'] = connection  # Looked up by alias when contrib.postgres registers type handlers
+        return connection
+
+    def run(self, connection, sql, params, requests):
+        """Time the query in the per-request connection lifecycle.
+
+        Returns:
+            list: The duration of every simulated request in seconds.
+        """
+        timings = []
+        for _ in range(requests):
+            start = time.perf_counter()
+            connection.close_if_unusable_or_obsolete()  # As on request_started
+            with connection.cursor() as cursor:
+                cursor.execute(sql, params)
+                cursor.fetchone()
+            connection.close_if_unusable_or_obsolete()  # As on request_finished
+            timings.append(time.perf_counter() - start)
+        return timings
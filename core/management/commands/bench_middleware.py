@@ -0,0 +1,97 @@
+"""Management command timing each middleware on an HLS segment request.
+
+The command builds the MIDDLEWARE chain twice, once with the stock Django and
+WhiteNoise classes and once with the core.middleware variants that step aside for
+streaming routes, around a view that returns an empty response. It sends the same
+segment request through both chains and reports the time spent in each middleware,
+including its process_view hook, in microseconds per request.
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.utils.module_loading import import_string
+from core.middleware import StreamingBypassMixin
+import time
+
+
+def endpoint(request):
+    """Stand in for the segment view."""
+    return HttpResponse(b'', content_type='video/MP2T')
+
+
+def stock_class(cls):
+    """Return the Django or WhiteNoise class a core.middleware variant extends."""
+    return cls.__bases__[-1] if issubclass(cls, StreamingBypassMixin) else cls
+
+
+class Command(BaseCommand):
+    """Report per-middleware time on a segment request for the stock and the lean chain."""
+    help = 'Time each middleware on an HLS segment request with the stock and the lean middleware classes.'
+
+    def add_arguments(self, parser):
+        """Register command line options for the number of requests and the path."""
+        parser.add_argument('--requests', type=int, default=20000, help='Requests per chain.')
+        parser.add_argument('--path', default='/api/video/1/480p/000000.ts/', help='Request path.')
+
+    def handle(self, *args, **options):
+        """Time both chains and print a table of microseconds per request."""
+        lean = [import_string(path) for path in settings.MIDDLEWARE]
+        stock = [stock_class(cls) for cls in lean]
+        factory = RequestFactory()
+        requests = options['requests']
+        self.run(stock, factory, options['path'], requests // 10)  # Warm up
+        stock_times = self.run(stock, factory, options['path'], requests)
+        lean_times = self.run(lean, factory, options['path'], requests)
+
+        self.stdout.write(f"{'middleware':<26} {'stock':>9} {'lean':>9} {'saved':>9}  (us/request)")
+        for cls, stock_time, lean_time in zip(stock, stock_times, lean_times):
+            self.stdout.write(
+                f'{cls.__name__:<26} {stock_time / requests * 1e6:>9.2f} {lean_time / requests * 1e6:>9.2f} '
+                f'{(stock_time - lean_time) / requests * 1e6:>9.2f}'
+            )
+        stock_total, lean_total = sum(stock_times), sum(lean_times)
+        self.stdout.write(
+            f"{'total':<26} {stock_total / requests * 1e6:>9.2f} {lean_total / requests * 1e6:>9.2f} "
+            f'{(stock_total - lean_total) / requests * 1e6:>9.2f}'
+        )
+
+    def run(self, classes, factory, path, requests):
+        """Send requests through a chain of middleware classes.
+
+        Returns:
+            list: The seconds spent in each middleware, excluding the layers it wraps.
+        """
+        count = len(classes)
+        inclusive = [0.0] * (count + 1)  # Time in layer i and everything inside it
+        hooks = [0.0] * count  # Time in each middleware's process_view
+        instances = []
+
+        def timed(index, func):
+            def call(request):
+                start = time.perf_counter()
+                response = func(request)
+                inclusive[index] += time.perf_counter() - start
+                return response
+            return call
+
+        def view_stage(request):
+            for index, instance in enumerate(instances):
+                if hasattr(instance, 'process_view'):
+                    start = time.perf_counter()
+                    response = instance.process_view(request, endpoint, (), {})
+                    hooks[index] += time.perf_counter() - start
+                    if response is not None:
+                        return response
+            return endpoint(request)
+
+        handler = timed(count, view_stage)
+        for index in reversed(range(count)):
+            instance = classes[index](handler)
+            instances.insert(0, instance)
+            handler = timed(index, instance)
+
+        for _ in range(requests):
+            handler(factory.get(path, HTTP_HOST=settings.ALLOWED_HOSTS[0]))
+        return [inclusive[index] - inclusive[index + 1] + hooks[index] for index in range(count)]
@@ -0,0 +1,70 @@
+"""Management command running the one-off steps of a deployment.
+
+The release role runs this command once per deployment, before web replicas
+start: it applies migrations, collects static files and creates the superuser
+from the DJANGO_SUPERUSER_* environment variables if it does not exist yet. The
+steps run behind a PostgreSQL advisory lock, so concurrently started release
+containers run them one after another instead of racing; the later ones find
+nothing left to do. The lock is tied to the database session and released even
+if the process dies. A PgBouncer in transaction pooling mode may hand each
+statement to another server session, which breaks both the session lock and
+migrations that run outside a transaction, so the command refuses to run with
+DB_PGBOUNCER set; point DB_HOST and DB_PORT at PostgreSQL itself instead.
+"""
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+import os
+import time
+
+RELEASE_LOCK_ID = 7236250411  # Advisory lock key shared by all release containers
+
+
+class Command(BaseCommand):
+    """Apply migrations, collect static files and ensure the superuser exists."""
+    help = 'Run the one-off deployment steps behind an advisory lock: migrate, collectstatic, create the superuser.'
+
+    def add_arguments(self, parser):
+        """Register a command line option to skip collectstatic."""
+        parser.add_argument('--skip-static', action='store_true', help='Do not collect static files.')
+
+    def handle(self, *args, **options):
+        """Run the release steps while holding the advisory lock.
+
+        Raises:
+            CommandError: If the database connection goes through PgBouncer.
+        """
+        if settings.DB_PGBOUNCER:
+            raise CommandError(
+                'The release steps need a direct PostgreSQL connection: run them with DB_PGBOUNCER=False '
+                'and DB_HOST/DB_PORT of the database server.'
+            )
+        start = time.perf_counter()
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_advisory_lock(%s)', [RELEASE_LOCK_ID])  # Waits for a concurrent release
+            try:
+                self.stdout.write(f'Acquired the release lock after {time.perf_counter() - start:.1f}s.')
+                call_command('migrate', interactive=False, verbosity=options['verbosity'])
+                if not options['skip_static']:
+                    call_command('collectstatic', interactive=False, verbosity=0)
+                self.ensure_superuser()
+            finally:
+                cursor.execute('SELECT pg_advisory_unlock(%s)', [RELEASE_LOCK_ID])
+        self.stdout.write(f'Release finished in {time.perf_counter() - start:.1f}s.')
+
+    def ensure_superuser(self):
+        """Create the superuser configured in the environment unless it exists."""
+        User = get_user_model()
+        username = os.environ.get('DJANGO_SUPERUSER_USERNAME', 'admin')
+        if User.objects.filter(username=username).exists():
+            self.stdout.write(f"Superuser '{username}' already exists.")
+            return
+        User.objects.create_superuser(
+            username=username,
+            email=os.environ.get('DJANGO_SUPERUSER_EMAIL', 'admin@example.com'),
+            password=os.environ.get('DJANGO_SUPERUSER_PASSWORD', 'adminpassword'),
+        )
+        self.stdout.write(f"Superuser '{username}' created.")
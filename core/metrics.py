@@ -0,0 +1,92 @@
+"""Lightweight process-local counters exported through Redis.
+
+Hot paths such as request authentication record events by incrementing in-memory
+counters instead of writing log lines. The counters are flushed to a Redis hash at
+most once per METRICS_FLUSH_INTERVAL seconds, so every process adds its deltas to
+the shared totals that the metrics endpoint reports. Failures can additionally be
+logged through a sampler that emits at most one record per key and interval.
+"""
+
+from collections import Counter
+from django.conf import settings
+from django.core.cache import cache
+from django_redis import get_redis_connection
+from redis.exceptions import RedisError
+import threading
+import time
+
+METRICS_KEY = 'metrics'  # Cache key of the Redis hash holding the counter totals
+
+_counters = Counter()
+_lock = threading.Lock()
+_next_flush = 0.0
+_log_samples = {}  # key -> [next_log_at, suppressed_count]
+
+
+def increment(name, amount=1):
+    """Increment a counter and flush the counters if the flush interval has passed.
+
+    Args:
+        name (str): The name of the counter, e.g. 'auth.success'.
+        amount (int): The value to add to the counter.
+    """
+    with _lock:
+        _counters[name] += amount
+        due = time.monotonic() >= _next_flush
+    if due:
+        flush()
+
+
+def flush():
+    """Add the process-local counter deltas to the shared Redis hash."""
+    global _next_flush
+    with _lock:
+        pending = dict(_counters)
+        _counters.clear()
+        _next_flush = time.monotonic() + settings.METRICS_FLUSH_INTERVAL
+    if not pending:
+        return
+    try:
+        pipe = get_redis_connection('default').pipeline(transaction=False)
+        key = cache.make_key(METRICS_KEY)
+        for name, amount in pending.items():
+            pipe.hincrby(key, name, amount)
+        pipe.execute()
+    except RedisError:
+        with _lock:
+            _counters.update(pending)  # Keep the deltas for the next flush
+
+
+def snapshot():
+    """Flush the local counters and return the shared counter totals.
+
+    Returns:
+        dict: Counter names mapped to their totals across all processes.
+    """
+    flush()
+    totals = get_redis_connection('default').hgetall(cache.make_key(METRICS_KEY))
+    return {name.decode(): int(value) for name, value in sorted(totals.items())}
+
+
+def log_sampled(log, level, key, message, *args):
+    """Log a message at most once per METRICS_LOG_SAMPLE_INTERVAL seconds for a key.
+
+    Suppressed occurrences are counted and reported with the next emitted record.
+
+    Args:
+        log (logging.Logger): The logger to write to.
+        level (int): The logging level.
+        key (str): The sampling key; each key is rate-limited independently.
+        message (str): The %-style log message.
+        *args: Arguments for the log message.
+    """
+    now = time.monotonic()
+    with _lock:
+        sample = _log_samples.setdefault(key, [0.0, 0])
+        if now < sample[0]:
+            sample[1] += 1
+            return
+        suppressed = sample[1]
+        sample[0] = now + settings.METRICS_LOG_SAMPLE_INTERVAL
+        sample[1] = 0
+    log.log(level, message + ' (%d similar suppressed)', *args, suppressed)
@@ -0,0 +1,60 @@
+"""Middleware variants that step aside for HLS streaming routes.
+
+Playlist and segment requests, `/api/video/<id>/<resolution>/index.m3u8` and
+`/api/video/<id>/<resolution>/<segment>/`, authenticate with a playback token or a
+JWT and never use sessions, messages, CSRF protection or static files, yet they
+make up most of the traffic. The classes below are drop-in subclasses of the
+Django and WhiteNoise middleware used in MIDDLEWARE: for streaming routes they
+hand the request straight to the next middleware, for every other route they
+behave exactly like their base classes.
+"""
+
+from django.contrib.auth import middleware as auth
+from django.contrib.messages import middleware as messages
+from django.contrib.sessions import middleware as sessions
+from django.middleware import csrf
+from whitenoise import middleware as whitenoise
+import re
+
+STREAMING_PATH = re.compile(r'/api/video/\d+/[^/]+/(?:index\.m3u8|[^/]+/)')  # HLS playlists and segments
+
+
+def is_streaming_request(request):
+    """Return whether a request targets an HLS playlist or segment."""
+    return STREAMING_PATH.fullmatch(request.path_info) is not None
+
+
+class StreamingBypassMixin:
+    """Skip the middleware for streaming routes."""
+
+    def __call__(self, request):
+        """Pass streaming requests on untouched and process all others."""
+        if is_streaming_request(request):
+            return self.get_response(request)
+        return super().__call__(request)
+
+
+class WhiteNoiseMiddleware(StreamingBypassMixin, whitenoise.WhiteNoiseMiddleware):
+    """WhiteNoiseMiddleware that does not look up streaming routes among the static files."""
+
+
+class SessionMiddleware(StreamingBypassMixin, sessions.SessionMiddleware):
+    """SessionMiddleware that neither loads nor saves sessions for streaming routes."""
+
+
+class CsrfViewMiddleware(StreamingBypassMixin, csrf.CsrfViewMiddleware):
+    """CsrfViewMiddleware that skips streaming routes, which only serve GET requests to token-authenticated clients."""
+
+    def process_view(self, request, callback, callback_args, callback_kwargs):
+        """Check the CSRF token unless the request targets a streaming route."""
+        if is_streaming_request(request):
+            return None
+        return super().process_view(request, callback, callback_args, callback_kwargs)
+
+
+class AuthenticationMiddleware(StreamingBypassMixin, auth.AuthenticationMiddleware):
+    """AuthenticationMiddleware that leaves authentication of streaming routes to the views."""
+
+
+class MessageMiddleware(StreamingBypassMixin, messages.MessageMiddleware):
+    """MessageMiddleware that sets up no message storage for streaming routes."""
@@ -0,0 +1,87 @@
+"""Fast JSON renderer and parser for the Django REST Framework API.
+
+This module provides drop-in replacements for DRF's JSONRenderer and JSONParser
+backed by orjson. orjson is an optional dependency: when it is not installed, or a
+response asks for indented or ASCII-only output, both classes fall back to the
+standard library implementation inherited from DRF, so the wire format stays the
+same either way.
+"""
+
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to the stdlib json module
+    orjson = None
+
+ORJSON_OPTIONS = (orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS) if orjson else 0  # UTC datetimes end in 'Z', like DRF
+ENCODER = JSONEncoder()  # DRF's encoder handles Decimal, lazy strings, UUIDs, querysets, etc.
+
+
+def encode_default(obj):
+    """Encode objects orjson does not support natively, exactly like DRF does.
+
+    Args:
+        obj: The object that could not be serialized.
+
+    Returns:
+        A JSON-serializable representation of the object.
+    """
+    return ENCODER.default(obj)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSON renderer using orjson for compact output, with a stdlib fallback."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Render data into JSON, returning a bytestring.
+
+        Args:
+            data: The data to render.
+            accepted_media_type (str, optional): The negotiated media type.
+            renderer_context (dict, optional): Extra context, e.g. the requested indent.
+
+        Returns:
+            bytes: The rendered JSON document.
+        """
+        if data is None:
+            return b''
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if orjson is None or indent is not None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(data, default=encode_default, option=ORJSON_OPTIONS)
+        # Escape \u2028 and \u2029 like DRF so the output stays a strict JavaScript subset
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+
+class FastJSONParser(JSONParser):
+    """JSON parser using orjson, with a stdlib fallback."""
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        """Parse the incoming bytestream as JSON and return the resulting data.
+
+        Args:
+            stream: The request body stream.
+            media_type (str, optional): The media type of the request body.
+            parser_context (dict, optional): Extra context, e.g. the request encoding.
+
+        Returns:
+            The parsed data.
+
+        Raises:
+            ParseError: If the body is not valid JSON.
+        """
+        encoding = (parser_context or {}).get('encoding', 'utf-8')
+        if orjson is None or encoding.lower().replace('-', '') != 'utf8':
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())  # Rejects NaN and Infinity like DRF's strict mode
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
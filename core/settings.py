@@ -43,24 +43,28 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',  # add for full-text and trigram video search.
     'rest_framework',
     'rest_framework_simplejwt',
     'corsheaders',
     'auth_app.apps.AuthAppConfig',
     'video_content_app.apps.VideoContentAppConfig',  # add with custom config for signals.
+    'core',  # add for the release management command.
     'django_rq',
     'rest_framework_simplejwt.token_blacklist',  # add for blacklisting refresh tokens.
 ]
 
+# The core.middleware variants skip HLS playlist and segment requests and otherwise
+# behave like the Django and WhiteNoise classes they extend.
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
+    'core.middleware.WhiteNoiseMiddleware',
+    'core.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
-    'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
-    'django.contrib.messages.middleware.MessageMiddleware',
+    'core.middleware.CsrfViewMiddleware',
+    'core.middleware.AuthenticationMiddleware',
+    'core.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
@@ -126,6 +130,19 @@ WSGI_APPLICATION = 'core.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Each thread keeps its connection open for DB_CONN_MAX_AGE seconds and checks it before
+# reuse. DB_POOL switches to psycopg's per-process connection pool instead, handing out up to
+# DB_POOL_MAX_SIZE connections and waiting up to DB_POOL_TIMEOUT seconds for a free one.
+# DB_PGBOUNCER declares a PgBouncer in transaction pooling mode in front of PostgreSQL,
+# where server-side cursors do not survive the end of a transaction. The release command
+# needs session-level locks and refuses to run through PgBouncer. The ASGI server
+# (GUNICORN_WORKER_CLASS=uvicorn) runs sync code in changing threads, so persistent
+# connections would leak; it always closes them after each request, and DB_POOL is the
+# way to reuse connections there.
+DB_POOL = os.getenv('DB_POOL', 'False') == 'True'
+DB_PGBOUNCER = os.getenv('DB_PGBOUNCER', 'False') == 'True'
+ASGI_SERVER = os.getenv('GUNICORN_WORKER_CLASS') == 'uvicorn'
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.postgresql",
@@ -133,7 +150,17 @@ DATABASES = {
         "USER": os.environ.get("DB_USER", default="videoflix_user"),
         "PASSWORD": os.environ.get("DB_PASSWORD", default="supersecretpassword"),
         "HOST": os.environ.get("DB_HOST", default="db"),
-        "PORT": os.environ.get("DB_PORT", default=5432)
+        "PORT": os.environ.get("DB_PORT", default=5432),
+        "CONN_MAX_AGE": 0 if DB_POOL or ASGI_SERVER else int(os.getenv('DB_CONN_MAX_AGE', 60)),  # The pool and ASGI require 0
+        "CONN_HEALTH_CHECKS": os.getenv('DB_CONN_HEALTH_CHECKS', 'True') == 'True',
+        "DISABLE_SERVER_SIDE_CURSORS": DB_PGBOUNCER,
+        "OPTIONS": {
+            "pool": {
+                "min_size": int(os.getenv('DB_POOL_MIN_SIZE', 2)),
+                "max_size": int(os.getenv('DB_POOL_MAX_SIZE', 10)),
+                "timeout": float(os.getenv('DB_POOL_TIMEOUT', 10)),
+            },
+        } if DB_POOL else {},
     }
 }
 
@@ -148,6 +175,9 @@ CACHES = {
     }
 }
 
+METRICS_FLUSH_INTERVAL = int(os.getenv('METRICS_FLUSH_INTERVAL', 10))  # Seconds between counter flushes to Redis
+METRICS_LOG_SAMPLE_INTERVAL = int(os.getenv('METRICS_LOG_SAMPLE_INTERVAL', 60))  # Seconds between sampled log records per key
+
 RQ_QUEUES = {
     'default': {
         'HOST': os.environ.get("REDIS_HOST", default="redis"),
@@ -158,6 +188,20 @@ RQ_QUEUES = {
     },
 }
 
+# Password hashing: Argon2 with costs tuned via `manage.py calibrate_hasher`.
+# Older PBKDF2 hashes stay valid and are upgraded on the next successful login.
+PASSWORD_HASHERS = [
+    'auth_app.hashers.TunedArgon2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+ARGON2_TIME_COST = int(os.getenv('ARGON2_TIME_COST', 2))  # Iterations
+ARGON2_MEMORY_COST = int(os.getenv('ARGON2_MEMORY_COST', 19456))  # KiB
+ARGON2_PARALLELISM = int(os.getenv('ARGON2_PARALLELISM', 1))  # Lanes
+PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', 0))  # Login hashing threads, 0 = one per CPU
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -198,6 +242,56 @@ STATIC_ROOT = BASE_DIR / "static"
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# HLS output storage: 'local' keeps playlists and segments below MEDIA_ROOT, 's3'
+# stores them in an S3-compatible bucket (AWS, MinIO) and serves segments through
+# presigned redirects.
+HLS_STORAGE_BACKEND = os.getenv('HLS_STORAGE_BACKEND', 'local')
+HLS_UPLOAD_WORKERS = int(os.getenv('HLS_UPLOAD_WORKERS', 8))  # Parallel uploads when publishing a transcode
+
+if HLS_STORAGE_BACKEND == 's3':
+    from boto3.s3.transfer import TransferConfig
+
+    HLS_STORAGE = {
+        'BACKEND': 'storages.backends.s3.S3Storage',
+        'OPTIONS': {
+            'bucket_name': os.getenv('HLS_S3_BUCKET', 'videoflix-hls'),
+            'endpoint_url': os.getenv('HLS_S3_ENDPOINT_URL') or None,  # e.g. http://minio:9000
+            'access_key': os.getenv('HLS_S3_ACCESS_KEY'),
+            'secret_key': os.getenv('HLS_S3_SECRET_KEY'),
+            'region_name': os.getenv('HLS_S3_REGION', 'us-east-1'),
+            'addressing_style': 'path',
+            'signature_version': 's3v4',
+            'querystring_auth': True,  # Presigned URLs
+            'querystring_expire': int(os.getenv('HLS_PRESIGNED_URL_EXPIRY', 300)),  # Seconds
+            'file_overwrite': True,
+            'transfer_config': TransferConfig(
+                multipart_threshold=8 * 1024 * 1024,
+                multipart_chunksize=8 * 1024 * 1024,
+                max_concurrency=4,
+            ),
+        },
+    }
+else:
+    HLS_STORAGE = {'BACKEND': 'django.core.files.storage.FileSystemStorage'}  # Rooted at MEDIA_ROOT
+
+# Cold tier for idle originals and renditions, e.g. a cheaper disk or network mount
+COLD_MEDIA_ROOT = os.getenv('COLD_MEDIA_ROOT', BASE_DIR / 'cold_media')
+
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+    'hls': HLS_STORAGE,
+    'cold': {'BACKEND': 'django.core.files.storage.FileSystemStorage', 'OPTIONS': {'location': COLD_MEDIA_ROOT}},
+}
+
+# Tiering policy: idle media moves to the cold storage and is restored on request
+TIERING_RENDITION_IDLE_DAYS = int(os.getenv('TIERING_RENDITION_IDLE_DAYS', 30))  # Days without playlist requests
+TIERING_ORIGINAL_IDLE_DAYS = int(os.getenv('TIERING_ORIGINAL_IDLE_DAYS', 7))  # Days without plays after transcoding
+TIERING_HOT_PLAY_COUNT = int(os.getenv('TIERING_HOT_PLAY_COUNT', 1000))  # Videos with this many plays keep all renditions hot
+TIERING_INTERVAL = int(os.getenv('TIERING_INTERVAL', 24 * 3600))  # Seconds between tiering jobs
+TIERING_TOUCH_INTERVAL = int(os.getenv('TIERING_TOUCH_INTERVAL', 3600))  # Seconds between last-played writes per rendition
+TIERING_RESTORE_TIMEOUT = int(os.getenv('TIERING_RESTORE_TIMEOUT', 3600))  # Seconds before a pending restore counts as lost
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -207,7 +301,31 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'auth_app.api.authentication.CookieJWTAuthentication',
         'rest_framework.authentication.SessionAuthentication',  # ADDITION: Fallback to session auth (browser sessions) for dev if JWT fails.        
-    ]
+    ],
+    # orjson-backed JSON with a stdlib fallback when orjson is not installed.
+    # Swap in rest_framework.renderers.JSONRenderer / parsers.JSONParser to opt out.
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'core.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    # Number of trusted reverse proxies in front of the app. 0 keys the per-IP throttles on REMOTE_ADDR;
+    # only raise it to the real proxy depth, since X-Forwarded-For is otherwise set by the client.
+    'NUM_PROXIES': int(os.getenv('NUM_PROXIES', 0)),
+    # Rates for the Redis sliding-window throttles of the auth endpoints (auth_app.api.throttling).
+    'DEFAULT_THROTTLE_RATES': {
+        'login_ip': os.getenv('THROTTLE_LOGIN_IP', '30/m'),
+        'login_email': os.getenv('THROTTLE_LOGIN_EMAIL', '10/m'),
+        'login_lockout': os.getenv('THROTTLE_LOGIN_LOCKOUT', '10/15m'),  # Failed logins per email
+        'register_ip': os.getenv('THROTTLE_REGISTER_IP', '10/h'),
+        'register_email': os.getenv('THROTTLE_REGISTER_EMAIL', '5/h'),
+        'password_reset_ip': os.getenv('THROTTLE_PASSWORD_RESET_IP', '10/h'),
+        'password_reset_email': os.getenv('THROTTLE_PASSWORD_RESET_EMAIL', '3/h'),
+    },
 }
 
 SIMPLE_JWT = {
@@ -231,10 +349,47 @@ SIMPLE_JWT = {
     'AUTH_REFRESH_COOKIE_SAMESITE': 'None',  # Change: 'None' for refresh cookie.
 }
 
+PLAYBACK_TOKEN_LIFETIME = int(os.getenv('PLAYBACK_TOKEN_LIFETIME', 6 * 3600))  # Seconds a playback token stays valid
+
+# Resumable uploads of original video files
+UPLOAD_MAX_SIZE = int(os.getenv('UPLOAD_MAX_SIZE', 50 * 1024 ** 3))  # Bytes per original file
+UPLOAD_READ_SIZE = int(os.getenv('UPLOAD_READ_SIZE', 1024 * 1024))  # Bytes read from the request per block
+UPLOAD_TEMP_DIR = 'uploads'  # Partial files below MEDIA_ROOT
+UPLOAD_LOCK_TIMEOUT = int(os.getenv('UPLOAD_LOCK_TIMEOUT', 300))  # Seconds an upload stays claimed without progress
+
+# Garbage collection of orphaned media files
+MEDIA_SWEEP_INTERVAL = int(os.getenv('MEDIA_SWEEP_INTERVAL', 24 * 3600))  # Seconds between sweep jobs
+MEDIA_SWEEP_BATCH_SIZE = int(os.getenv('MEDIA_SWEEP_BATCH_SIZE', 500))  # Directory entries per database query
+MEDIA_SWEEP_MIN_AGE = int(os.getenv('MEDIA_SWEEP_MIN_AGE', 3600))  # Seconds before an unreferenced file counts as orphaned
+
+# Active viewer tracking: streams send a heartbeat at most once per interval and
+# count as stopped after the timeout.
+MAX_CONCURRENT_STREAMS = int(os.getenv('MAX_CONCURRENT_STREAMS', 4))  # Per account, 0 = unlimited
+VIEWER_HEARTBEAT_INTERVAL = int(os.getenv('VIEWER_HEARTBEAT_INTERVAL', 30))  # Seconds
+VIEWER_TIMEOUT = int(os.getenv('VIEWER_TIMEOUT', 90))  # Seconds
+
+# Refresh token blacklist: Redis keys per jti, fronted by a per-process Bloom filter
+# that picks up tokens blacklisted by other processes within the sync interval.
+TOKEN_BLACKLIST_BLOOM_CAPACITY = int(os.getenv('TOKEN_BLACKLIST_BLOOM_CAPACITY', 100000))
+TOKEN_BLACKLIST_BLOOM_ERROR_RATE = float(os.getenv('TOKEN_BLACKLIST_BLOOM_ERROR_RATE', 0.01))
+TOKEN_BLACKLIST_SYNC_INTERVAL = float(os.getenv('TOKEN_BLACKLIST_SYNC_INTERVAL', 1))  # Seconds
+TOKEN_BLACKLIST_REBUILD_INTERVAL = int(os.getenv('TOKEN_BLACKLIST_REBUILD_INTERVAL', 3600))  # Seconds
+TOKEN_PRUNE_INTERVAL = int(os.getenv('TOKEN_PRUNE_INTERVAL', 3600))  # Seconds between prune jobs
+TOKEN_PRUNE_BATCH_SIZE = int(os.getenv('TOKEN_PRUNE_BATCH_SIZE', 1000))
+
+# How CookieJWTAuthentication resolves the user of a validated token:
+# 'db' queries the user on every request, 'token' builds a user from the token claims
+# (deactivation takes effect when the access token expires), 'cache' resolves users
+# through a per-process and Redis cache that is invalidated on user save and delete.
+JWT_USER_RESOLUTION = os.getenv('JWT_USER_RESOLUTION', 'db')
+JWT_USER_CACHE_TTL = int(os.getenv('JWT_USER_CACHE_TTL', 300))  # Seconds in Redis
+JWT_USER_CACHE_LOCAL_TTL = int(os.getenv('JWT_USER_CACHE_LOCAL_TTL', 5))  # Seconds per process
+
 DEFAULT_FROM_EMAIL = 'noreply@videoflix.com'
 
-# Always use SMTP for real email sending in dev and prod.
-EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+# SMTP by default; set EMAIL_BACKEND to the console or file backend for local testing.
+EMAIL_BACKEND = os.getenv('EMAIL_BACKEND', 'django.core.mail.backends.smtp.EmailBackend')
+EMAIL_FILE_PATH = os.getenv('EMAIL_FILE_PATH', BASE_DIR / 'sent_emails')  # Used by the file backend
 EMAIL_HOST = os.getenv('EMAIL_HOST')
 EMAIL_PORT = int(os.getenv('EMAIL_PORT', 587))
 EMAIL_USE_TLS = os.getenv('EMAIL_USE_TLS') == 'True'
@@ -243,3 +398,11 @@ EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER')
 EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD')
 DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL', EMAIL_HOST_USER)
 
+FRONTEND_URL = os.getenv('FRONTEND_URL', 'http://localhost:5500')  # Base URL of links in emails
+
+# Batched mail delivery through the Redis outbox (auth_app.mailer).
+MAIL_BATCH_SIZE = int(os.getenv('MAIL_BATCH_SIZE', 100))  # Messages sent per connection
+MAIL_MAX_ATTEMPTS = int(os.getenv('MAIL_MAX_ATTEMPTS', 5))
+MAIL_RETRY_BACKOFF = int(os.getenv('MAIL_RETRY_BACKOFF', 30))  # Seconds before the first retry, doubled per attempt
+MAIL_DRAIN_LOCK_TIMEOUT = int(os.getenv('MAIL_DRAIN_LOCK_TIMEOUT', 600))  # Seconds before a stuck drain is replaced
+
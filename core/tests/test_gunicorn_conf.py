@@ -0,0 +1,52 @@
+"""Unit tests for the gunicorn configuration of the web role.
+
+This module contains test cases to verify the defaults derived from the CPU count,
+overrides through GUNICORN_* environment variables, the choice of worker class and
+the database connection settings it implies.
+"""
+
+from django.conf import settings
+from django.test import SimpleTestCase
+from unittest import mock
+import os
+import runpy
+
+CONFIG_PATH = os.path.join(settings.BASE_DIR, 'gunicorn.conf.py')
+SETTINGS_PATH = os.path.join(settings.BASE_DIR, 'core', 'settings.py')
+
+
+def load_config(**env):
+    """Evaluate the configuration file with the given environment variables."""
+    with mock.patch.dict(os.environ, env), mock.patch('os.sched_getaffinity', return_value={0, 1, 2, 3}):
+        return runpy.run_path(CONFIG_PATH)
+
+
+class GunicornConfigTestCase(SimpleTestCase):
+    """Test case for the values of gunicorn.conf.py."""
+
+    def test_defaults(self):
+        """Test that defaults suit production: threaded workers, preload and HLS keep-alive."""
+        config = load_config(GUNICORN_WORKERS='', GUNICORN_RELOAD='')  # Empty values as from an env file
+        self.assertEqual(config['worker_class'], 'gthread')
+        self.assertEqual(config['wsgi_app'], 'core.wsgi:application')
+        self.assertEqual(config['workers'], 5)
+        self.assertTrue(config['preload_app'])
+        self.assertFalse(config['reload'])
+        self.assertGreater(config['keepalive'], 10)
+        self.assertGreater(config['max_requests_jitter'], 0)
+
+    def test_overrides(self):
+        """Test that environment variables override the defaults and select the ASGI worker."""
+        config = load_config(GUNICORN_WORKER_CLASS='uvicorn', GUNICORN_WORKERS='3', GUNICORN_RELOAD='true')
+        self.assertEqual(config['worker_class'], 'uvicorn.workers.UvicornWorker')
+        self.assertEqual(config['wsgi_app'], 'core.asgi:application')
+        self.assertEqual(config['workers'], 3)
+        self.assertFalse(config['preload_app'])  # Reloading needs the app loaded per worker
+
+    def test_asgi_worker_disables_persistent_connections(self):
+        """Test that the ASGI worker forces CONN_MAX_AGE to 0, as Django requires under ASGI."""
+        env = {'DB_CONN_MAX_AGE': '60', 'DB_POOL': 'False'}
+        with mock.patch.dict(os.environ, env, GUNICORN_WORKER_CLASS='gthread'):
+            self.assertEqual(runpy.run_path(SETTINGS_PATH)['DATABASES']['default']['CONN_MAX_AGE'], 60)
+        with mock.patch.dict(os.environ, env, GUNICORN_WORKER_CLASS='uvicorn'):
+            self.assertEqual(runpy.run_path(SETTINGS_PATH)['DATABASES']['default']['CONN_MAX_AGE'], 0)
@@ -0,0 +1,80 @@
+"""Unit tests for the health probes and the release command.
+
+This module contains test cases to verify that the liveness and readiness probes
+answer without authentication, that readiness reports each check and the
+cold-start time and fails when a backend is unreachable, and that the release
+command creates the superuser once and refuses to run through PgBouncer.
+"""
+
+from django.contrib.auth.models import User
+from django.core.management import CommandError, call_command
+from django.test import override_settings
+from redis.exceptions import ConnectionError as RedisConnectionError
+from rest_framework.test import APITestCase
+from unittest import mock
+from core import health
+import io
+import os
+import time
+
+
+class HealthProbeTestCase(APITestCase):
+    """Test case for the liveness and readiness endpoints."""
+
+    def setUp(self):
+        """Forget the cached readiness state of earlier tests."""
+        health._ready_at = None
+        health._migrations_applied = False
+
+    def test_liveness(self):
+        """Test that the liveness probe answers without authentication."""
+        response = self.client.get('/api/health/live/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'status': 'alive'})
+
+    def test_readiness_reports_checks_and_startup_time(self):
+        """Test that a ready process reports every check and the time since container start."""
+        with mock.patch.dict(os.environ, {'CONTAINER_STARTED_AT': f'{time.time() - 2:.6f}'}):
+            response = self.client.get('/api/health/ready/')
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body['status'], 'ready')
+        self.assertEqual(set(body['checks']), {'database', 'redis', 'migrations'})
+        self.assertTrue(all(check['ok'] for check in body['checks'].values()))
+        self.assertGreaterEqual(body['startup_seconds'], 2)
+
+    def test_readiness_fails_without_redis(self):
+        """Test that an unreachable backend makes the probe answer 503."""
+        with mock.patch('core.health.get_redis_connection') as redis:
+            redis.return_value.ping.side_effect = RedisConnectionError('Connection refused')
+            response = self.client.get('/api/health/ready/')
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()['checks']['redis'], {'ok': False, 'error': 'Connection refused'})
+        self.assertIsNone(health._ready_at)
+
+    def test_container_start_without_nanoseconds(self):
+        """Test that a start time from a `date` without %N support is still parsed."""
+        with mock.patch.dict(os.environ, {'CONTAINER_STARTED_AT': '1700000000.%N'}):
+            self.assertEqual(health.container_started_at(), 1700000000.0)
+
+
+class ReleaseCommandTestCase(APITestCase):
+    """Test case for the release management command."""
+
+    @mock.patch.dict(os.environ, {'DJANGO_SUPERUSER_USERNAME': 'root', 'DJANGO_SUPERUSER_PASSWORD': 'pw-123456'})
+    def test_release_creates_superuser_once(self):
+        """Test that the release steps run and the superuser is created only once."""
+        out = io.StringIO()
+        call_command('release', '--skip-static', verbosity=0, stdout=out)
+        call_command('release', '--skip-static', verbosity=0, stdout=out)
+        self.assertTrue(User.objects.get(username='root').is_superuser)
+        self.assertIn("Superuser 'root' created.", out.getvalue())
+        self.assertIn("Superuser 'root' already exists.", out.getvalue())
+        self.assertIn('Release finished', out.getvalue())
+
+    @override_settings(DB_PGBOUNCER=True)
+    def test_release_refuses_pgbouncer(self):
+        """Test that the release steps do not run through a transaction pooling PgBouncer."""
+        with self.assertRaises(CommandError):
+            call_command('release', '--skip-static', verbosity=0, stdout=io.StringIO())
+        self.assertFalse(User.objects.filter(is_superuser=True).exists())
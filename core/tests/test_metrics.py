@@ -0,0 +1,69 @@
+"""Unit tests for the metrics counters and the metrics endpoint.
+
+This module contains test cases to verify that counters are aggregated in Redis,
+that failure logging is rate-limited, that authentication outcomes are counted and
+that the metrics endpoint is restricted to staff users.
+"""
+
+from auth_app.api.tokens import UserClaimsRefreshToken
+from core import metrics
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework.test import APITestCase
+import logging
+
+
+class MetricsTestCase(APITestCase):
+    """Test case for the metrics counters and endpoint."""
+
+    def setUp(self):
+        """Set up a staff user and start from empty counters."""
+        cache.clear()
+        metrics._counters.clear()
+        metrics._log_samples.clear()
+        self.user = User.objects.create_user(
+            username='admin@example.com',
+            email='admin@example.com',
+            password='testpass123',
+            is_staff=True
+        )
+
+    def tearDown(self):
+        """Clear the counters from the shared cache."""
+        cache.clear()
+
+    def test_counters_are_flushed_to_redis(self):
+        """Test that increments are summed in the shared snapshot."""
+        metrics.increment('test.events')
+        metrics.increment('test.events', 2)
+        self.assertEqual(metrics.snapshot()['test.events'], 3)
+
+    @override_settings(METRICS_LOG_SAMPLE_INTERVAL=60)
+    def test_log_sampled_is_rate_limited(self):
+        """Test that repeated failures produce a single log record."""
+        with self.assertLogs('core.tests', level='WARNING') as logs:
+            for _ in range(5):
+                metrics.log_sampled(logging.getLogger('core.tests'), logging.WARNING, 'test', 'Failure %s', 'x')
+        self.assertEqual(logs.output, ['WARNING:core.tests:Failure x (0 similar suppressed)'])
+        self.assertEqual(metrics._log_samples['test'][1], 4)
+
+    def test_authentication_outcomes_are_counted(self):
+        """Test that missing, invalid and valid tokens are counted."""
+        self.client.get('/api/categories/')
+        self.client.cookies['access_token'] = 'invalid_token'
+        self.client.get('/api/categories/')
+        self.client.cookies['access_token'] = str(UserClaimsRefreshToken.for_user(self.user).access_token)
+        response = self.client.get('/api/metrics/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['auth.missing_token'], 1)
+        self.assertEqual(response.data['auth.invalid_token'], 1)
+        self.assertEqual(response.data['auth.success'], 1)
+
+    def test_metrics_requires_staff(self):
+        """Test that non-staff users cannot read the metrics."""
+        self.user.is_staff = False
+        self.user.save()
+        self.client.cookies['access_token'] = str(UserClaimsRefreshToken.for_user(self.user).access_token)
+        response = self.client.get('/api/metrics/')
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,47 @@
+"""Unit tests for the middleware variants that skip streaming routes.
+
+This module contains test cases to verify which paths count as streaming routes,
+that sessions and CSRF checks are skipped for them but kept for all other routes,
+and that streaming routes no longer accept session authentication.
+"""
+
+from core.middleware import SessionMiddleware, is_streaming_request
+from django.contrib.auth.models import User
+from django.http import HttpResponse
+from django.test import Client, RequestFactory
+from rest_framework.test import APITestCase
+
+
+class StreamingBypassTestCase(APITestCase):
+    """Test case for the lean middleware path of HLS playlist and segment requests."""
+
+    def test_streaming_paths(self):
+        """Test that only playlists and segments count as streaming routes."""
+        factory = RequestFactory()
+        for path in ['/api/video/1/480p/index.m3u8', '/api/video/12/1080p/000123.ts/']:
+            self.assertTrue(is_streaming_request(factory.get(path)), path)
+        for path in ['/api/video/1/', '/api/video/1/playback/', '/api/video/viewers/', '/api/uploads/', '/admin/']:
+            self.assertFalse(is_streaming_request(factory.get(path)), path)
+
+    def test_session_skipped_for_streaming_routes(self):
+        """Test that no session is attached to streaming requests and one is to all others."""
+        middleware = SessionMiddleware(lambda request: HttpResponse())
+        factory = RequestFactory()
+        streaming = factory.get('/api/video/1/480p/000.ts/')
+        other = factory.get('/api/video/1/')
+        middleware(streaming)
+        middleware(other)
+        self.assertFalse(hasattr(streaming, 'session'))
+        self.assertTrue(hasattr(other, 'session'))
+
+    def test_csrf_still_enforced_elsewhere(self):
+        """Test that form posts outside streaming routes still need a CSRF token."""
+        response = Client(enforce_csrf_checks=True).post('/admin/login/', {'username': 'a', 'password': 'b'})
+        self.assertEqual(response.status_code, 403)
+
+    def test_streaming_routes_ignore_sessions(self):
+        """Test that a session login authenticates ordinary routes but not streaming routes."""
+        User.objects.create_user(username='admin@example.com', password='testpass123', is_staff=True)
+        self.client.login(username='admin@example.com', password='testpass123')
+        self.assertEqual(self.client.get('/api/video/viewers/').status_code, 200)
+        self.assertIn(self.client.get('/api/video/1/480p/000.ts/').status_code, (401, 403))
@@ -0,0 +1,55 @@
+"""Unit tests for the fast JSON renderer and parser.
+
+This module contains test cases to verify that the orjson-backed renderer and
+parser produce the same results as DRF's standard JSON classes, including
+datetimes, decimals, escaping and pretty-printed output.
+"""
+
+from core import renderers
+from core.renderers import FastJSONParser, FastJSONRenderer
+from django.test import SimpleTestCase
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from unittest import mock
+import datetime
+import decimal
+import io
+import uuid
+
+
+class FastJSONRendererTestCase(SimpleTestCase):
+    """Test case for the FastJSONRenderer and FastJSONParser."""
+
+    data = {
+        'created_at': datetime.datetime(2025, 8, 12, 17, 16, 5, 123456, tzinfo=datetime.timezone.utc),
+        'local': datetime.datetime(2025, 8, 12, 17, 16, tzinfo=datetime.timezone(datetime.timedelta(hours=2))),
+        'day': datetime.date(2025, 8, 12),
+        'price': decimal.Decimal('9.99'),
+        'id': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+        'title': 'Café \u2028 line',
+        'items': [1, 2.5, None, True],
+    }
+
+    def test_render_matches_drf(self):
+        """Test that the fast renderer produces byte-identical output to DRF."""
+        self.assertEqual(FastJSONRenderer().render(self.data), JSONRenderer().render(self.data))
+
+    def test_render_indent_falls_back(self):
+        """Test that indented output is delegated to the standard renderer."""
+        media_type = 'application/json; indent=4'
+        self.assertEqual(
+            FastJSONRenderer().render(self.data, media_type),
+            JSONRenderer().render(self.data, media_type),
+        )
+
+    def test_render_without_orjson(self):
+        """Test that the renderer falls back to the stdlib when orjson is missing."""
+        with mock.patch.object(renderers, 'orjson', None):
+            self.assertEqual(FastJSONRenderer().render(self.data), JSONRenderer().render(self.data))
+
+    def test_parse(self):
+        """Test that JSON bodies are parsed and invalid ones are rejected."""
+        parser = FastJSONParser()
+        self.assertEqual(parser.parse(io.BytesIO(b'{"ids": [1, 2]}')), {'ids': [1, 2]})
+        with self.assertRaises(ParseError):
+            parser.parse(io.BytesIO(b'{"ids": NaN}'))
@@ -2,17 +2,21 @@
 
 This module defines the root URL patterns, routing requests to the admin interface
 and including URL configurations from the auth_app and video_content_app. It also
-serves media files in debug mode.
+exposes the metrics endpoint and the health probes, and serves media files in debug mode.
 """
 
 from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
+from .views import LivenessView, MetricsView, ReadinessView
 
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('api/metrics/', MetricsView.as_view(), name='metrics'),  # Counter totals for staff users
+    path('api/health/live/', LivenessView.as_view(), name='health_live'),  # Liveness probe
+    path('api/health/ready/', ReadinessView.as_view(), name='health_ready'),  # Readiness probe: DB, Redis, migrations
     path('api/', include('auth_app.api.urls')),  # Include authentication API endpoints
     path('api/', include('video_content_app.api.urls')),  # Include video content API endpoints
 ]
@@ -0,0 +1,64 @@
+"""API views exposing project-wide operational data.
+
+This module defines the metrics endpoint, which reports the counters recorded
+through core.metrics to staff users, and the unauthenticated liveness and
+readiness probes of the web role.
+"""
+
+from rest_framework import status
+from rest_framework.permissions import AllowAny, IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from . import health, metrics
+
+
+class MetricsView(APIView):
+    """Report the counter totals aggregated across all processes."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        """Return the current counter totals.
+
+        Args:
+            request: The HTTP request object.
+
+        Returns:
+            Response: Counter names mapped to their totals.
+        """
+        return Response(metrics.snapshot())
+
+
+class LivenessView(APIView):
+    """Report that the process is serving requests, without touching any backend."""
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        """Return a constant response.
+
+        Args:
+            request: The HTTP request object.
+
+        Returns:
+            Response: The status 'alive'.
+        """
+        return Response({'status': 'alive'})
+
+
+class ReadinessView(APIView):
+    """Report whether the process can serve traffic, for load balancer and orchestrator probes."""
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        """Check the database, Redis and the migration state.
+
+        Args:
+            request: The HTTP request object.
+
+        Returns:
+            Response: The result and duration of each check and the cold-start
+                time, with status 200 if all checks passed and 503 otherwise.
+        """
+        ready, report = health.readiness()
+        return Response(report, status=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE)
@@ -0,0 +1,71 @@
+"""Gunicorn configuration of the web role.
+
+Gunicorn loads this file from the working directory. Every value can be
+overridden with a GUNICORN_* environment variable.
+
+The default gthread workers serve requests from a thread pool and park idle
+keep-alive connections in a poller instead of a thread, which suits HLS players
+that fetch one segment every few seconds over the same connection. The uvicorn
+worker class serves the ASGI application instead; the settings then disable
+persistent database connections, so set DB_POOL=True to reuse them. Worker and thread counts
+derive from the CPUs available to the container, the application is preloaded
+in the master so workers fork with Django already set up, and workers are
+recycled after a jittered number of requests so they do not all restart at once.
+"""
+
+import os
+
+WORKER_CLASSES = {
+    'gthread': 'gthread',
+    'uvicorn': 'uvicorn.workers.UvicornWorker',
+}
+
+
+def env_int(name, default):
+    """Read an integer from the environment; unset or empty variables give the default."""
+    return int(os.environ.get(name) or default)
+
+
+def env_bool(name, default):
+    """Read a boolean from the environment; unset or empty variables give the default."""
+    return (os.environ.get(name) or str(default)).lower() in ('1', 'true', 'yes')
+
+
+def available_cpus():
+    """Return the number of CPUs this process may run on, honouring container CPU sets."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # Not available on macOS
+        return os.cpu_count() or 1
+
+
+cpus = available_cpus()
+worker_class_name = os.environ.get('GUNICORN_WORKER_CLASS') or 'gthread'
+worker_class = WORKER_CLASSES[worker_class_name]
+wsgi_app = 'core.asgi:application' if worker_class_name == 'uvicorn' else 'core.wsgi:application'
+
+bind = os.environ.get('GUNICORN_BIND') or '0.0.0.0:8000'
+workers = env_int('GUNICORN_WORKERS', cpus + 1)
+threads = env_int('GUNICORN_THREADS', 8)  # Per gthread worker; requests mostly wait on I/O
+backlog = env_int('GUNICORN_BACKLOG', 2048)
+
+keepalive = env_int('GUNICORN_KEEPALIVE', 15)  # Longer than the 10-second segment interval
+timeout = env_int('GUNICORN_TIMEOUT', 60)  # Also bounds slow upload chunks
+graceful_timeout = env_int('GUNICORN_GRACEFUL_TIMEOUT', 30)
+
+max_requests = env_int('GUNICORN_MAX_REQUESTS', 5000)
+max_requests_jitter = env_int('GUNICORN_MAX_REQUESTS_JITTER', 500)
+
+reload = env_bool('GUNICORN_RELOAD', False)  # For local development only
+preload_app = env_bool('GUNICORN_PRELOAD', True) and not reload  # Reloading needs the app loaded per worker
+
+worker_tmp_dir = '/dev/shm' if os.path.isdir('/dev/shm') else None  # Heartbeat files off the container's overlay filesystem
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG') or None
+errorlog = '-'
+
+
+def post_fork(server, worker):
+    """Drop database connections inherited from the preloaded master."""
+    if server.cfg.preload_app:
+        from django.db import connections
+        connections.close_all()
@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import Video  # imports video model.
+from .models import Category, Video  # imports video content models.
 
+admin.site.register(Category)  # registers category for admin interface.
 admin.site.register(Video)  # registers video for admin interface.
 
@@ -0,0 +1,14 @@
+"""Pagination classes for the video content API.
+
+This module defines page-number pagination used by endpoints that can return
+large result sets, such as video search.
+"""
+
+from rest_framework.pagination import PageNumberPagination
+
+
+class VideoSearchPagination(PageNumberPagination):
+    """Paginate search results with a client-adjustable, bounded page size."""
+    page_size = 20  # Default number of videos per page
+    page_size_query_param = 'page_size'
+    max_page_size = 100  # Upper bound to keep result pages cheap to render
@@ -1,16 +1,39 @@
 """URL configuration for the video content API.
 
-This module defines URL patterns for video listing, HLS playlist and segment serving,
-and media file access.
+This module defines URL patterns for video listing, details and search, category
+listing, playback token minting, active viewer counts, resumable uploads, HLS playlist and segment serving, and media file access.
 """
 
 from django.urls import path
-from .views import VideoListView, HLSPlaylistView, HLSSegmentView, MediaView
+from .views import (
+    VideoListView,
+    VideoDetailView,
+    VideoBatchView,
+    CategoryListView,
+    VideoSearchView,
+    PlaybackTokenView,
+    ActiveViewersView,
+    UploadCreateView,
+    UploadDetailView,
+    UploadFinalizeView,
+    HLSPlaylistView,
+    HLSSegmentView,
+    MediaView,
+)
 
 
 urlpatterns = [
     path('video/', VideoListView.as_view(), name='video_list'),  # List all videos
+    path('categories/', CategoryListView.as_view(), name='category_list'),  # List categories with video counts
+    path('video/search/', VideoSearchView.as_view(), name='video_search'),  # Full-text search over videos
+    path('video/batch/', VideoBatchView.as_view(), name='video_batch'),  # Details for several videos at once
+    path('video/viewers/', ActiveViewersView.as_view(), name='active_viewers'),  # Current viewers per video
+    path('video/<int:movie_id>/', VideoDetailView.as_view(), name='video_detail'),  # Details for one video
+    path('video/<int:movie_id>/playback/', PlaybackTokenView.as_view(), name='playback_token'),  # Mint a playback token
     path('video/<int:movie_id>/<str:resolution>/index.m3u8', HLSPlaylistView.as_view(), name='hls_playlist'),
     path('video/<int:movie_id>/<str:resolution>/<str:segment>/', HLSSegmentView.as_view(), name='hls_segment'),
+    path('uploads/', UploadCreateView.as_view(), name='upload_create'),  # Start a resumable upload
+    path('uploads/<uuid:upload_id>/', UploadDetailView.as_view(), name='upload_detail'),  # Resume, send chunks or abort
+    path('uploads/<uuid:upload_id>/finalize/', UploadFinalizeView.as_view(), name='upload_finalize'),  # Create the video
     path('media/<path:path>', MediaView.as_view(), name='media'),  # Serve media files (e.g., thumbnails)
 ]
\ No newline at end of file
@@ -1,48 +1,241 @@
 """API views for video content management and streaming.
 
 This module defines views for listing videos, serving HLS playlists and segments,
-and accessing media files, with JWT authentication and caching for performance.
+accessing media files and uploading originals in resumable chunks, with JWT
+authentication and caching for performance.
+HLS requests can also authenticate with a per-video playback session token, and
+record heartbeats for active viewer tracking and concurrent stream limits.
 """
 
 from django.conf import settings
 from django.core.cache import cache
-from django.http import FileResponse, Http404
+from django.db import connection
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.storage import default_storage
+from django.http import Http404, HttpResponse, HttpResponseRedirect
+from django.utils import timezone
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from ..models import Video
-from .serializers import VideoSerializer
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.permissions import IsAdminUser
+from rest_framework.settings import api_settings
+from ..layout import playlist_name, segment_name
+from ..models import Category, Rendition, Upload, Video
+from ..playback import (
+    COOKIE_NAME, PlaybackSession, PlaybackTokenAuthentication, mint_playback_token, query_token,
+    replaced_session_id, tokenized_playlist,
+)
+from ..search import search_videos
+from ..storage import hls_storage, storage_response
+from ..tiering import hot_fallback, record_play, request_restore, touch_rendition
+from ..uploads import (
+    UploadClaim, UploadError, abort_upload, create_partial_file, finalize_upload, parse_checksum, write_chunk,
+)
+from ..video_cache import get_serialized_videos, video_list_cache_key
+from ..viewers import claim_stream, current_viewers, record_heartbeat
+from .serializers import CategorySerializer, UploadSerializer, VideoSerializer, VideoBatchSerializer
 from .permissions import IsJWTAuthenticated
-import os
+from .pagination import VideoSearchPagination
 import mimetypes
+import posixpath
+import re
+
+SEGMENT_NAME = re.compile(r'(\d+)\.ts')  # Segment files are numbered, e.g. '000000.ts'
+HLS_AUTHENTICATION_CLASSES = [PlaybackTokenAuthentication] + [
+    cls for cls in api_settings.DEFAULT_AUTHENTICATION_CLASSES if not issubclass(cls, SessionAuthentication)
+]  # Streaming routes bypass the session middleware, see core.middleware
+CHUNK_CONTENT_TYPE = 'application/offset+octet-stream'  # Content type of upload chunks, as in tus
+WEB_DEVICE = 'web'  # Device of HLS requests authenticated by JWT instead of a playback token
+PUBLIC_MEDIA_DIR = 'thumbnails/'  # The only media directory served without authentication
+
+
+def resolve_category(value):
+    """Resolve a category filter to a category ID, so the video list cache is keyed by ID only.
+
+    A numeric value is taken as an ID if such a category exists, and as a name
+    otherwise, so categories with numeric names can be filtered too.
+
+    Args:
+        value (str): The category ID or name from the query string.
+
+    Returns:
+        int or None: The ID of the category, or None if there is no such category.
+    """
+    categories = Category.objects.values_list('id', flat=True)
+    if value.isascii() and value.isdigit():
+        category_id = categories.filter(pk=int(value)).first()  # Primary key lookup
+        if category_id is not None:
+            return category_id
+    return categories.filter(name=value).first()  # Unique index lookup
 
 
 class VideoListView(APIView):
-    """Handle listing of all videos with caching."""
+    """Handle listing of all videos with caching and optional category filtering."""
     permission_classes = [IsJWTAuthenticated]
 
     def get(self, request):
-        """Retrieve and return a list of all videos, using cache if available.
+        """Retrieve and return a list of videos, using cache if available.
 
         Args:
-            request: The HTTP request object.
+            request: The HTTP request object, optionally with a 'category' parameter
+                holding a category ID or name.
 
         Returns:
             Response: Serialized video data, either from cache or database.
         """
-        cache_key = 'video_list'
+        category = request.query_params.get('category')
+        category_id = None
+        if category is not None:
+            category_id = resolve_category(category)
+            if category_id is None:
+                return Response([])
+        cache_key = video_list_cache_key(category_id)
         cached_data = cache.get(cache_key)
         if cached_data:
             return Response(cached_data)
-        videos = Video.objects.all()
+        videos = Video.objects.select_related('category').prefetch_related('renditions')
+        if category_id is not None:
+            videos = videos.filter(category_id=category_id)  # Indexed foreign key lookup
         serializer = VideoSerializer(videos, many=True, context={'request': request})
         data = serializer.data
         cache.set(cache_key, data, timeout=300)  # Cache for 5 minutes
         return Response(data)
 
 
+class VideoDetailView(APIView):
+    """Handle retrieval of a single video through the per-video cache."""
+    permission_classes = [IsJWTAuthenticated]
+
+    def get(self, request, movie_id):
+        """Retrieve and return the details of one video.
+
+        Args:
+            request: The HTTP request object.
+            movie_id (int): The ID of the video.
+
+        Returns:
+            Response: Serialized video data.
+
+        Raises:
+            Http404: If the video does not exist.
+        """
+        videos = get_serialized_videos([movie_id], request)
+        if not videos:
+            raise Http404
+        return Response(videos[0])
+
+
+class VideoBatchView(APIView):
+    """Handle retrieval of several videos in one round trip."""
+    permission_classes = [IsJWTAuthenticated]
+
+    def post(self, request):
+        """Retrieve and return the details of the requested videos.
+
+        Args:
+            request: The HTTP request object containing a list of video IDs.
+
+        Returns:
+            Response: Serialized videos in request order, or error details.
+        """
+        serializer = VideoBatchSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        video_ids = list(dict.fromkeys(serializer.validated_data['ids']))  # Drop duplicates, keep order
+        return Response(get_serialized_videos(video_ids, request))
+
+
+class CategoryListView(APIView):
+    """Handle listing of all categories with their video counts."""
+    permission_classes = [IsJWTAuthenticated]
+
+    def get(self, request):
+        """Retrieve and return all categories, using cache if available.
+
+        Args:
+            request: The HTTP request object.
+
+        Returns:
+            Response: Serialized category data with cached video counts.
+        """
+        cache_key = 'category_list'
+        cached_data = cache.get(cache_key)
+        if cached_data is not None:
+            return Response(cached_data)
+        serializer = CategorySerializer(Category.objects.all(), many=True)
+        data = serializer.data
+        cache.set(cache_key, data, timeout=300)  # Cache for 5 minutes, invalidated on count changes
+        return Response(data)
+
+
+class VideoSearchView(APIView):
+    """Handle full-text search over video titles and descriptions."""
+    permission_classes = [IsJWTAuthenticated]
+
+    def get(self, request):
+        """Return a paginated, relevance-ordered list of videos matching the query.
+
+        Args:
+            request: The HTTP request object with the search string in the 'q' parameter.
+
+        Returns:
+            Response: Paginated serialized videos, or an error if no query was given.
+        """
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({'detail': 'Search query missing.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        paginator = VideoSearchPagination()
+        page = paginator.paginate_queryset(search_videos(query), request, view=self)
+        serializer = VideoSerializer(page, many=True, context={'request': request})
+        return paginator.get_paginated_response(serializer.data)
+
+
+class PlaybackTokenView(APIView):
+    """Mint playback session tokens for streaming a video."""
+    permission_classes = [IsJWTAuthenticated]
+
+    def post(self, request, movie_id):
+        """Create a playback token for the video and set it as a cookie scoped to the video.
+
+        Args:
+            request: The HTTP request object.
+            movie_id (int): The ID of the video.
+
+        A client that still holds a token for the video, e.g. a reloaded player,
+        gets a fresh token for the same playback session and keeps its stream slot.
+
+        Returns:
+            Response: The token, its session ID and expiry, or an error if the
+                account is at its concurrent stream limit.
+
+        Raises:
+            Http404: If the video does not exist.
+        """
+        if not Video.objects.filter(pk=movie_id).exists():
+            raise Http404
+        session_id = replaced_session_id(request, request.user.pk, movie_id)
+        token, session = mint_playback_token(request.user.pk, movie_id, session_id=session_id)
+        if not claim_stream(request.user.pk, movie_id, session.session_id):
+            return stream_limit_response()
+        record_play(movie_id)
+        response = Response({'token': token, 'session': session.session_id, 'expires_at': session.expires_at})
+        response.set_cookie(
+            key=COOKIE_NAME,
+            value=token,
+            max_age=settings.PLAYBACK_TOKEN_LIFETIME,
+            path=f'/api/video/{movie_id}/',  # Only sent with this video's playlists and segments
+            httponly=True,
+            secure=False if settings.DEBUG else True,
+            samesite="None",
+        )
+        return response
+
+
 class HLSPlaylistView(APIView):
     """Serve HLS playlist files for video streaming."""
+    authentication_classes = HLS_AUTHENTICATION_CLASSES
     permission_classes = [IsJWTAuthenticated]
 
     def get(self, request, movie_id, resolution):
@@ -54,25 +247,44 @@ class HLSPlaylistView(APIView):
             resolution (str): The requested video resolution (e.g., '480p').
 
         Returns:
-            FileResponse: The HLS playlist file.
+            HttpResponse: The HLS playlist file or, while the rendition is restored
+                from cold storage, a redirect to the best hot rendition below it.
 
         Raises:
-            Http404: If the video or playlist file is not found.
+            Http404: If the video has no such rendition or the playlist file is missing.
         """
-        try:
-            video = Video.objects.get(id=movie_id)
-        except Video.DoesNotExist:
+        # The rendition inventory rejects unknown videos and resolutions, and knows the tree's layout, without touching the disk
+        rendition = (
+            Rendition.objects.filter(video_id=movie_id, resolution=resolution)
+            .values_list('id', 'tier', 'height', 'video__hls_layout')
+            .first()
+        )
+        if rendition is None:
             raise Http404
+        rendition_id, tier, height, layout = rendition
+        if tier != 'hot':
+            return cold_rendition_response(request, movie_id, rendition_id, height)
 
-        playlist_path = os.path.join(settings.MEDIA_ROOT, f'videos/{video.id}/{resolution}/index.m3u8')
-        if not os.path.exists(playlist_path):
+        if not record_heartbeat(request.user.pk, movie_id, stream_device(request)):
+            return stream_limit_response()
+        touch_rendition(rendition_id)
+        # Served through the app so the relative segment URIs resolve against the API
+        name = playlist_name(movie_id, resolution, layout)
+        token = query_token(request)
+        if token is None:
+            return storage_response(hls_storage(), name, 'application/vnd.apple.mpegurl')
+        try:
+            with hls_storage().open(name, 'rb') as f:
+                playlist = f.read().decode()
+        except (FileNotFoundError, IsADirectoryError):
             raise Http404
-
-        return FileResponse(open(playlist_path, 'rb'), content_type='application/vnd.apple.mpegurl')
+        # Without cookies, segment requests only authenticate if their URIs carry the token
+        return HttpResponse(tokenized_playlist(playlist, token), content_type='application/vnd.apple.mpegurl')
 
 
 class HLSSegmentView(APIView):
     """Serve HLS video segment files."""
+    authentication_classes = HLS_AUTHENTICATION_CLASSES
     permission_classes = [IsJWTAuthenticated]
 
     def get(self, request, movie_id, resolution, segment):
@@ -85,26 +297,286 @@ class HLSSegmentView(APIView):
             segment (str): The name of the segment file.
 
         Returns:
-            FileResponse: The video segment file.
+            HttpResponse: The video segment file, a redirect to a presigned URL
+                when the HLS storage is remote, or 503 while the rendition is
+                restored from cold storage.
 
         Raises:
-            Http404: If the video or segment file is not found.
+            Http404: If the video has no such rendition or segment.
         """
-        try:
-            video = Video.objects.get(id=movie_id)
-        except Video.DoesNotExist:
+        rendition_id, segment_count, tier, layout = (
+            Rendition.objects.filter(video_id=movie_id, resolution=resolution)
+            .values_list('id', 'segment_count', 'tier', 'video__hls_layout')
+            .first()
+        ) or (None, None, None, None)
+        match = SEGMENT_NAME.fullmatch(segment)
+        # Unknown renditions and out-of-range segment numbers are rejected from the inventory alone
+        if segment_count is None or not match or int(match.group(1)) >= segment_count:
             raise Http404
+        if tier != 'hot':
+            request_restore(rendition_id)
+            return restoring_response()
+
+        if not record_heartbeat(request.user.pk, movie_id, stream_device(request)):
+            return stream_limit_response()
+        name = segment_name(movie_id, resolution, segment, layout)
+        return storage_response(hls_storage(), name, 'video/MP2T', redirect=True)
+
+
+def cold_rendition_response(request, movie_id, rendition_id, height):
+    """Queue the restore of a cold rendition and point the player at a hot one meanwhile.
+
+    Args:
+        request: The HTTP request object.
+        movie_id (int): The ID of the video.
+        rendition_id (int): The ID of the requested rendition.
+        height (int): The height of the requested rendition.
 
-        segment_path = os.path.join(settings.MEDIA_ROOT, f'videos/{video.id}/{resolution}/{segment}')
-        if not os.path.exists(segment_path):
+    Returns:
+        HttpResponse: A redirect to the playlist of the best hot rendition below
+            the requested one, or 503 if there is none.
+    """
+    request_restore(rendition_id)
+    fallback = hot_fallback(movie_id, height)
+    if fallback is None:
+        return restoring_response()
+    url = f'/api/video/{movie_id}/{fallback}/index.m3u8'
+    if request.META.get('QUERY_STRING'):
+        url += f"?{request.META['QUERY_STRING']}"  # Keep a playback token passed as query parameter
+    response = HttpResponseRedirect(url)
+    response['Cache-Control'] = 'no-store'
+    return response
+
+
+def restoring_response():
+    """Return a 503 asking the client to retry once a rendition is restored."""
+    response = Response({'detail': 'Rendition is being restored.'}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+    response['Retry-After'] = '30'
+    return response
+
+
+class ActiveViewersView(APIView):
+    """Report the current viewers per video for cache warming and autoscaling."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        """Return the videos being watched with their current viewer counts.
+
+        Args:
+            request: The HTTP request object.
+
+        Returns:
+            Response: Video IDs and viewer counts, most watched first.
+        """
+        return Response([{'video': video_id, 'viewers': count} for video_id, count in current_viewers().items()])
+
+
+class UploadCreateView(APIView):
+    """Create resumable uploads of original video files."""
+    permission_classes = [IsAdminUser]
+
+    def post(self, request):
+        """Create an upload for a file of the announced size.
+
+        Args:
+            request: The HTTP request object containing the file name, size and
+                the title, description and category of the video to create.
+
+        Returns:
+            Response: The upload with its URL in the Location header, or error details.
+        """
+        serializer = UploadSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        upload = serializer.save(user=request.user)
+        create_partial_file(upload)
+        response = upload_response(upload, status.HTTP_201_CREATED)
+        response['Location'] = f'/api/uploads/{upload.pk}/'
+        return response
+
+
+class UploadDetailView(APIView):
+    """Report, continue or abort a resumable upload."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, upload_id):
+        """Return the upload and the offset to resume from (also answers HEAD).
+
+        Args:
+            request: The HTTP request object.
+            upload_id (UUID): The ID of the upload.
+
+        Returns:
+            Response: The upload with Upload-Offset and Upload-Length headers.
+
+        Raises:
+            Http404: If the user has no such upload.
+        """
+        upload = Upload.objects.filter(pk=upload_id, user=request.user).first()
+        if upload is None:
             raise Http404
+        return upload_response(upload)
+
+    def patch(self, request, upload_id):
+        """Append the request body to the upload at the offset in the Upload-Offset header.
+
+        Args:
+            request: The HTTP request object with the chunk as its body and an
+                optional Upload-Checksum header.
+            upload_id (UUID): The ID of the upload.
+
+        Returns:
+            Response: 204 with the new Upload-Offset, or error details.
 
-        return FileResponse(open(segment_path, 'rb'), content_type='video/MP2T')
+        Raises:
+            Http404: If the user has no such upload.
+        """
+        if request.content_type != CHUNK_CONTENT_TYPE:
+            return Response(
+                {'detail': f'Chunks must be sent as {CHUNK_CONTENT_TYPE}.'}, status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+            )
+        try:
+            offset = int(request.headers['Upload-Offset'])
+            length = int(request.META.get('CONTENT_LENGTH') or 0)
+            checksum = parse_checksum(request.headers.get('Upload-Checksum'))
+        except (KeyError, ValueError):
+            return Response(
+                {'detail': 'Valid Upload-Offset and Content-Length headers are required.'}, status=status.HTTP_400_BAD_REQUEST
+            )
+        except UploadError as e:
+            return Response({'detail': str(e)}, status=e.status)
 
+        try:
+            with UploadClaim(upload_id) as claim:
+                upload = get_upload(request, upload_id)
+                if upload.video_id or offset != upload.offset:
+                    return upload_response(upload, status.HTTP_409_CONFLICT)  # Client resumes from Upload-Offset
+                if not connection.in_atomic_block:
+                    connection.close()  # Hand the connection back (to the pool) while the chunk streams in
+                # Read the raw request stream, so the body is never buffered by Django or DRF
+                upload.offset = write_chunk(upload, request._request, length, checksum, keepalive=claim.keepalive)
+                Upload.objects.filter(pk=upload.pk).update(offset=upload.offset, updated_at=timezone.now())
+        except UploadError as e:
+            return Response({'detail': str(e)}, status=e.status)
+        return upload_response(upload, status.HTTP_204_NO_CONTENT)
+
+    def delete(self, request, upload_id):
+        """Abort an unfinished upload and delete the received bytes.
+
+        Args:
+            request: The HTTP request object.
+            upload_id (UUID): The ID of the upload.
+
+        Returns:
+            Response: 204 on success, or 409 if the upload was already finalized.
+
+        Raises:
+            Http404: If the user has no such upload.
+        """
+        try:
+            with UploadClaim(upload_id):
+                upload = get_upload(request, upload_id)
+                if upload.video_id:
+                    return Response({'detail': 'Upload already finalized.'}, status=status.HTTP_409_CONFLICT)
+                abort_upload(upload)
+        except UploadError as e:
+            return Response({'detail': str(e)}, status=e.status)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class UploadFinalizeView(APIView):
+    """Turn a complete upload into a video and queue its transcoding."""
+    permission_classes = [IsAdminUser]
+
+    def post(self, request, upload_id):
+        """Create the video of a complete upload; repeated calls return the same video.
+
+        Args:
+            request: The HTTP request object.
+            upload_id (UUID): The ID of the upload.
+
+        Returns:
+            Response: The upload with the ID of its video, or 409 if bytes are missing.
+
+        Raises:
+            Http404: If the user has no such upload.
+        """
+        try:
+            with UploadClaim(upload_id):
+                upload = get_upload(request, upload_id)
+                if upload.video_id:
+                    return upload_response(upload)
+                if upload.offset != upload.size:
+                    return upload_response(upload, status.HTTP_409_CONFLICT)
+                finalize_upload(upload)
+        except UploadError as e:
+            return Response({'detail': str(e)}, status=e.status)
+        return upload_response(upload, status.HTTP_201_CREATED)
+
+
+def get_upload(request, upload_id):
+    """Return one of the user's uploads; call it with the upload's UploadClaim held.
+
+    Args:
+        request: The HTTP request object.
+        upload_id (UUID): The ID of the upload.
+
+    Returns:
+        Upload: The upload.
+
+    Raises:
+        Http404: If the user has no such upload.
+    """
+    upload = Upload.objects.filter(pk=upload_id, user=request.user).first()
+    if upload is None:
+        raise Http404
+    return upload
+
+
+def upload_response(upload, status_code=status.HTTP_200_OK):
+    """Serialize an upload with its progress in tus headers.
+
+    Args:
+        upload: The Upload to report.
+        status_code (int): The HTTP status code.
+
+    Returns:
+        Response: The serialized upload (no body for 204) with Upload-Offset and
+            Upload-Length headers.
+    """
+    data = None if status_code == status.HTTP_204_NO_CONTENT else UploadSerializer(upload).data
+    response = Response(data, status=status_code)
+    response['Upload-Offset'] = str(upload.offset)
+    response['Upload-Length'] = str(upload.size)
+    response['Cache-Control'] = 'no-store'
+    return response
+
+
+def stream_limit_response():
+    """Return the response refusing a stream beyond the account's concurrent stream limit."""
+    return Response({'detail': 'Concurrent stream limit reached.'}, status=status.HTTP_403_FORBIDDEN)
+
+
+def stream_device(request):
+    """Return the device an HLS request streams on.
+
+    Args:
+        request: The authenticated HTTP request object.
+
+    Returns:
+        str: The playback session ID, or WEB_DEVICE for JWT-authenticated requests.
+    """
+    if isinstance(request.auth, PlaybackSession):
+        return request.auth.session_id
+    return WEB_DEVICE
 
 
 class MediaView(APIView):
-    """Serve media files such as thumbnails."""
+    """Serve thumbnails, the only media files that are public.
+
+    Originals, uploads and local renditions share the media storage, so any other
+    path is answered with 404.
+    """
     
     def get(self, request, path):
         """Serve a media file based on the provided path.
@@ -117,12 +589,14 @@ class MediaView(APIView):
             FileResponse: The requested media file.
 
         Raises:
-            Http404: If the file does not exist or is outside MEDIA_ROOT.
+            Http404: If the file does not exist or is not a thumbnail.
         """
-        file_path = os.path.join(settings.MEDIA_ROOT, path)
-        # Prevent path traversal and verify file existence
-        if not os.path.exists(file_path) or not file_path.startswith(str(settings.MEDIA_ROOT)):
-            raise Http404("Media file not found")
-        content_type, _ = mimetypes.guess_type(file_path)
+        path = posixpath.normpath(path)
+        if not path.startswith(PUBLIC_MEDIA_DIR):
+            raise Http404("Media file not found")  # Also covers '..' segments that leave the directory
+        content_type, _ = mimetypes.guess_type(path)
         content_type = content_type or 'application/octet-stream'
-        return FileResponse(open(file_path, 'rb'), content_type=content_type)
\ No newline at end of file
+        try:
+            return storage_response(default_storage, path, content_type)
+        except SuspiciousFileOperation:
+            raise Http404("Media file not found")  # Path traversal outside the storage
\ No newline at end of file
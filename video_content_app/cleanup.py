@@ -0,0 +1,297 @@
+"""Garbage collection of HLS trees, originals and partial uploads.
+
+Deleting a video queues a job that removes its HLS tree and, unless another video
+shares it after deduplication, its original, from the hot and cold storage. A periodic RQ sweep catches what is
+left behind anyway: HLS trees of deleted videos in any layout, rendition directories and
+segments that a retranscode no longer lists, originals no video references and
+partial files of vanished uploads. The sweep walks the media tree with os.scandir
+in batches, checks each batch against the database in one query, and skips
+anything modified within MEDIA_SWEEP_MIN_AGE so in-flight transcodes and uploads
+are left alone. Originals are only deleted under their dedupe.lock_originals
+lock, after checking again that no video references them. A dry run reports what
+would be reclaimed without deleting.
+"""
+
+from datetime import timedelta
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
+from .dedupe import lock_originals
+from .models import Rendition, Upload, Video
+from .layout import LAYOUT_CHOICES, scan_video_dirs, video_prefix
+from .storage import hls_storage, is_local, walk
+from .tiering import cold_storage
+import django_rq
+import os
+import re
+import shutil
+import time
+import uuid
+
+SWEEP_JOB_ID = 'sweep_media'  # Fixed job ID so only one sweep is scheduled
+SEGMENT_NAME = re.compile(r'(\d+)\.ts')
+
+
+def tree_size(path):
+    """Return the number of files, total bytes and newest file modification time below a directory."""
+    files = size = 0
+    newest = 0
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                sub_files, sub_size, sub_newest = tree_size(entry.path)
+                files += sub_files
+                size += sub_size
+                newest = max(newest, sub_newest)
+            else:
+                stat = entry.stat(follow_symlinks=False)
+                files += 1
+                size += stat.st_size
+                newest = max(newest, stat.st_mtime)
+    return files, size, newest
+
+
+def delete_tree(storage, prefix):
+    """Delete every file below a prefix of a storage.
+
+    Args:
+        storage: The storage holding the tree.
+        prefix (str): The storage name of the tree.
+
+    Returns:
+        int: The number of bytes reclaimed.
+    """
+    if is_local(storage):
+        path = storage.path(prefix)
+        if not os.path.isdir(path):
+            return 0
+        _, size, _ = tree_size(path)
+        shutil.rmtree(path, ignore_errors=True)
+        return size
+    size = 0
+    for name in list(walk(storage, prefix)):
+        size += storage.size(name)
+        storage.delete(name)
+    return size
+
+
+def delete_video_files(video_id, original_name):
+    """Delete the files of a deleted video.
+
+    Args:
+        video_id (int): The ID of the deleted video.
+        original_name (str): The storage name of its original file.
+
+    Returns:
+        int: The number of bytes reclaimed.
+    """
+    reclaimed = 0
+    for version, _ in LAYOUT_CHOICES:  # The layout went with the row, so every layout is checked
+        reclaimed += delete_tree(hls_storage(), video_prefix(video_id, version))
+        reclaimed += delete_tree(cold_storage(), video_prefix(video_id, version))
+    if original_name:
+        with transaction.atomic():
+            lock_originals(original_name)  # Another video may be about to reference the same file
+            if not Video.objects.filter(original_file=original_name).exists():
+                for storage in (default_storage, cold_storage()):
+                    if storage.exists(original_name):
+                        reclaimed += storage.size(original_name)
+                        storage.delete(original_name)
+    print(f"Deleted files of video ID {video_id}, reclaimed {reclaimed} bytes")
+    return reclaimed
+
+
+def batches(entries, batch_size):
+    """Yield lists of up to batch_size items from an iterator."""
+    batch = []
+    for entry in entries:
+        batch.append(entry)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def scan_files(path):
+    """Yield the DirEntry of every file below a directory, depth first."""
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from scan_files(entry.path)
+            elif entry.is_file(follow_symlinks=False):
+                yield entry
+
+
+def upload_id_of(entry):
+    """Return the upload ID of a partial file, or None if the name is not one."""
+    try:
+        return uuid.UUID(entry.name.removesuffix('.part'))
+    except ValueError:
+        return None
+
+
+class Sweep:
+    """Remove orphaned media files, or only count them in a dry run."""
+
+    def __init__(self, dry_run=False, batch_size=None):
+        """Set up the counters.
+
+        Args:
+            dry_run (bool): Report what would be removed without deleting.
+            batch_size (int, optional): Directory entries checked per database query.
+        """
+        self.dry_run = dry_run
+        self.batch_size = batch_size or settings.MEDIA_SWEEP_BATCH_SIZE
+        self.cutoff = time.time() - settings.MEDIA_SWEEP_MIN_AGE
+        self.stats = {'files': 0, 'bytes': 0}
+
+    def is_old(self, entry):
+        """Return whether an entry was last modified before the grace period."""
+        return entry.stat(follow_symlinks=False).st_mtime < self.cutoff
+
+    def remove_file(self, entry):
+        """Remove one orphaned file."""
+        self.stats['files'] += 1
+        self.stats['bytes'] += entry.stat(follow_symlinks=False).st_size
+        if not self.dry_run:
+            os.remove(entry.path)
+
+    def remove_tree(self, path):
+        """Remove an orphaned directory tree unless anything in it changed within the grace period."""
+        files, size, newest = tree_size(path)
+        if newest >= self.cutoff:
+            return
+        self.stats['files'] += files
+        self.stats['bytes'] += size
+        if not self.dry_run:
+            shutil.rmtree(path, ignore_errors=True)
+
+    def sweep_hls(self, media_root, version):
+        """Remove HLS trees of deleted videos and renditions or segments not in the inventory.
+
+        Trees of live videos in another layout than the recorded one are left to
+        the `migrate_hls_layout` command, which may be copying them.
+
+        Args:
+            media_root (str): The root directory of the local HLS storage.
+            version (int): The layout version of the trees to sweep.
+        """
+        for batch in batches(scan_video_dirs(media_root, version), self.batch_size):
+            ids = [int(entry.name) for entry in batch]
+            live = dict(Video.objects.filter(pk__in=ids).values_list('pk', 'hls_layout'))
+            manifests = {}
+            for video_id, resolution, segment_count in Rendition.objects.filter(video_id__in=ids).values_list(
+                'video_id', 'resolution', 'segment_count'
+            ):
+                manifests.setdefault(video_id, {})[resolution] = segment_count
+            for entry in batch:
+                video_id = int(entry.name)
+                if video_id not in live:
+                    self.remove_tree(entry.path)
+                elif live[video_id] == version and video_id in manifests:  # Videos still waiting for a transcode are left alone
+                    self.sweep_renditions(entry.path, manifests[video_id])
+
+    def sweep_renditions(self, video_dir, manifest):
+        """Remove rendition directories and segments a video's inventory does not list.
+
+        Args:
+            video_dir (str): The HLS tree of a live video.
+            manifest (dict): Resolutions mapped to their segment counts.
+        """
+        with os.scandir(video_dir) as entries:
+            for entry in entries:
+                if not entry.is_dir(follow_symlinks=False):
+                    continue
+                if entry.name not in manifest:
+                    self.remove_tree(entry.path)
+                    continue
+                with os.scandir(entry.path) as files:
+                    for file in files:
+                        match = SEGMENT_NAME.fullmatch(file.name)
+                        if match and int(match.group(1)) >= manifest[entry.name] and self.is_old(file):
+                            self.remove_file(file)  # Left over from a longer earlier transcode
+
+    def sweep_originals(self, root):
+        """Remove original files that no video references.
+
+        Args:
+            root (str): The directory holding the originals.
+        """
+        if not os.path.isdir(root):
+            return
+        for batch in batches(scan_files(root), self.batch_size):
+            names = {os.path.relpath(entry.path, settings.MEDIA_ROOT).replace(os.sep, '/'): entry for entry in batch}
+            referenced = set(Video.objects.filter(original_file__in=names).values_list('original_file', flat=True))
+            orphans = [name for name, entry in names.items() if name not in referenced and self.is_old(entry)]
+            if not orphans:
+                continue
+            with transaction.atomic():
+                lock_originals(*orphans)  # Check again under the lock, a new duplicate may reference one
+                referenced = set(Video.objects.filter(original_file__in=orphans).values_list('original_file', flat=True))
+                for name in orphans:
+                    if name not in referenced:
+                        self.remove_file(names[name])
+
+    def sweep_partial_uploads(self, root):
+        """Remove partial upload files whose upload no longer exists.
+
+        Args:
+            root (str): The directory holding the partial files.
+        """
+        if not os.path.isdir(root):
+            return
+        with os.scandir(root) as entries:
+            partial_files = (entry for entry in entries if entry.name.endswith('.part') and upload_id_of(entry))
+            for batch in batches(partial_files, self.batch_size):
+                known = set(Upload.objects.filter(pk__in=[upload_id_of(entry) for entry in batch]).values_list('pk', flat=True))
+                for entry in batch:
+                    if upload_id_of(entry) not in known and self.is_old(entry):
+                        self.remove_file(entry)
+
+    def run(self):
+        """Sweep the media tree.
+
+        Returns:
+            dict: The number of files and bytes removed, or that would be removed
+                in a dry run.
+        """
+        start = time.perf_counter()
+        storage = hls_storage()
+        if is_local(storage):
+            for version, _ in LAYOUT_CHOICES:
+                self.sweep_hls(storage.location, version)
+        self.sweep_originals(default_storage.path('videos/original'))
+        self.sweep_partial_uploads(default_storage.path(settings.UPLOAD_TEMP_DIR))
+        verb = 'would reclaim' if self.dry_run else 'reclaimed'
+        print(f"Media sweep {verb} {self.stats['bytes']} bytes in {self.stats['files']} files "
+              f"({time.perf_counter() - start:.2f}s)")
+        return self.stats
+
+
+def sweep_media(dry_run=False, batch_size=None):
+    """Remove orphaned media files.
+
+    Args:
+        dry_run (bool): Report what would be removed without deleting.
+        batch_size (int, optional): Directory entries checked per database query.
+
+    Returns:
+        dict: The number of files and bytes removed or, in a dry run, removable.
+    """
+    return Sweep(dry_run, batch_size).run()
+
+
+def sweep_media_job():
+    """Sweep the media tree and schedule the next run, also if this run fails."""
+    try:
+        sweep_media()
+    finally:
+        schedule_sweep()
+
+
+def schedule_sweep():
+    """Schedule the next sweep job; requires an RQ worker started with --with-scheduler."""
+    django_rq.get_queue('default').enqueue_in(
+        timedelta(seconds=settings.MEDIA_SWEEP_INTERVAL), sweep_media_job, job_id=SWEEP_JOB_ID
+    )
@@ -0,0 +1,207 @@
+"""Content-addressed deduplication of original files and their HLS outputs.
+
+Every original is identified by the SHA-256 of its bytes, computed in a single
+streamed pass by the transcode job. Originals from resumable uploads are staged
+under their upload ID and then moved to a name derived from their hash, so an
+identical file is kept once. A new video whose hash matches an already transcoded
+video reuses that video's renditions: the HLS tree is hardlinked into the new
+video's directory, or copied server-side in a remote HLS storage, and the rendition
+inventory is copied, so no transcode runs. Because one original can be shared by
+several videos, every step that deletes an original or starts referencing one
+holds a transaction-scoped PostgreSQL advisory lock on its name.
+"""
+
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from .models import Rendition, Video
+from .layout import video_prefix
+from .storage import copy_tree, hls_storage, is_local
+from .tiering import cold_storage
+import hashlib
+import os
+import shutil
+
+HASH_READ_SIZE = 1024 * 1024  # Bytes read per block while hashing
+STAGED_ORIGINALS = 'videos/original/incoming/'  # Finalized uploads waiting to be hashed
+
+
+def file_sha256(path):
+    """Return the SHA-256 hex digest of a file, read in bounded blocks.
+
+    Args:
+        path (str): The path to the file.
+
+    Returns:
+        str: The hex digest.
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while block := f.read(HASH_READ_SIZE):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def content_addressed_name(content_hash, filename):
+    """Return the storage name of an original with the given hash.
+
+    Args:
+        content_hash (str): The SHA-256 hex digest of the file.
+        filename (str): The client-side file name, used for the extension only.
+
+    Returns:
+        str: The name below MEDIA_ROOT, e.g. 'videos/original/ab/ab12....mp4'.
+    """
+    extension = os.path.splitext(filename)[1].lower()
+    return f'videos/original/{content_hash[:2]}/{content_hash}{extension}'
+
+
+def original_lock_key(name):
+    """Return the advisory lock key of an original's storage name, a signed 64-bit integer."""
+    return int.from_bytes(hashlib.sha256(name.encode()).digest()[:8], 'big', signed=True)
+
+
+def lock_originals(*names):
+    """Lock originals by name until the current transaction ends.
+
+    Deleting an unreferenced original and starting to reference an existing one
+    take this lock, so a reference check never races with a new reference. Keys
+    are taken in sorted order so two callers cannot deadlock.
+
+    Args:
+        *names (str): The storage names of the originals.
+
+    Raises:
+        TransactionManagementError: If called outside an atomic block.
+    """
+    if not connection.in_atomic_block:
+        raise transaction.TransactionManagementError('Originals can only be locked inside a transaction.')
+    with connection.cursor() as cursor:
+        for key in sorted({original_lock_key(name) for name in names if name}):
+            cursor.execute('SELECT pg_advisory_xact_lock(%s)', [key])
+
+
+def is_staged(video):
+    """Return whether a video's original is a finalized upload that was not hashed yet."""
+    return video.original_file.name.startswith(STAGED_ORIGINALS)
+
+
+def store_content_addressed(video):
+    """Move a video's staged original to its content-addressed name.
+
+    If the same content is already stored, the staged copy is dropped instead.
+
+    Args:
+        video: The Video with a staged original and its content hash.
+    """
+    name = content_addressed_name(video.content_hash, video.original_file.name)
+    staged_path = video.original_file.path
+    path = default_storage.path(name)
+    with transaction.atomic():
+        lock_originals(name)  # A deleted duplicate must not remove the file we are about to reference
+        if os.path.exists(path):
+            os.remove(staged_path)  # Same content already stored
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(staged_path, path)
+        video.original_file.name = name
+        Video.objects.filter(pk=video.pk).update(original_file=name)
+
+
+def stored_tier(name):
+    """Return the tier an original is stored on, 'hot' or 'cold', or None if it is missing."""
+    if default_storage.exists(name):
+        return 'hot'
+    if cold_storage().exists(name):
+        return 'cold'
+    return None
+
+
+def find_transcoded_duplicate(video):
+    """Return another video with the same content that already has renditions.
+
+    Args:
+        video: The Video to find a duplicate of.
+
+    Returns:
+        Video or None: The transcoded video with the same content hash.
+    """
+    if not video.content_hash:
+        return None
+    return (
+        Video.objects.filter(content_hash=video.content_hash, renditions__isnull=False)
+        .exclude(pk=video.pk)
+        .order_by('pk')
+        .first()
+    )
+
+
+def link_tree(source_dir, target_dir):
+    """Hardlink every file of a directory tree into another directory.
+
+    Files are copied instead where hardlinks are not possible, e.g. across devices.
+
+    Args:
+        source_dir (str): The tree to link from.
+        target_dir (str): The directory to create the links in.
+    """
+    for root, _, files in os.walk(source_dir):
+        target_root = os.path.join(target_dir, os.path.relpath(root, source_dir))
+        os.makedirs(target_root, exist_ok=True)
+        for name in files:
+            target = os.path.join(target_root, name)
+            if os.path.exists(target):
+                os.remove(target)
+            try:
+                os.link(os.path.join(root, name), target)
+            except OSError:
+                shutil.copy2(os.path.join(root, name), target)
+
+
+def reuse_renditions(video, source):
+    """Give a video the HLS outputs and metadata of a video with the same content.
+
+    Args:
+        video: The Video to complete.
+        source: The transcoded Video with the same content hash.
+    """
+    source_prefix = video_prefix(source.id, source.hls_layout)
+    target_prefix = video_prefix(video.id, video.hls_layout)
+    storage = hls_storage()
+    if is_local(storage):
+        link_tree(storage.path(source_prefix), storage.path(target_prefix))
+    else:
+        copy_tree(source_prefix, target_prefix)
+    cold = cold_storage()
+    if is_local(cold) and os.path.isdir(cold.path(source_prefix)):
+        link_tree(cold.path(source_prefix), cold.path(target_prefix))  # Renditions moved to cold
+    Rendition.objects.bulk_create(
+        [
+            Rendition(
+                video=video,
+                resolution=rendition.resolution,
+                width=rendition.width,
+                height=rendition.height,
+                bitrate=rendition.bitrate,
+                codec=rendition.codec,
+                segment_count=rendition.segment_count,
+                total_bytes=rendition.total_bytes,
+                duration=rendition.duration,
+                tier='cold' if rendition.tier == 'restoring' else rendition.tier,
+            )
+            for rendition in source.renditions.all()
+        ],
+        ignore_conflicts=True,
+    )
+    video.duration = source.duration
+    video.aspect_ratio = source.aspect_ratio
+    duplicate_name = video.original_file.name
+    with transaction.atomic():
+        lock_originals(duplicate_name, source.original_file.name)
+        source_tier = stored_tier(source.original_file.name)
+        if duplicate_name != source.original_file.name and source_tier:
+            video.original_file.name = source.original_file.name  # Keep one copy of the original
+            video.original_tier = source_tier  # So a retranscode restores it from cold storage first
+        video.save(update_fields=['original_file', 'original_tier', 'duration', 'aspect_ratio'])  # Also invalidates cached details
+        if video.original_file.name != duplicate_name and not Video.objects.filter(original_file=duplicate_name).exists():
+            default_storage.delete(duplicate_name)
+    print(f"Reused renditions of video ID {source.id} for video ID {video.id}")
@@ -0,0 +1,105 @@
+"""Versioned on-disk layout of HLS trees.
+
+Each video records the layout version its HLS tree was written in, so storage
+names can be computed without touching the filesystem and existing trees keep
+working while they are migrated with the `migrate_hls_layout` command.
+
+Version 1 keeps every video in one flat `videos/` directory with three-digit
+segment numbers. Version 2 shards videos by a hash of their ID into 65,536
+directories, `hls/v2/<aa>/<bb>/<id>/`, so no directory grows beyond a few
+entries per thousand videos, and numbers segments with six digits, enough for
+about 115 days at 10-second segments.
+"""
+
+import hashlib
+import os
+
+FLAT = 1  # videos/<id>/<resolution>/000.ts
+SHARDED = 2  # hls/v2/<aa>/<bb>/<id>/<resolution>/000000.ts
+CURRENT_LAYOUT = SHARDED  # Layout of newly transcoded videos
+LAYOUT_CHOICES = [
+    (FLAT, 'Flat'),
+    (SHARDED, 'Sharded'),
+]
+SEGMENT_DIGITS = {FLAT: 3, SHARDED: 6}
+SHARDED_ROOT = 'hls/v2'
+
+
+def shard(video_id):
+    """Return the two-level shard directory of a video, e.g. 'c4/ca'.
+
+    The ID is hashed so that consecutive IDs spread evenly over all shards.
+    """
+    digest = hashlib.md5(str(video_id).encode(), usedforsecurity=False).hexdigest()
+    return f'{digest[:2]}/{digest[2:4]}'
+
+
+def video_prefix(video_id, version=CURRENT_LAYOUT):
+    """Return the storage name of a video's HLS tree.
+
+    Args:
+        video_id (int): The ID of the video.
+        version (int): The layout version of the tree.
+
+    Returns:
+        str: The storage name, e.g. 'hls/v2/c4/ca/1'.
+    """
+    if version == FLAT:
+        return f'videos/{video_id}'
+    return f'{SHARDED_ROOT}/{shard(video_id)}/{video_id}'
+
+
+def rendition_prefix(video_id, resolution, version=CURRENT_LAYOUT):
+    """Return the storage name of a rendition's directory."""
+    return f'{video_prefix(video_id, version)}/{resolution}'
+
+
+def playlist_name(video_id, resolution, version=CURRENT_LAYOUT):
+    """Return the storage name of a rendition's playlist."""
+    return f'{rendition_prefix(video_id, resolution, version)}/index.m3u8'
+
+
+def segment_name(video_id, resolution, segment, version=CURRENT_LAYOUT):
+    """Return the storage name of a segment file."""
+    return f'{rendition_prefix(video_id, resolution, version)}/{segment}'
+
+
+def segment_pattern(version=CURRENT_LAYOUT):
+    """Return the FFmpeg segment file name pattern of a layout, e.g. '%06d.ts'."""
+    return f'%0{SEGMENT_DIGITS[version]}d.ts'
+
+
+def scan_video_dirs(media_root, version):
+    """Yield the directory entries of all video trees of a layout below a local root.
+
+    Args:
+        media_root (str): The root directory of a local storage.
+        version (int): The layout version to scan.
+
+    Yields:
+        os.DirEntry: One entry per video directory, named by the video ID.
+    """
+    if version == FLAT:
+        parents = [os.path.join(media_root, 'videos')]
+    else:
+        parents = shard_dirs(os.path.join(media_root, SHARDED_ROOT))
+    for parent in parents:
+        if not os.path.isdir(parent):
+            continue
+        with os.scandir(parent) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False) and entry.name.isdigit():
+                    yield entry
+
+
+def shard_dirs(root):
+    """Yield the paths of the existing second-level shard directories below a root."""
+    if not os.path.isdir(root):
+        return
+    with os.scandir(root) as first_level:
+        for first in first_level:
+            if first.is_dir(follow_symlinks=False):
+                with os.scandir(first.path) as second_level:
+                    for second in second_level:
+                        if second.is_dir(follow_symlinks=False):
+                            yield second.path
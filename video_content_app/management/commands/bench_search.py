@@ -0,0 +1,78 @@
+"""Management command benchmarking video search latency on a synthetic catalog.
+
+The command fills the Video table with synthetic titles inside a transaction, runs
+a mix of full-text and misspelled queries through the search module and reports
+latency percentiles. The transaction is rolled back afterwards, so the database is
+left untouched.
+"""
+
+import random
+import statistics
+import time
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from ...models import Category, Video
+from ...search import search_videos
+
+WORDS = [
+    'ocean', 'mountain', 'city', 'night', 'storm', 'river', 'desert', 'forest', 'island', 'winter',
+    'summer', 'secret', 'journey', 'legend', 'shadow', 'empire', 'dream', 'signal', 'garden', 'harbor',
+    'voyage', 'frontier', 'echo', 'crystal', 'thunder', 'silent', 'golden', 'hidden', 'lost', 'wild',
+]
+QUERIES = ['ocean journey', 'hidden empire', 'silent night', 'golden harbor', 'legend', 'Mountian Storm', 'sercet garden']
+
+
+class Command(BaseCommand):
+    """Benchmark search latency against a synthetic catalog of video titles."""
+    help = 'Benchmark video search latency (p50/p95/p99) on a synthetic catalog.'
+
+    def add_arguments(self, parser):
+        """Register command line options for catalog size and query repetitions."""
+        parser.add_argument('--videos', type=int, default=100_000, help='Number of synthetic videos.')
+        parser.add_argument('--iterations', type=int, default=200, help='Number of timed search requests.')
+        parser.add_argument('--page-size', type=int, default=20, help='Results fetched per search.')
+
+    def handle(self, *args, **options):
+        """Create the synthetic catalog, time the searches and roll everything back."""
+        rng = random.Random(42)  # Fixed seed for comparable runs
+        with transaction.atomic():
+            self.create_catalog(rng, options['videos'])
+            timings = self.run_queries(rng, options['iterations'], options['page_size'])
+            transaction.set_rollback(True)  # Discard the synthetic catalog
+
+        timings.sort()
+        percentiles = statistics.quantiles(timings, n=100)
+        self.stdout.write(
+            f"videos={options['videos']} searches={len(timings)} "
+            f"p50={percentiles[49]:.2f}ms p95={percentiles[94]:.2f}ms p99={percentiles[98]:.2f}ms"
+        )
+
+    def create_catalog(self, rng, count):
+        """Bulk insert synthetic videos and refresh planner statistics."""
+        category = Category.objects.create(name='Benchmark')
+        batch = []
+        for index in range(count):
+            title = ' '.join(rng.sample(WORDS, 3)).title()
+            batch.append(Video(
+                title=f'{title} {index}',
+                description=' '.join(rng.choices(WORDS, k=20)),
+                thumbnail='thumbnails/bench.jpg',
+                category=category,
+                original_file='videos/original/bench.mp4',
+            ))
+            if len(batch) == 5000:
+                Video.objects.bulk_create(batch)  # bulk_create skips the transcoding signal
+                batch = []
+        Video.objects.bulk_create(batch)
+        with connection.cursor() as cursor:
+            cursor.execute(f'ANALYZE {Video._meta.db_table}')
+
+    def run_queries(self, rng, iterations, page_size):
+        """Run timed searches and return their durations in milliseconds."""
+        timings = []
+        for _ in range(iterations):
+            query = rng.choice(QUERIES)
+            start = time.perf_counter()
+            list(search_videos(query)[:page_size])
+            timings.append((time.perf_counter() - start) * 1000)
+        return timings
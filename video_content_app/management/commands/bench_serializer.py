@@ -0,0 +1,80 @@
+"""Management command benchmarking video list serialization and JSON rendering.
+
+The command creates synthetic videos with renditions inside a transaction, then
+reports rows per second for the generic ModelSerializer path, the VideoSerializer
+fast path, DRF's JSONRenderer and the orjson-backed FastJSONRenderer. The
+transaction is rolled back afterwards, so the database is left untouched.
+"""
+
+import time
+from core.renderers import FastJSONRenderer, orjson
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory
+from ...api.serializers import GenericVideoSerializer, VideoSerializer
+from ...models import Category, Rendition, Video
+from .bench_search import WORDS
+
+
+class Command(BaseCommand):
+    """Benchmark serializer and renderer throughput for the video list."""
+    help = 'Benchmark video list serialization and JSON rendering in rows/sec.'
+
+    def add_arguments(self, parser):
+        """Register command line options for the list size and repetitions."""
+        parser.add_argument('--videos', type=int, default=2000, help='Number of synthetic videos.')
+        parser.add_argument('--repeat', type=int, default=5, help='Timed repetitions per variant.')
+
+    def handle(self, *args, **options):
+        """Create the synthetic videos, time every variant and roll everything back."""
+        with transaction.atomic():
+            self.create_videos(options['videos'])
+            videos = list(Video.objects.select_related('category').prefetch_related('renditions'))
+            request = APIRequestFactory().get('/api/video/', HTTP_HOST=settings.ALLOWED_HOSTS[0])
+            context = {'request': request}
+            data = VideoSerializer(videos, many=True, context=context).data
+            variants = [
+                ('serializer generic', lambda: GenericVideoSerializer(videos, many=True, context=context).data),
+                ('serializer fast path', lambda: VideoSerializer(videos, many=True, context=context).data),
+                ('render JSONRenderer', lambda: JSONRenderer().render(data)),
+                ('render FastJSONRenderer', lambda: FastJSONRenderer().render(data)),
+            ]
+            for name, run in variants:
+                elapsed = self.best_of(run, options['repeat'])
+                self.stdout.write(f'{name:<26} {len(videos) / elapsed:>12,.0f} rows/sec')
+            transaction.set_rollback(True)  # Discard the synthetic videos
+        if orjson is None:
+            self.stdout.write('orjson is not installed, FastJSONRenderer used the stdlib fallback.')
+
+    def create_videos(self, count):
+        """Bulk insert synthetic videos, each with a three-rung rendition ladder."""
+        category = Category.objects.create(name='Benchmark')
+        videos = Video.objects.bulk_create([
+            Video(
+                title=f'{WORDS[index % len(WORDS)].title()} {index}',
+                description=' '.join(WORDS),
+                thumbnail=f'thumbnails/bench_{index}.jpg',
+                category=category,
+                original_file='videos/original/bench.mp4',
+                duration=5400.0,
+                aspect_ratio='16:9',
+            )
+            for index in range(count)
+        ])
+        Rendition.objects.bulk_create([
+            Rendition(video=video, resolution=f'{height}p', width=height * 16 // 9, height=height,
+                      bitrate=bitrate, codec='h264', segment_count=540, total_bytes=bitrate * 675000, duration=5400.0)
+            for video in videos
+            for height, bitrate in [(480, 1000), (720, 2000), (1080, 4000)]
+        ])
+
+    def best_of(self, run, repeat):
+        """Return the fastest of several timed runs, in seconds."""
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - start)
+        return min(timings)
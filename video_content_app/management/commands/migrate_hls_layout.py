@@ -0,0 +1,70 @@
+"""Management command moving HLS trees into the current on-disk layout.
+
+Each tree of a video in an older layout is first linked (local storage) or copied
+server-side (S3) to its new location in the hot and cold storage, then the video's
+layout is switched in one conditional update, and only then is the old tree
+deleted, so playback keeps working throughout. Segment names are kept since the
+playlists reference them. The command can be interrupted and run again.
+"""
+
+from django.core.management.base import BaseCommand
+from ...cleanup import delete_tree
+from ...dedupe import link_tree
+from ...layout import CURRENT_LAYOUT, video_prefix
+from ...models import Video
+from ...storage import copy_tree, hls_storage, is_local, walk
+from ...tiering import cold_storage
+import os
+
+
+def clone_tree(storage, source_prefix, target_prefix):
+    """Link or copy a tree to a new prefix of the same storage."""
+    if is_local(storage):
+        if os.path.isdir(storage.path(source_prefix)):
+            link_tree(storage.path(source_prefix), storage.path(target_prefix))
+    elif any(True for _ in walk(storage, source_prefix)):
+        copy_tree(source_prefix, target_prefix, storage)
+
+
+class Command(BaseCommand):
+    """Move the HLS trees of videos in older layouts into the current layout."""
+    help = 'Move HLS trees of videos in older layouts into the current sharded layout.'
+
+    def add_arguments(self, parser):
+        """Register command line options for dry runs and the batch size."""
+        parser.add_argument('--dry-run', action='store_true', help='Report how many videos would be moved.')
+        parser.add_argument('--batch-size', type=int, default=500, help='Videos loaded per database query.')
+
+    def handle(self, *args, **options):
+        """Migrate every video not yet in the current layout."""
+        pending = Video.objects.exclude(hls_layout=CURRENT_LAYOUT).order_by('pk').values_list('pk', 'hls_layout')
+        if options['dry_run']:
+            self.stdout.write(f'Would move {pending.count()} videos to layout {CURRENT_LAYOUT}.')
+            return
+        moved = 0
+        for video_id, version in pending.iterator(chunk_size=options['batch_size']):
+            moved += self.migrate_video(video_id, version)
+            if moved and moved % options['batch_size'] == 0:
+                self.stdout.write(f'Moved {moved} videos...')
+        self.stdout.write(f'Moved {moved} videos to layout {CURRENT_LAYOUT}.')
+
+    def migrate_video(self, video_id, version):
+        """Move one video's trees into the current layout.
+
+        Args:
+            video_id (int): The ID of the video.
+            version (int): The layout its trees are in.
+
+        Returns:
+            int: 1 if the video was moved, 0 if another process changed it meanwhile.
+        """
+        source_prefix = video_prefix(video_id, version)
+        target_prefix = video_prefix(video_id, CURRENT_LAYOUT)
+        storages = [hls_storage(), cold_storage()]
+        for storage in storages:
+            clone_tree(storage, source_prefix, target_prefix)
+        if not Video.objects.filter(pk=video_id, hls_layout=version).update(hls_layout=CURRENT_LAYOUT):
+            return 0
+        for storage in storages:
+            delete_tree(storage, source_prefix)
+        return 1
@@ -0,0 +1,32 @@
+"""Management command removing orphaned media files.
+
+The command sweeps the media tree for HLS trees, renditions and segments, originals
+and partial uploads that the database no longer references, and reports the bytes
+reclaimed. With --dry-run nothing is deleted. With --schedule it starts the
+self-rescheduling RQ sweep job instead, which requires an RQ worker running with
+--with-scheduler.
+"""
+
+from django.core.management.base import BaseCommand
+from ...cleanup import schedule_sweep, sweep_media
+
+
+class Command(BaseCommand):
+    """Remove media files no video or upload references."""
+    help = 'Remove orphaned HLS files, originals and partial uploads, or schedule the sweep job.'
+
+    def add_arguments(self, parser):
+        """Register command line options for dry runs, the batch size and scheduling."""
+        parser.add_argument('--dry-run', action='store_true', help='Report what would be removed without deleting.')
+        parser.add_argument('--batch-size', type=int, default=None, help='Directory entries checked per database query.')
+        parser.add_argument('--schedule', action='store_true', help='Schedule the recurring RQ sweep job.')
+
+    def handle(self, *args, **options):
+        """Sweep the media tree now or schedule the recurring job."""
+        if options['schedule']:
+            schedule_sweep()
+            self.stdout.write('Scheduled the media sweep job.')
+            return
+        stats = sweep_media(options['dry_run'], options['batch_size'])
+        verb = 'Would reclaim' if options['dry_run'] else 'Reclaimed'
+        self.stdout.write(f"{verb} {stats['bytes']} bytes in {stats['files']} files.")
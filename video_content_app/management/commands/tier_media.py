@@ -0,0 +1,32 @@
+"""Management command applying the storage tiering policy.
+
+The command moves idle originals and renditions to the cold storage, or with
+--dry-run reports what would be moved. With --report it prints the bytes on each
+tier and the hot-tier bytes saved. With --schedule it starts the self-rescheduling
+RQ tiering job instead, which requires an RQ worker running with --with-scheduler.
+"""
+
+from django.core.management.base import BaseCommand
+from ...tiering import schedule_tiering, tier_media, tiering_report
+
+
+class Command(BaseCommand):
+    """Move idle media to the cold storage and report the savings."""
+    help = 'Move idle originals and renditions to cold storage, report tier usage, or schedule the tiering job.'
+
+    def add_arguments(self, parser):
+        """Register command line options for dry runs, reporting and scheduling."""
+        parser.add_argument('--dry-run', action='store_true', help='Report what would be moved without moving it.')
+        parser.add_argument('--report', action='store_true', help='Only print the bytes per tier.')
+        parser.add_argument('--schedule', action='store_true', help='Schedule the recurring RQ tiering job.')
+
+    def handle(self, *args, **options):
+        """Apply the policy, print the report or schedule the recurring job."""
+        if options['schedule']:
+            schedule_tiering()
+            self.stdout.write('Scheduled the tiering job.')
+            return
+        if not options['report']:
+            tier_media(options['dry_run'])
+        for key, value in tiering_report().items():
+            self.stdout.write(f'{key}: {value}')
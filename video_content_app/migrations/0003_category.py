@@ -0,0 +1,70 @@
+# Generated by Django 5.2.4 on 2026-10-19 17:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def copy_categories(apps, schema_editor):
+    """Create a Category per distinct category string and link every video to it."""
+    Category = apps.get_model('video_content_app', 'Category')
+    Video = apps.get_model('video_content_app', 'Video')
+    names = Video.objects.values_list('category', flat=True).distinct()
+    for name in names:
+        category = Category.objects.create(name=name)
+        count = Video.objects.filter(category=name).update(category_ref=category)
+        Category.objects.filter(pk=category.pk).update(video_count=count)
+
+
+def restore_categories(apps, schema_editor):
+    """Copy category names back into the free-text column."""
+    Video = apps.get_model('video_content_app', 'Video')
+    for video in Video.objects.select_related('category_ref'):
+        video.category = video.category_ref.name
+        video.save(update_fields=['category'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('video_content_app', '0002_video_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Category',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('video_count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name_plural': 'categories',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AddField(
+            model_name='video',
+            name='category_ref',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='video_content_app.category'),
+        ),
+        migrations.AlterField(
+            model_name='video',
+            name='category',
+            field=models.CharField(default='', max_length=100),
+        ),
+        migrations.RunPython(copy_categories, restore_categories),
+        migrations.RemoveField(
+            model_name='video',
+            name='category',
+        ),
+        migrations.RenameField(
+            model_name='video',
+            old_name='category_ref',
+            new_name='category',
+        ),
+        migrations.AlterField(
+            model_name='video',
+            name='category',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='videos', to='video_content_app.category'),
+        ),
+    ]
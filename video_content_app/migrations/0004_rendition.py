@@ -0,0 +1,43 @@
+# Generated by Django 5.2.4 on 2026-10-19 18:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('video_content_app', '0003_category'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='video',
+            name='aspect_ratio',
+            field=models.CharField(blank=True, max_length=10),
+        ),
+        migrations.AddField(
+            model_name='video',
+            name='duration',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='Rendition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('resolution', models.CharField(max_length=10)),
+                ('width', models.PositiveIntegerField()),
+                ('height', models.PositiveIntegerField()),
+                ('bitrate', models.PositiveIntegerField()),
+                ('codec', models.CharField(blank=True, max_length=50)),
+                ('segment_count', models.PositiveIntegerField(default=0)),
+                ('total_bytes', models.PositiveBigIntegerField(default=0)),
+                ('duration', models.FloatField(default=0)),
+                ('video', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='renditions', to='video_content_app.video')),
+            ],
+            options={
+                'ordering': ['height'],
+                'constraints': [models.UniqueConstraint(fields=('video', 'resolution'), name='unique_video_rendition')],
+            },
+        ),
+    ]
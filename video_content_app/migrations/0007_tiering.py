@@ -0,0 +1,38 @@
+# Generated by Django 5.2.4 on 2026-10-19 17:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('video_content_app', '0006_video_content_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='rendition',
+            name='last_played_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='rendition',
+            name='tier',
+            field=models.CharField(choices=[('hot', 'Hot'), ('cold', 'Cold'), ('restoring', 'Restoring')], default='hot', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='video',
+            name='last_played_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='video',
+            name='original_tier',
+            field=models.CharField(choices=[('hot', 'Hot'), ('cold', 'Cold'), ('restoring', 'Restoring')], default='hot', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='video',
+            name='play_count',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+    ]
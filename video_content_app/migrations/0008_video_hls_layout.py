@@ -0,0 +1,24 @@
+# Generated by Django 5.2.4 on 2026-10-19 19:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('video_content_app', '0007_tiering'),
+    ]
+
+    operations = [
+        # Existing trees were written in the flat layout; only new videos default to the sharded one
+        migrations.AddField(
+            model_name='video',
+            name='hls_layout',
+            field=models.PositiveSmallIntegerField(choices=[(1, 'Flat'), (2, 'Sharded')], default=1),
+        ),
+        migrations.AlterField(
+            model_name='video',
+            name='hls_layout',
+            field=models.PositiveSmallIntegerField(choices=[(1, 'Flat'), (2, 'Sharded')], default=2),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-19 21:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('video_content_app', '0008_video_hls_layout'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='rendition',
+            name='restore_started_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -1,9 +1,44 @@
 """Models for the video content application.
 
-This module defines the Video model for storing video metadata and associated files.
+This module defines the Category model for grouping videos, the Video model for
+storing video metadata and associated files, the Rendition model describing the
+transcoded HLS outputs of a video, and the Upload model tracking resumable uploads
+of original files.
 """
 
+from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.db import models
+from .layout import CURRENT_LAYOUT, LAYOUT_CHOICES
+import uuid
+
+
+TIER_CHOICES = [
+    ('hot', 'Hot'),  # On the serving storage
+    ('cold', 'Cold'),  # Moved to the cold storage
+    ('restoring', 'Restoring'),  # Being moved back to the serving storage
+]
+
+
+class Category(models.Model):
+    """Model representing a video category with a cached video count."""
+
+    name = models.CharField(max_length=100, unique=True)  # Category name, unique index
+    video_count = models.PositiveIntegerField(default=0)  # Cached count, kept current by signals
+
+    class Meta:
+        """Configuration for the Category model."""
+        ordering = ['name']
+        verbose_name_plural = 'categories'
+
+    def __str__(self):
+        """Return the string representation of the category.
+
+        Returns:
+            str: The name of the category.
+        """
+        return self.name
 
 
 class Video(models.Model):
@@ -13,8 +48,30 @@ class Video(models.Model):
     description = models.TextField()  # Video description
     created_at = models.DateTimeField(auto_now_add=True)  # Timestamp of creation
     thumbnail = models.ImageField(upload_to='thumbnails/')  # Thumbnail image
-    category = models.CharField(max_length=100)  # Video category
+    category = models.ForeignKey(Category, on_delete=models.PROTECT, related_name='videos')  # Video category
     original_file = models.FileField(upload_to='videos/original/')  # Original video file
+    content_hash = models.CharField(max_length=64, blank=True, db_index=True)  # SHA-256 of the original, for deduplication
+    hls_layout = models.PositiveSmallIntegerField(choices=LAYOUT_CHOICES, default=CURRENT_LAYOUT)  # On-disk layout of the HLS tree
+    original_tier = models.CharField(max_length=10, choices=TIER_CHOICES, default='hot')  # Storage tier of the original
+    play_count = models.PositiveBigIntegerField(default=0)  # Number of playback sessions started
+    last_played_at = models.DateTimeField(null=True, blank=True)  # Start of the latest playback session
+    duration = models.FloatField(null=True, blank=True)  # Duration in seconds, set after transcoding
+    aspect_ratio = models.CharField(max_length=10, blank=True)  # Display aspect ratio, e.g. '16:9'
+    search_vector = models.GeneratedField(
+        expression=(
+            SearchVector('title', weight='A', config='english')
+            + SearchVector('description', weight='B', config='english')
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )  # Full-text document maintained by PostgreSQL, title ranked above description
+
+    class Meta:
+        """Indexes backing the full-text and typo-tolerant title search."""
+        indexes = [
+            GinIndex(fields=['search_vector'], name='video_search_vector_gin'),
+            GinIndex(fields=['title'], name='video_title_trgm_gin', opclasses=['gin_trgm_ops']),
+        ]
 
     def __str__(self):
         """Return the string representation of the video.
@@ -23,3 +80,65 @@ class Video(models.Model):
             str: The title of the video.
         """
         return self.title
+
+
+class Rendition(models.Model):
+    """Model representing one transcoded HLS rendition of a video."""
+
+    video = models.ForeignKey(Video, on_delete=models.CASCADE, related_name='renditions')
+    resolution = models.CharField(max_length=10)  # Rendition name, e.g. '720p'
+    width = models.PositiveIntegerField()  # Frame width in pixels
+    height = models.PositiveIntegerField()  # Frame height in pixels
+    bitrate = models.PositiveIntegerField()  # Target video bitrate in kbit/s
+    codec = models.CharField(max_length=50, blank=True)  # Video codec of the segments
+    segment_count = models.PositiveIntegerField(default=0)  # Number of .ts segments
+    total_bytes = models.PositiveBigIntegerField(default=0)  # Size of all segments and the playlist
+    duration = models.FloatField(default=0)  # Duration in seconds
+    tier = models.CharField(max_length=10, choices=TIER_CHOICES, default='hot')  # Storage tier of the segments
+    last_played_at = models.DateTimeField(null=True, blank=True)  # Latest playlist request, recorded coarsely
+    restore_started_at = models.DateTimeField(null=True, blank=True)  # When the pending restore was queued
+
+    class Meta:
+        """Configuration for the Rendition model."""
+        ordering = ['height']
+        constraints = [
+            models.UniqueConstraint(fields=['video', 'resolution'], name='unique_video_rendition'),
+        ]
+
+    def __str__(self):
+        """Return the string representation of the rendition.
+
+        Returns:
+            str: The video title followed by the resolution.
+        """
+        return f'{self.video} ({self.resolution})'
+
+
+class Upload(models.Model):
+    """Model representing a resumable upload of an original video file.
+
+    The file is received in chunks at increasing offsets into a partial file and
+    becomes a Video when the upload is finalized.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)  # Unguessable upload ID
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='video_uploads')
+    filename = models.CharField(max_length=255)  # Client-side file name of the original
+    size = models.PositiveBigIntegerField()  # Total size in bytes announced at creation
+    offset = models.PositiveBigIntegerField(default=0)  # Bytes received so far
+    title = models.CharField(max_length=255)  # Title of the video to create
+    description = models.TextField()  # Description of the video to create
+    category = models.ForeignKey(Category, on_delete=models.PROTECT, related_name='uploads')
+    video = models.OneToOneField(
+        Video, on_delete=models.SET_NULL, null=True, blank=True, related_name='upload'
+    )  # Set once the upload is finalized
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)  # Time of the last received chunk
+
+    def __str__(self):
+        """Return the string representation of the upload.
+
+        Returns:
+            str: The file name followed by the progress in bytes.
+        """
+        return f'{self.filename} ({self.offset}/{self.size})'
@@ -0,0 +1,192 @@
+"""Short-lived playback session tokens for HLS streaming.
+
+A playback token binds a user, a video, an expiry and a random session ID, signed
+with an HMAC derived from SECRET_KEY. Tokens are minted per video by the playback
+endpoint and outlive the 30-minute access token, so a film can play to the end
+without refresh round trips. Verifying a token needs no database or cache access,
+and a token is only accepted for the playlist and segment paths of its own video.
+Players that cannot send cookies pass the token as a query parameter; their
+playlists are rewritten so every segment URI carries it as well.
+"""
+
+from django.conf import settings
+from django.utils.crypto import constant_time_compare, salted_hmac
+from rest_framework.authentication import BaseAuthentication
+from urllib.parse import urlencode
+import base64
+import secrets
+import time
+
+COOKIE_NAME = 'playback_token'
+QUERY_PARAM = 'playback_token'  # For players that cannot send cookies
+
+
+class InvalidPlaybackToken(Exception):
+    """Raised when a playback token is malformed, forged, expired or for another video."""
+
+
+class PlaybackSession:
+    """The verified claims of a playback token."""
+
+    def __init__(self, user_id, video_id, expires_at, session_id):
+        """Store the claims.
+
+        Args:
+            user_id (int): The ID of the user the token was minted for.
+            video_id (int): The ID of the video the token is valid for.
+            expires_at (int): The expiry as a Unix timestamp.
+            session_id (str): The random playback session ID.
+        """
+        self.user_id = user_id
+        self.video_id = video_id
+        self.expires_at = expires_at
+        self.session_id = session_id
+
+
+class PlaybackUser:
+    """Lightweight authenticated user backed by a playback session."""
+    is_authenticated = True
+    is_anonymous = False
+    is_active = True
+    is_staff = False
+
+    def __init__(self, session):
+        """Wrap a verified playback session."""
+        self.id = self.pk = session.user_id
+        self.session = session
+
+    def __str__(self):
+        """Return a readable description of the playback user."""
+        return f'PlaybackUser {self.id}'
+
+
+def sign(payload):
+    """Return the base64url HMAC signature of a payload."""
+    digest = salted_hmac('video_content_app.playback', payload, algorithm='sha256').digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b'=').decode()
+
+
+def mint_playback_token(user_id, video_id, lifetime=None, session_id=None):
+    """Create a playback token for a user and video.
+
+    Args:
+        user_id (int): The ID of the user.
+        video_id (int): The ID of the video.
+        lifetime (int, optional): Validity in seconds; defaults to PLAYBACK_TOKEN_LIFETIME.
+        session_id (str, optional): The session ID of a token being replaced; a new
+            random ID by default.
+
+    Returns:
+        tuple: The token string and its PlaybackSession.
+    """
+    expires_at = int(time.time()) + (lifetime or settings.PLAYBACK_TOKEN_LIFETIME)
+    session = PlaybackSession(int(user_id), int(video_id), expires_at, session_id or secrets.token_urlsafe(9))
+    payload = f'{session.user_id}.{session.video_id}.{session.expires_at}.{session.session_id}'
+    return f'{payload}.{sign(payload)}', session
+
+
+def verify_playback_token(token, video_id):
+    """Verify a playback token for a video.
+
+    Args:
+        token (str): The token string.
+        video_id (int): The ID of the video being requested.
+
+    Returns:
+        PlaybackSession: The verified session.
+
+    Raises:
+        InvalidPlaybackToken: If the token is malformed, forged, expired or for another video.
+    """
+    payload, _, signature = token.rpartition('.')
+    if not payload or not constant_time_compare(signature, sign(payload)):
+        raise InvalidPlaybackToken('Invalid signature')
+    user_id, token_video_id, expires_at, session_id = payload.split('.')
+    if int(token_video_id) != int(video_id):
+        raise InvalidPlaybackToken('Token is for another video')
+    if int(expires_at) < time.time():
+        raise InvalidPlaybackToken('Token expired')
+    return PlaybackSession(int(user_id), int(token_video_id), int(expires_at), session_id)
+
+
+def replaced_session_id(request, user_id, video_id):
+    """Return the session ID of the client's current playback token for a video.
+
+    Players send their token with every request for the video, including the
+    request for a new token, so a reloaded player keeps its playback session.
+
+    Args:
+        request: The HTTP request object.
+        user_id (int): The ID of the authenticated user.
+        video_id (int): The ID of the video.
+
+    Returns:
+        str or None: The session ID, or None if the request carries no valid token
+            of the user for the video.
+    """
+    token = request.COOKIES.get(COOKIE_NAME) or request.query_params.get(QUERY_PARAM)
+    if not token:
+        return None
+    try:
+        session = verify_playback_token(token, video_id)
+    except (InvalidPlaybackToken, ValueError):
+        return None
+    return session.session_id if session.user_id == user_id else None
+
+
+class PlaybackTokenAuthentication(BaseAuthentication):
+    """Authenticate HLS requests with a playback token for the requested video.
+
+    Requests without a valid token for the video in the URL fall through to the
+    next authentication class.
+    """
+
+    def authenticate(self, request):
+        """Authenticate the request from the playback token cookie or query parameter.
+
+        Args:
+            request: The HTTP request object.
+
+        Returns:
+            tuple: (PlaybackUser, PlaybackSession) if the token is valid for the
+                requested video, otherwise None.
+        """
+        token = request.COOKIES.get(COOKIE_NAME) or request.query_params.get(QUERY_PARAM)
+        video_id = request.parser_context['kwargs'].get('movie_id')
+        if not token or video_id is None:
+            return None
+        try:
+            session = verify_playback_token(token, video_id)
+        except (InvalidPlaybackToken, ValueError):
+            return None
+        return PlaybackUser(session), session
+
+    def authenticate_header(self, request):
+        """Return the WWW-Authenticate header so unauthenticated requests get 401."""
+        return 'Bearer realm="api"'
+
+
+def query_token(request):
+    """Return the playback token a request passed as a query parameter instead of a cookie, or None."""
+    if request.COOKIES.get(COOKIE_NAME):
+        return None
+    return request.query_params.get(QUERY_PARAM) or None
+
+
+def tokenized_playlist(playlist, token):
+    """Append a playback token to every URI of an HLS playlist.
+
+    Args:
+        playlist (str): The playlist text.
+        token (str): The playback token.
+
+    Returns:
+        str: The playlist whose segment URIs carry the token as a query parameter.
+    """
+    query = urlencode({QUERY_PARAM: token})
+    lines = []
+    for line in playlist.splitlines():
+        if line and not line.startswith('#'):  # Every line that is neither a tag nor blank is a URI
+            line = f"{line}{'&' if '?' in line else '?'}{query}"
+        lines.append(line)
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,52 @@
+"""Full-text search over the video catalog.
+
+This module ranks videos against a PostgreSQL ``tsvector`` document (title weighted
+above description) and falls back to trigram similarity on the title when the
+full-text query matches nothing, so simple typos still return results.
+"""
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramSimilarity
+from django.db.models import F
+from .models import Video
+
+SEARCH_CONFIG = 'english'  # Must match the config of Video.search_vector
+TRIGRAM_THRESHOLD = 0.3  # Same default as pg_trgm.similarity_threshold
+
+
+def search_videos(query):
+    """Return a ranked queryset of videos matching the search query.
+
+    Args:
+        query (str): The raw search string entered by the user.
+
+    Returns:
+        QuerySet: Videos ordered by relevance, best match first.
+    """
+    search_query = SearchQuery(query, config=SEARCH_CONFIG, search_type='websearch')
+    ranked = (
+        Video.objects.select_related('category').prefetch_related('renditions')
+        .filter(search_vector=search_query)
+        .annotate(rank=SearchRank(F('search_vector'), search_query))
+        .order_by('-rank', '-created_at', '-id')
+    )
+    if ranked.exists():
+        return ranked
+    return trigram_search(query)
+
+
+def trigram_search(query):
+    """Return videos whose title is similar to the query, tolerating typos.
+
+    Args:
+        query (str): The raw search string entered by the user.
+
+    Returns:
+        QuerySet: Videos ordered by title similarity, best match first.
+    """
+    return (
+        Video.objects.select_related('category').prefetch_related('renditions')
+        .filter(title__trigram_similar=query)  # Uses the trigram GIN index
+        .annotate(similarity=TrigramSimilarity('title', query))
+        .filter(similarity__gte=TRIGRAM_THRESHOLD)
+        .order_by('-similarity', '-created_at', '-id')
+    )
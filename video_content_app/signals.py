@@ -1,38 +1,183 @@
 """Signal handlers for the video content application.
 
 This module defines signals to transcode newly created videos into HLS format,
-using FFmpeg and RQ for asynchronous processing.
+using FFmpeg and RQ for asynchronous processing, or to reuse the renditions of a
+video with identical content, to keep the cached per-category
+video counts current, to invalidate cached video details on changes, and to delete
+the files of deleted videos.
 """
 
-from django.db.models.signals import post_save
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
-from .models import Video
-from django.conf import settings
+from .cleanup import delete_video_files
+from .dedupe import file_sha256, find_transcoded_duplicate, is_staged, reuse_renditions, store_content_addressed
+from .models import Category, Rendition, Video
+from .layout import segment_pattern, video_prefix
+from .storage import publish_tree, work_dir
+from .tiering import ensure_original_hot
+from .video_cache import invalidate_videos
 import django_rq
+import json
+import math
 import os
 import subprocess
 
 
+RENDITIONS = [
+    {'resolution': '480p', 'width': 854, 'height': 480, 'bitrate': 1000},
+    {'resolution': '720p', 'width': 1280, 'height': 720, 'bitrate': 2000},
+    {'resolution': '1080p', 'width': 1920, 'height': 1080, 'bitrate': 4000},
+]  # HLS ladder; bitrate in kbit/s
+
+
+def probe_media(path):
+    """Read container and video stream metadata of a media file with ffprobe.
+
+    Args:
+        path (str): The path to a media file or HLS playlist.
+
+    Returns:
+        dict: The parsed ffprobe output, or an empty dict if probing failed.
+    """
+    cmd = [
+        'ffprobe', '-v', 'error',
+        '-select_streams', 'v:0',
+        '-show_entries', 'stream=codec_name,width,height,display_aspect_ratio:format=duration',
+        '-of', 'json',
+        path,
+    ]
+    try:
+        return json.loads(subprocess.run(cmd, capture_output=True, check=True).stdout)
+    except (OSError, subprocess.CalledProcessError, ValueError) as e:
+        print(f"FFprobe error for {path}: {str(e)}")
+        return {}
+
+
+def aspect_ratio_of(probe):
+    """Return the display aspect ratio of a probed video stream.
+
+    Args:
+        probe (dict): The ffprobe output of the original file.
+
+    Returns:
+        str: The aspect ratio such as '16:9', or an empty string if unknown.
+    """
+    stream = (probe.get('streams') or [{}])[0]
+    ratio = stream.get('display_aspect_ratio', '')
+    if ratio and not ratio.startswith('0:'):
+        return ratio
+    width, height = stream.get('width'), stream.get('height')
+    if not width or not height:
+        return ''
+    divisor = math.gcd(width, height)
+    return f'{width // divisor}:{height // divisor}'
+
+
+def scan_rendition_dir(output_dir):
+    """Count the segments and total bytes of a rendition directory.
+
+    Args:
+        output_dir (str): The directory holding the playlist and segments.
+
+    Returns:
+        tuple: The number of .ts segments and the total size in bytes.
+    """
+    segment_count = 0
+    total_bytes = 0
+    with os.scandir(output_dir) as entries:
+        for entry in entries:
+            if entry.is_file():
+                total_bytes += entry.stat().st_size
+                segment_count += entry.name.endswith('.ts')
+    return segment_count, total_bytes
+
+
+def rendition_metadata(rendition, output_dir, playlist_path):
+    """Read the technical metadata of a finished rendition.
+
+    Args:
+        rendition (dict): The ladder entry that was transcoded.
+        output_dir (str): The directory holding the playlist and segments.
+        playlist_path (str): The path to the rendition's HLS playlist.
+
+    Returns:
+        dict: The Rendition field values.
+    """
+    probe = probe_media(playlist_path)
+    stream = (probe.get('streams') or [{}])[0]
+    segment_count, total_bytes = scan_rendition_dir(output_dir)
+    return {
+        'width': stream.get('width') or rendition['width'],
+        'height': stream.get('height') or rendition['height'],
+        'bitrate': rendition['bitrate'],
+        'codec': stream.get('codec_name', ''),
+        'segment_count': segment_count,
+        'total_bytes': total_bytes,
+        'duration': float(probe.get('format', {}).get('duration') or 0),
+        'tier': 'hot',
+    }
+
+
+def record_renditions(instance, finished):
+    """Store the inventory of a published HLS tree in one transaction.
+
+    A video with renditions counts as transcoded and may be reused by duplicates,
+    so the rows are only written once every rendition and the master playlist are
+    published, and all at once.
+
+    Args:
+        instance: The Video instance the renditions belong to.
+        finished (dict): Resolutions mapped to their Rendition field values.
+    """
+    with transaction.atomic():
+        for resolution, defaults in finished.items():
+            Rendition.objects.update_or_create(video=instance, resolution=resolution, defaults=defaults)
+
+
 def transcode_task(instance):
     """Transcode a video into HLS format for multiple resolutions.
 
+    The rendition inventory and the video's duration and aspect ratio are stored
+    on the models, so the API never has to inspect the filesystem. Originals are
+    hashed here, and finalized uploads moved to their content-addressed name, so
+    that videos whose original matches an already transcoded video reuse its
+    renditions instead.
+    The HLS tree is written in the video's layout to a local work directory and
+    published to the HLS storage once complete; only then are the renditions
+    recorded, so a video still transcoding is never reused as a duplicate source.
+
     Args:
         instance: The Video instance to transcode.
     """
+    ensure_original_hot(instance)
     input_path = instance.original_file.path
     if not os.path.exists(input_path):
         print(f"Error: Input file not found at {input_path}")
         return
+    if not instance.content_hash:
+        instance.content_hash = file_sha256(input_path)
+        Video.objects.filter(pk=instance.pk).update(content_hash=instance.content_hash)
+    if is_staged(instance):
+        store_content_addressed(instance)
+        input_path = instance.original_file.path
+    source = find_transcoded_duplicate(instance)
+    if source:
+        reuse_renditions(instance, source)
+        return
     print(f"Transcoding started for {input_path}")
-    base_dir = os.path.join(settings.MEDIA_ROOT, f'videos/{instance.id}')
-    os.makedirs(base_dir, exist_ok=True)
+    base_dir = work_dir(instance.id, instance.hls_layout)
     master_playlist = os.path.join(base_dir, 'master.m3u8')
     streams = []
+    finished = {}
 
-    for res in ['480p', '720p', '1080p']:
+    for rendition in RENDITIONS:
+        res = rendition['resolution']
         output_dir = os.path.join(base_dir, res)
         os.makedirs(output_dir, exist_ok=True)
-        segment_path = os.path.join(output_dir, '%03d.ts')
+        segment_path = os.path.join(output_dir, segment_pattern(instance.hls_layout))
         playlist_path = os.path.join(output_dir, 'index.m3u8')
 
         print(f"Transcoding to {res} at {playlist_path}")
@@ -44,19 +189,19 @@ def transcode_task(instance):
                 '-hls_time', '10',
                 '-hls_list_size', '0',
                 '-hls_segment_filename', segment_path,
-                '-b:v', '1000k' if res == '480p' else '2000k' if res == '720p' else '4000k',
-                '-s', '854x480' if res == '480p' else '1280x720' if res == '720p' else '1920x1080',
+                '-b:v', f"{rendition['bitrate']}k",
+                '-s', f"{rendition['width']}x{rendition['height']}",
                 '-y',  # Overwrite output files
                 playlist_path
             ]
-            subprocess.call(cmd)
+            if subprocess.call(cmd) != 0:
+                print(f"FFmpeg failed for {res}")
+                continue
             print(f"Transcoding complete for {res}")
+            finished[res] = rendition_metadata(rendition, output_dir, playlist_path)
             streams.append(
-                f'#EXT-X-STREAM-INF:BANDWIDTH=1000000,RESOLUTION=854x480\n{res}/index.m3u8'
-                if res == '480p' else
-                f'#EXT-X-STREAM-INF:BANDWIDTH=2000000,RESOLUTION=1280x720\n{res}/index.m3u8'
-                if res == '720p' else
-                f'#EXT-X-STREAM-INF:BANDWIDTH=4000000,RESOLUTION=1920x1080\n{res}/index.m3u8'
+                f"#EXT-X-STREAM-INF:BANDWIDTH={rendition['bitrate'] * 1000},"
+                f"RESOLUTION={rendition['width']}x{rendition['height']}\n{res}/index.m3u8"
             )
         except Exception as e:
             print(f"FFmpeg subprocess error for {res}: {str(e)}")
@@ -64,6 +209,13 @@ def transcode_task(instance):
     with open(master_playlist, 'w') as f:
         f.write('#EXTM3U\n#EXT-X-VERSION:3\n' + '\n'.join(streams))
     print(f"Master playlist created at {master_playlist}")
+    publish_tree(base_dir, video_prefix(instance.id, instance.hls_layout))
+    record_renditions(instance, finished)
+
+    probe = probe_media(input_path)
+    instance.duration = float(probe.get('format', {}).get('duration') or 0) or None
+    instance.aspect_ratio = aspect_ratio_of(probe)
+    instance.save(update_fields=['duration', 'aspect_ratio'])  # Also invalidates cached details
 
 
 @receiver(post_save, sender=Video)
@@ -78,5 +230,98 @@ def transcode_video(sender, instance, created, **kwargs):
     """
     if created:
         print(f"Signal fired for video ID: {instance.id}")
-        django_rq.enqueue(transcode_task, instance)  # Queue transcoding task
-        print(f"Task enqueued for video ID: {instance.id}")
\ No newline at end of file
+        source = find_transcoded_duplicate(instance)  # Only known here if the hash was set on creation
+        if source:
+            reuse_renditions(instance, source)
+            return
+        transaction.on_commit(lambda: django_rq.enqueue(transcode_task, instance))  # Queue once the row is visible
+        print(f"Task enqueued for video ID: {instance.id}")
+
+
+def adjust_category_count(category_id, delta):
+    """Atomically adjust the cached video count of a category.
+
+    Args:
+        category_id (int): The ID of the category to update.
+        delta (int): The amount to add to the count (negative to subtract).
+    """
+    Category.objects.filter(pk=category_id).update(video_count=F('video_count') + delta)
+    cache.delete('category_list')  # Category listing embeds the counts
+
+
+@receiver(pre_save, sender=Video)
+def remember_previous_category(sender, instance, **kwargs):
+    """Handle pre-save signal for Video model to remember the stored category.
+
+    Args:
+        sender: The model class that sent the signal (Video).
+        instance: The Video instance about to be saved.
+        **kwargs: Additional signal arguments.
+    """
+    instance._previous_category_id = None
+    if instance.pk:
+        instance._previous_category_id = (
+            Video.objects.filter(pk=instance.pk).values_list('category_id', flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Video)
+def update_video_caches_on_save(sender, instance, created, **kwargs):
+    """Handle post-save signal for Video model to keep cached details and category counts current.
+
+    Args:
+        sender: The model class that sent the signal (Video).
+        instance: The Video instance being saved.
+        created (bool): True if the instance was newly created.
+        **kwargs: Additional signal arguments.
+    """
+    previous_category_id = getattr(instance, '_previous_category_id', None)
+    invalidate_videos([instance.pk], [instance.category_id, previous_category_id])
+    if created:
+        adjust_category_count(instance.category_id, 1)
+    elif previous_category_id != instance.category_id:
+        adjust_category_count(previous_category_id, -1)
+        adjust_category_count(instance.category_id, 1)
+
+
+@receiver(post_delete, sender=Video)
+def update_video_caches_on_delete(sender, instance, **kwargs):
+    """Handle post-delete signal for Video model to drop cached details and decrement the category count.
+
+    Args:
+        sender: The model class that sent the signal (Video).
+        instance: The Video instance that was deleted.
+        **kwargs: Additional signal arguments.
+    """
+    invalidate_videos([instance.pk], [instance.category_id])
+    adjust_category_count(instance.category_id, -1)
+
+
+@receiver(post_delete, sender=Video)
+def delete_files_on_delete(sender, instance, **kwargs):
+    """Handle post-delete signal for Video model to queue deletion of its HLS tree and original.
+
+    Args:
+        sender: The model class that sent the signal (Video).
+        instance: The Video instance that was deleted.
+        **kwargs: Additional signal arguments.
+    """
+    video_id, original_name = instance.pk, instance.original_file.name
+    # After commit, so a rolled back delete keeps its files and shared originals are seen correctly
+    transaction.on_commit(lambda: django_rq.enqueue(delete_video_files, video_id, original_name))
+
+
+@receiver(post_save, sender=Category)
+def invalidate_category_videos(sender, instance, created, **kwargs):
+    """Handle post-save signal for Category model to drop cached details of its videos.
+
+    Args:
+        sender: The model class that sent the signal (Category).
+        instance: The Category instance being saved.
+        created (bool): True if the instance was newly created.
+        **kwargs: Additional signal arguments.
+    """
+    if not created:
+        # Serialized videos embed the category name, so a rename affects them all
+        invalidate_videos(instance.videos.values_list('id', flat=True), [instance.pk])
+    cache.delete('category_list')
@@ -0,0 +1,133 @@
+"""Storage of HLS output behind the Django Storage API.
+
+Transcoding output lives in the 'hls' entry of STORAGES, under names given by the
+versioned layout in `layout`. The local backend is a FileSystemStorage rooted
+at MEDIA_ROOT, where FFmpeg writes in place. With a remote backend such as S3,
+FFmpeg writes to a temporary directory and the tree is published in parallel
+batches, large files in multipart chunks. Playlists are always served through the
+app, so their relative segment URIs keep pointing at the API; segments of a remote
+backend are served as redirects to presigned URLs.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage, storages
+from django.http import FileResponse, Http404, HttpResponseRedirect
+from .layout import CURRENT_LAYOUT, video_prefix
+import os
+import posixpath
+import shutil
+import tempfile
+
+
+def hls_storage():
+    """Return the storage holding HLS playlists and segments."""
+    return storages['hls']
+
+
+def is_local(storage):
+    """Return whether a storage keeps files on the local filesystem."""
+    return isinstance(storage, FileSystemStorage)
+
+
+def work_dir(video_id, version=CURRENT_LAYOUT):
+    """Return the local directory FFmpeg writes a video's HLS tree to.
+
+    Args:
+        video_id (int): The ID of the video.
+        version (int): The layout version of the tree.
+
+    Returns:
+        str: The tree's final location for local storage, otherwise a new
+            temporary directory to be published with `publish_tree`.
+    """
+    storage = hls_storage()
+    if is_local(storage):
+        path = storage.path(video_prefix(video_id, version))
+        os.makedirs(path, exist_ok=True)
+        return path
+    return tempfile.mkdtemp(prefix=f'hls-{video_id}-')
+
+
+def upload_file(storage, local_path, name):
+    """Upload one file to a storage, replacing any existing file of that name."""
+    with open(local_path, 'rb') as f:
+        content = File(f, name=name)
+        content.content_type = 'application/vnd.apple.mpegurl' if name.endswith('.m3u8') else 'video/MP2T'
+        storage.save(name, content)
+
+
+def publish_tree(local_dir, prefix):
+    """Upload a local HLS tree to the HLS storage and remove the local copy.
+
+    Files are uploaded by HLS_UPLOAD_WORKERS threads; the storage backend splits
+    large files into multipart uploads. Nothing is done for local storage, where
+    the tree was written in place.
+
+    Args:
+        local_dir (str): The directory FFmpeg wrote to.
+        prefix (str): The storage name of the tree, e.g. 'hls/v2/c4/ca/1'.
+    """
+    storage = hls_storage()
+    if is_local(storage):
+        return
+    jobs = []
+    for root, _, files in os.walk(local_dir):
+        relative_root = os.path.relpath(root, local_dir)
+        for name in files:
+            target = posixpath.normpath(posixpath.join(prefix, relative_root.replace(os.sep, '/'), name))
+            jobs.append((os.path.join(root, name), target))
+    segments = [job for job in jobs if not job[1].endswith('.m3u8')]
+    playlists = [job for job in jobs if job[1].endswith('.m3u8')]
+    with ThreadPoolExecutor(max_workers=settings.HLS_UPLOAD_WORKERS) as pool:
+        for batch in (segments, playlists):  # Playlists last, once their segments exist
+            list(pool.map(lambda job: upload_file(storage, *job), batch))
+    shutil.rmtree(local_dir, ignore_errors=True)
+    print(f"Published {len(jobs)} files to {prefix}")
+
+
+def walk(storage, prefix):
+    """Yield the names of all files below a prefix of a storage."""
+    directories, files = storage.listdir(prefix)
+    for name in files:
+        yield posixpath.join(prefix, name)
+    for directory in directories:
+        yield from walk(storage, posixpath.join(prefix, directory))
+
+
+def copy_tree(source_prefix, target_prefix, storage=None):
+    """Copy a tree within a remote storage without downloading it.
+
+    Args:
+        source_prefix (str): The storage name of the tree to copy.
+        target_prefix (str): The storage name of the copy.
+        storage: The S3 storage holding the tree; defaults to the HLS storage.
+    """
+    storage = storage or hls_storage()
+    for name in walk(storage, source_prefix):
+        target = target_prefix + name[len(source_prefix):]
+        storage.bucket.copy({'Bucket': storage.bucket_name, 'Key': name}, target)  # Server-side copy
+
+
+def storage_response(storage, name, content_type, redirect=False):
+    """Serve a file from a storage.
+
+    Args:
+        storage: The storage holding the file.
+        name (str): The storage name of the file.
+        content_type (str): The content type of the response.
+        redirect (bool): Redirect to a presigned URL when the storage is remote.
+
+    Returns:
+        HttpResponse: A streaming file response, or a redirect.
+
+    Raises:
+        Http404: If the file does not exist.
+    """
+    if redirect and not is_local(storage):
+        return HttpResponseRedirect(storage.url(name))
+    try:
+        return FileResponse(storage.open(name, 'rb'), content_type=content_type)
+    except (FileNotFoundError, IsADirectoryError):
+        raise Http404
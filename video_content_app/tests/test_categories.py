@@ -0,0 +1,88 @@
+"""Unit tests for the category list API endpoint and category filtering.
+
+This module contains test cases to verify the category list view, the cached
+per-category video counts, filtering the video list by category, and
+unauthenticated access.
+"""
+
+from video_content_app.models import Category, Video
+from django.core.cache import cache
+from django.contrib.auth.models import User
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+class CategoryTestCase(APITestCase):
+    """Test case for the category list endpoint and category counts."""
+
+    def setUp(self):
+        """Set up test data with a user, JWT token, two categories and a video."""
+        self.user = User.objects.create_user(username='test@example.com', password='testpass123')
+        self.token = str(RefreshToken.for_user(self.user).access_token)  # Generate JWT access token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.token}')  # Set JWT header for authentication
+        self.drama = Category.objects.create(name='Drama')
+        self.comedy = Category.objects.create(name='Comedy')
+        self.video = Video.objects.create(
+            title='Test Video',
+            description='Test desc',
+            thumbnail='thumbnails/test.jpg',
+            category=self.drama,
+            original_file='videos/original/test.mp4'
+        )
+
+    def tearDown(self):
+        """Clear cache for consistent test state."""
+        cache.clear()
+
+    def test_category_list(self):
+        """Test successful category list retrieval with video counts."""
+        response = self.client.get('/api/categories/')
+        self.assertEqual(response.status_code, 200)
+        counts = {category['name']: category['video_count'] for category in response.data}
+        self.assertEqual(counts, {'Comedy': 0, 'Drama': 1})
+
+    def test_category_counts_follow_video_changes(self):
+        """Test that counts are updated when a video moves category or is deleted."""
+        self.client.get('/api/categories/')  # Populate cache before changing counts
+        self.video.category = self.comedy
+        self.video.save()
+        self.drama.refresh_from_db()
+        self.comedy.refresh_from_db()
+        self.assertEqual((self.drama.video_count, self.comedy.video_count), (0, 1))
+
+        self.video.delete()
+        self.comedy.refresh_from_db()
+        self.assertEqual(self.comedy.video_count, 0)
+        response = self.client.get('/api/categories/')
+        self.assertEqual([category['video_count'] for category in response.data], [0, 0])  # Verify cache was invalidated
+
+    def test_video_list_category_filter(self):
+        """Test filtering the video list by category ID and by category name."""
+        response = self.client.get('/api/video/', {'category': self.drama.id})
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual(response.data[0]['category'], 'Drama')
+        response = self.client.get('/api/video/', {'category': 'Comedy'})
+        self.assertEqual(len(response.data), 0)
+
+    def test_video_list_unknown_category_is_empty(self):
+        """Test that unknown categories, including ID 0 and empty values, filter to an empty list."""
+        for value in ['0', '999999', '', 'Unknown']:
+            response = self.client.get('/api/video/', {'category': value})
+            self.assertEqual(response.data, [], value)
+        self.assertIsNone(cache.get('video_list'))  # The unfiltered list was never built
+
+    def test_video_list_numeric_category_name(self):
+        """Test that a category with a numeric name can be filtered by name."""
+        nineties = Category.objects.create(name='1990')
+        Video.objects.create(
+            title='Retro', description='d', thumbnail='thumbnails/retro.jpg', category=nineties,
+            original_file='videos/original/retro.mp4',
+        )
+        response = self.client.get('/api/video/', {'category': '1990'})
+        self.assertEqual([video['title'] for video in response.data], ['Retro'])
+
+    def test_category_list_unauthenticated(self):
+        """Test category list access without authentication."""
+        self.client.credentials()  # Clear JWT header
+        response = self.client.get('/api/categories/')
+        self.assertEqual(response.status_code, 401)
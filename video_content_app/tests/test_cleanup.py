@@ -0,0 +1,162 @@
+"""Unit tests for garbage collection of media files.
+
+This module contains test cases to verify that deleting a video queues the removal
+of its files, that shared originals are kept, and that the periodic sweep removes
+orphaned HLS trees, segments, originals and partial uploads after the grace period,
+or only reports them in a dry run.
+"""
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection, connections, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from unittest import mock
+from video_content_app.cleanup import delete_video_files, sweep_media, sweep_media_job
+from video_content_app.dedupe import lock_originals, original_lock_key
+from video_content_app.layout import video_prefix
+from video_content_app.models import Category, Rendition, Upload, Video
+import io
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+
+@override_settings(MEDIA_SWEEP_MIN_AGE=3600)
+class MediaCleanupTestCase(TestCase):
+    """Test case for deleting the files of deleted videos and sweeping orphans."""
+
+    def setUp(self):
+        """Set up a temporary MEDIA_ROOT with a transcoded video."""
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+        self.category = Category.objects.create(name='Drama')
+        self.video = self.create_video('videos/original/live.mp4')
+        Rendition.objects.create(video=self.video, resolution='480p', width=854, height=480, bitrate=1000, segment_count=2)
+        for name in ['master.m3u8', '480p/index.m3u8', '480p/000.ts', '480p/001.ts']:
+            self.write(f'{video_prefix(self.video.id)}/{name}', b'x' * 10)
+
+    def tearDown(self):
+        """Remove the temporary MEDIA_ROOT."""
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root)
+
+    def create_video(self, original_name):
+        """Create a video without queueing a transcode and write its original."""
+        self.write(original_name, b'o' * 100)
+        with mock.patch('video_content_app.signals.django_rq.enqueue'):
+            return Video.objects.create(
+                title='Video', description='d', thumbnail='t.jpg', category=self.category, original_file=original_name
+            )
+
+    def write(self, name, data, age=7200):
+        """Write a file below the temporary MEDIA_ROOT, last modified `age` seconds ago."""
+        path = os.path.join(self.media_root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(data)
+        mtime = time.time() - age
+        os.utime(path, (mtime, mtime))
+        os.utime(os.path.dirname(path), (mtime, mtime))
+        return path
+
+    def exists(self, name):
+        """Return whether a file exists below the temporary MEDIA_ROOT."""
+        return os.path.exists(os.path.join(self.media_root, name))
+
+    def test_delete_queues_file_removal(self):
+        """Test that deleting a video queues the deletion of its files after commit."""
+        with mock.patch('video_content_app.signals.django_rq.enqueue') as enqueue:
+            with self.captureOnCommitCallbacks(execute=True):
+                video_id = self.video.id
+                self.video.delete()
+        enqueue.assert_called_once_with(delete_video_files, video_id, 'videos/original/live.mp4')
+
+    def test_delete_video_files_keeps_shared_originals(self):
+        """Test that an original still referenced by another video is kept."""
+        shared = self.create_video('videos/original/live.mp4')
+        video_id = self.video.id
+        self.video.delete()
+        self.assertEqual(delete_video_files(video_id, 'videos/original/live.mp4'), 40)
+        self.assertFalse(self.exists(video_prefix(video_id)))
+        self.assertTrue(self.exists('videos/original/live.mp4'))
+
+        shared_id = shared.id
+        shared.delete()
+        self.assertEqual(delete_video_files(shared_id, 'videos/original/live.mp4'), 100)
+        self.assertFalse(self.exists('videos/original/live.mp4'))
+
+    def test_delete_video_files_locks_the_original(self):
+        """Test that the reference check and the deletion run under the original's advisory lock."""
+        video_id = self.video.id
+        self.video.delete()
+        with CaptureQueriesContext(connection) as queries:
+            delete_video_files(video_id, 'videos/original/live.mp4')
+        statements = [query['sql'] for query in queries]
+        lock = next(i for i, sql in enumerate(statements) if 'pg_advisory_xact_lock' in sql)
+        self.assertIn(str(original_lock_key('videos/original/live.mp4')), statements[lock])
+        self.assertIn('original_file', statements[lock + 1])  # References are checked once the lock is held
+        self.assertFalse(self.exists('videos/original/live.mp4'))
+
+    def test_locked_original_blocks_other_connections(self):
+        """Test that a locked original cannot be locked from another connection until the transaction ends."""
+        acquired = []
+
+        def try_lock():
+            with connections['default'].cursor() as cursor:
+                cursor.execute('SELECT pg_try_advisory_xact_lock(%s)', [original_lock_key('videos/original/live.mp4')])
+                acquired.append(cursor.fetchone()[0])
+            connections['default'].close()
+
+        with transaction.atomic():
+            lock_originals('videos/original/live.mp4')
+            thread = threading.Thread(target=try_lock)
+            thread.start()
+            thread.join()
+        self.assertEqual(acquired, [False])
+
+    def test_sweep_job_reschedules_after_failure(self):
+        """Test that a failing sweep still schedules the next one."""
+        with mock.patch('video_content_app.cleanup.sweep_media', side_effect=OSError), \
+                mock.patch('video_content_app.cleanup.schedule_sweep') as schedule:
+            with self.assertRaises(OSError):
+                sweep_media_job()
+        schedule.assert_called_once_with()
+
+    def test_sweep_removes_orphans(self):
+        """Test that the sweep removes unreferenced trees, segments, originals and partial files."""
+        self.write('videos/9999/480p/000.ts', b'd' * 5)  # Tree of a deleted video
+        self.write(f'{video_prefix(self.video.id)}/480p/002.ts', b's' * 7)  # Beyond the segment count
+        self.write(f'{video_prefix(self.video.id)}/1080p/000.ts', b'r' * 11)  # Rendition not in the inventory
+        self.write('videos/original/ab/orphan.mp4', b'o' * 13)
+        self.write('uploads/00000000-0000-0000-0000-000000000000.part', b'p' * 17)
+        user = User.objects.create_user(username='admin@example.com', password='testpass123')
+        upload = Upload.objects.create(user=user, filename='a.mp4', size=1, title='t', description='d', category=self.category)
+        self.write(f'uploads/{upload.pk}.part', b'u')
+
+        self.assertEqual(sweep_media(dry_run=True), {'files': 5, 'bytes': 53})
+        self.assertTrue(self.exists('videos/9999/480p/000.ts'))
+
+        self.assertEqual(sweep_media(batch_size=1), {'files': 5, 'bytes': 53})
+        for name in ['videos/9999', f'{video_prefix(self.video.id)}/480p/002.ts', f'{video_prefix(self.video.id)}/1080p',
+                     'videos/original/ab/orphan.mp4', 'uploads/00000000-0000-0000-0000-000000000000.part']:
+            self.assertFalse(self.exists(name), name)
+        for name in [f'{video_prefix(self.video.id)}/480p/001.ts', 'videos/original/live.mp4', f'uploads/{upload.pk}.part']:
+            self.assertTrue(self.exists(name), name)
+
+    def test_sweep_skips_recent_files(self):
+        """Test that files modified within the grace period are left alone."""
+        self.write('videos/9999/480p/000.ts', b'd', age=10)
+        self.write('videos/original/fresh.mp4', b'f', age=10)
+        self.assertEqual(sweep_media(), {'files': 0, 'bytes': 0})
+
+    def test_command_reports_dry_run(self):
+        """Test that the management command reports the reclaimable bytes."""
+        self.write('videos/original/orphan.mp4', b'o' * 13)
+        out = io.StringIO()
+        call_command('sweep_media', '--dry-run', stdout=out)
+        self.assertIn('Would reclaim 13 bytes in 1 files.', out.getvalue())
+        self.assertTrue(self.exists('videos/original/orphan.mp4'))
@@ -0,0 +1,193 @@
+"""Unit tests for content-addressed deduplication of originals and renditions.
+
+This module contains test cases to verify that originals are hashed and stored
+under their hash by the transcode job, and that videos with the same content as an
+already transcoded video reuse its renditions through hardlinks instead of being
+transcoded again.
+"""
+
+from django.contrib.auth.models import User
+from django.conf import settings
+from django.test import override_settings
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+from unittest import mock
+from video_content_app.dedupe import content_addressed_name, reuse_renditions
+from video_content_app.layout import video_prefix
+from video_content_app.models import Category, Rendition, Video
+from video_content_app.signals import transcode_task
+from video_content_app.tiering import ensure_original_hot, freeze_original
+import hashlib
+import os
+import shutil
+import tempfile
+
+CONTENT = b'original video bytes' * 100
+CONTENT_HASH = hashlib.sha256(CONTENT).hexdigest()
+
+
+class DeduplicationTestCase(APITestCase):
+    """Test case for deduplicating identical originals and their HLS outputs."""
+
+    def setUp(self):
+        """Set up a transcoded video with an HLS tree in a temporary MEDIA_ROOT."""
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+        self.category = Category.objects.create(name='Drama')
+        name = content_addressed_name(CONTENT_HASH, 'movie.mp4')
+        self.write(name, CONTENT)
+        with mock.patch('video_content_app.signals.django_rq.enqueue'):
+            self.source = Video.objects.create(
+                title='Source', description='d', thumbnail='t.jpg', category=self.category,
+                original_file=name, content_hash=CONTENT_HASH, duration=12.5, aspect_ratio='16:9',
+            )
+        Rendition.objects.create(
+            video=self.source, resolution='480p', width=854, height=480, bitrate=1000, segment_count=2, total_bytes=6
+        )
+        self.write(f'{video_prefix(self.source.id)}/master.m3u8', b'#EXTM3U\n480p/index.m3u8')
+        self.write(f'{video_prefix(self.source.id)}/480p/000.ts', b'abc')
+        self.write(f'{video_prefix(self.source.id)}/480p/001.ts', b'def')
+
+    def tearDown(self):
+        """Remove the temporary MEDIA_ROOT."""
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root)
+
+    def write(self, name, data):
+        """Write a file below the temporary MEDIA_ROOT."""
+        path = os.path.join(self.media_root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(data)
+
+    def assert_reused(self, video):
+        """Assert that a video shares the source's renditions, segments and original."""
+        video.refresh_from_db()
+        self.assertEqual(list(video.renditions.values_list('resolution', 'segment_count')), [('480p', 2)])
+        self.assertEqual((video.duration, video.aspect_ratio), (12.5, '16:9'))
+        self.assertEqual(video.original_file.name, self.source.original_file.name)
+        for name in ['master.m3u8', '480p/000.ts', '480p/001.ts']:
+            source_stat = os.stat(os.path.join(self.media_root, f'{video_prefix(self.source.id)}/{name}'))
+            self.assertEqual(os.stat(os.path.join(self.media_root, f'{video_prefix(video.id)}/{name}')).st_ino, source_stat.st_ino)
+
+    def test_duplicate_upload_skips_transcoding(self):
+        """Test that finalizing an upload of known content reuses renditions without a transcode."""
+        admin = User.objects.create_user(username='admin@example.com', password='testpass123', is_staff=True)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(admin).access_token}')
+        url = self.client.post('/api/uploads/', {
+            'filename': 'copy.MP4', 'size': len(CONTENT), 'title': 'Copy', 'description': 'd', 'category': self.category.id,
+        }, format='json')['Location']
+        self.client.patch(url, CONTENT, content_type='application/offset+octet-stream', HTTP_UPLOAD_OFFSET='0')
+
+        with mock.patch('video_content_app.signals.django_rq.enqueue') as enqueue, \
+                self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(f'{url}finalize/')
+        self.assertEqual(response.status_code, 201)
+        (task, video), _ = enqueue.call_args  # Hashing and deduplication are left to the job
+        with mock.patch('video_content_app.signals.subprocess.call') as ffmpeg:
+            task(video)
+        ffmpeg.assert_not_called()
+        video = Video.objects.get(pk=response.data['video'])
+        self.assertEqual(video.content_hash, CONTENT_HASH)
+        self.assert_reused(video)
+        self.assertEqual(os.listdir(os.path.join(self.media_root, f'videos/original/{CONTENT_HASH[:2]}')), [f'{CONTENT_HASH}.mp4'])
+        self.assertEqual(os.listdir(os.path.join(self.media_root, 'videos/original/incoming')), [])
+
+    def test_finalized_upload_is_stored_under_its_hash(self):
+        """Test that the transcode job moves a new upload's original to its content-addressed name."""
+        with mock.patch('video_content_app.signals.django_rq.enqueue'):
+            video = Video.objects.create(
+                title='New', description='d', thumbnail='t.jpg', category=self.category,
+                original_file='videos/original/incoming/abc.mov',
+            )
+        self.write('videos/original/incoming/abc.mov', b'new content')
+        new_hash = hashlib.sha256(b'new content').hexdigest()
+        with mock.patch('video_content_app.signals.subprocess.call', return_value=1), \
+                mock.patch('video_content_app.signals.publish_tree'), \
+                mock.patch('video_content_app.signals.probe_media', return_value={}):
+            transcode_task(video)
+        video.refresh_from_db()
+        self.assertEqual(video.original_file.name, content_addressed_name(new_hash, 'abc.mov'))
+        with open(video.original_file.path, 'rb') as f:
+            self.assertEqual(f.read(), b'new content')
+
+    def test_transcode_task_reuses_renditions(self):
+        """Test that a duplicate saved without a hash is hashed and deduplicated by the transcode job."""
+        self.write('videos/original/admin_upload.mp4', CONTENT)
+        with mock.patch('video_content_app.signals.django_rq.enqueue'):
+            video = Video.objects.create(
+                title='Copy', description='d', thumbnail='t.jpg', category=self.category,
+                original_file='videos/original/admin_upload.mp4',
+            )
+        with mock.patch('video_content_app.signals.subprocess.call') as ffmpeg:
+            transcode_task(video)
+        ffmpeg.assert_not_called()
+        self.assertEqual(Video.objects.get(pk=video.pk).content_hash, CONTENT_HASH)
+        self.assert_reused(video)
+        self.assertFalse(os.path.exists(os.path.join(self.media_root, 'videos/original/admin_upload.mp4')))
+
+    def test_deleted_source_original_is_not_shared(self):
+        """Test that a duplicate keeps its own original if the source's was deleted meanwhile."""
+        self.write('videos/original/admin_upload.mp4', CONTENT)
+        with mock.patch('video_content_app.signals.django_rq.enqueue'):
+            video = Video.objects.create(
+                title='Copy', description='d', thumbnail='t.jpg', category=self.category,
+                original_file='videos/original/admin_upload.mp4',
+            )
+        os.remove(self.source.original_file.path)
+        reuse_renditions(video, self.source)
+        video.refresh_from_db()
+        self.assertEqual(video.original_file.name, 'videos/original/admin_upload.mp4')
+        self.assertTrue(os.path.exists(video.original_file.path))
+        self.assertEqual(video.renditions.count(), 1)
+
+    def test_cold_source_original_keeps_its_tier(self):
+        """Test that a duplicate sharing a cold original is marked cold, so a retranscode restores it."""
+        cold_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cold_root)
+        storages = {**settings.STORAGES, 'cold': {'BACKEND': 'django.core.files.storage.FileSystemStorage',
+                                                  'OPTIONS': {'location': cold_root}}}
+        with override_settings(STORAGES=storages):
+            freeze_original(self.source.original_file.name)
+            self.write('videos/original/admin_upload.mp4', CONTENT)
+            with mock.patch('video_content_app.signals.django_rq.enqueue'):
+                video = Video.objects.create(
+                    title='Copy', description='d', thumbnail='t.jpg', category=self.category,
+                    original_file='videos/original/admin_upload.mp4',
+                )
+            reuse_renditions(video, self.source)
+            video.refresh_from_db()
+            self.assertEqual((video.original_file.name, video.original_tier), (self.source.original_file.name, 'cold'))
+            ensure_original_hot(video)
+        self.assertTrue(os.path.exists(video.original_file.path))
+
+    def test_renditions_are_recorded_after_publishing(self):
+        """Test that a video only becomes a duplicate source once its HLS tree is published."""
+        self.write('videos/original/new.mp4', b'new content')
+        with mock.patch('video_content_app.signals.django_rq.enqueue'):
+            video = Video.objects.create(
+                title='New', description='d', thumbnail='t.jpg', category=self.category,
+                original_file='videos/original/new.mp4',
+            )
+        published = []
+
+        def publish(base_dir, prefix):
+            published.append(video.renditions.count())
+
+        with mock.patch('video_content_app.signals.subprocess.call', return_value=0), \
+                mock.patch('video_content_app.signals.publish_tree', side_effect=publish), \
+                mock.patch('video_content_app.signals.probe_media', return_value={}):
+            transcode_task(video)
+        self.assertEqual(published, [0])  # Nothing to reuse while the tree is not published
+        self.assertEqual(list(video.renditions.values_list('resolution', flat=True)), ['480p', '720p', '1080p'])
+
+    def test_new_content_is_transcoded(self):
+        """Test that videos with unknown content are still queued for transcoding."""
+        with mock.patch('video_content_app.signals.django_rq.enqueue') as enqueue, \
+                self.captureOnCommitCallbacks(execute=True):
+            Video.objects.create(
+                title='New', description='d', thumbnail='t.jpg', category=self.category,
+                original_file='videos/original/new.mp4', content_hash='0' * 64,
+            )
+        enqueue.assert_called_once()
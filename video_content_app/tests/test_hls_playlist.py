@@ -5,7 +5,8 @@ including successful playlist retrieval, unauthenticated access, and not found s
 """
 
 from django.conf import settings
-from video_content_app.models import Video
+from video_content_app.layout import video_prefix
+from video_content_app.models import Category, Rendition, Video
 from django.contrib.auth.models import User
 from django.test import override_settings
 from rest_framework.test import APITestCase
@@ -22,15 +23,19 @@ class HLSPlaylistTestCase(APITestCase):
         self.token = str(RefreshToken.for_user(self.user).access_token)  # Generate JWT access token
         self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.token}')  # Set JWT header for authentication
 
+        self.category = Category.objects.create(name='Drama')
         self.video = Video.objects.create(
             title='Test Video',
             description='Test desc',
             thumbnail='thumbnails/test.jpg',
-            category='Drama',
+            category=self.category,
             original_file='videos/original/test.mp4'
         )
         self.resolution = '480p'
-        self.playlist_path = os.path.join(settings.MEDIA_ROOT, f'videos/{self.video.id}/{self.resolution}/index.m3u8')
+        Rendition.objects.create(  # Register the rendition in the inventory
+            video=self.video, resolution=self.resolution, width=854, height=480, bitrate=1000, segment_count=1
+        )
+        self.playlist_path = os.path.join(settings.MEDIA_ROOT, f'{video_prefix(self.video.id)}/{self.resolution}/index.m3u8')
         os.makedirs(os.path.dirname(self.playlist_path), exist_ok=True)  # Create directory for mock playlist
         with open(self.playlist_path, 'w') as f:
             f.write('#EXTM3U\n#EXT-X-VERSION:3\n')  # Write mock HLS playlist content
@@ -59,4 +64,11 @@ class HLSPlaylistTestCase(APITestCase):
 
         url = f'/api/video/{self.video.id}/invalid/index.m3u8'  # Invalid resolution
         response = self.client.get(url)
+        self.assertEqual(response.status_code, 404)
+
+    def test_hls_playlist_rendition_not_in_inventory(self):
+        """Test that a playlist on disk is not served unless its rendition is recorded."""
+        Rendition.objects.filter(video=self.video).delete()
+        url = f'/api/video/{self.video.id}/{self.resolution}/index.m3u8'
+        response = self.client.get(url)
         self.assertEqual(response.status_code, 404)
\ No newline at end of file
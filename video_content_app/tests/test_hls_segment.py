@@ -5,7 +5,8 @@ including successful segment retrieval, unauthenticated access, and not found sc
 """
 
 from django.conf import settings
-from video_content_app.models import Video
+from video_content_app.layout import video_prefix
+from video_content_app.models import Category, Rendition, Video
 from django.contrib.auth.models import User
 from rest_framework.test import APITestCase
 from rest_framework_simplejwt.tokens import RefreshToken
@@ -21,16 +22,20 @@ class HLSSegmentTestCase(APITestCase):
         self.token = str(RefreshToken.for_user(self.user).access_token)  # Generate JWT access token
         self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.token}')  # Set JWT header for authentication
 
+        self.category = Category.objects.create(name='Drama')
         self.video = Video.objects.create(
             title='Test Video',
             description='Test desc',
             thumbnail='thumbnails/test.jpg',
-            category='Drama',
+            category=self.category,
             original_file='videos/original/test.mp4'
         )
         self.resolution = '480p'
+        Rendition.objects.create(  # Register the rendition in the inventory
+            video=self.video, resolution=self.resolution, width=854, height=480, bitrate=1000, segment_count=1
+        )
         self.segment = '000.ts'
-        self.segment_path = os.path.join(settings.MEDIA_ROOT, f'videos/{self.video.id}/{self.resolution}/{self.segment}')
+        self.segment_path = os.path.join(settings.MEDIA_ROOT, f'{video_prefix(self.video.id)}/{self.resolution}/{self.segment}')
         os.makedirs(os.path.dirname(self.segment_path), exist_ok=True)  # Create directory for mock segment
         with open(self.segment_path, 'wb') as f:
             f.write(b'\x00\x01\x02')  # Write mock binary segment content
@@ -63,4 +68,8 @@ class HLSSegmentTestCase(APITestCase):
 
         url = f'/api/video/{self.video.id}/{self.resolution}/invalid.ts/'  # Invalid segment
         response = self.client.get(url)
+        self.assertEqual(response.status_code, 404)
+
+        url = f'/api/video/{self.video.id}/{self.resolution}/001.ts/'  # Segment number beyond the inventory
+        response = self.client.get(url)
         self.assertEqual(response.status_code, 404)
\ No newline at end of file
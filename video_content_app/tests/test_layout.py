@@ -0,0 +1,106 @@
+"""Unit tests for the versioned on-disk layout of HLS trees.
+
+This module contains test cases to verify the sharded storage names and segment
+numbering, that videos in the flat layout keep being served, that the
+`migrate_hls_layout` command moves their trees without copying data, and that the
+sweep finds orphaned trees in every layout.
+"""
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+from unittest import mock
+from video_content_app.cleanup import sweep_media
+from video_content_app.layout import FLAT, SHARDED, segment_pattern, shard, video_prefix
+from video_content_app.models import Category, Rendition, Video
+import io
+import os
+import shutil
+import tempfile
+import time
+
+
+class LayoutNamesTestCase(SimpleTestCase):
+    """Test case for the storage names of each layout."""
+
+    def test_names(self):
+        """Test the storage names and segment patterns of both layouts."""
+        self.assertEqual(video_prefix(42, FLAT), 'videos/42')
+        self.assertEqual(video_prefix(42, SHARDED), f'hls/v2/{shard(42)}/42')
+        self.assertRegex(shard(42), r'^[0-9a-f]{2}/[0-9a-f]{2}$')
+        self.assertEqual(segment_pattern(FLAT), '%03d.ts')
+        self.assertEqual(segment_pattern(), '%06d.ts')
+
+    def test_consecutive_ids_spread_over_shards(self):
+        """Test that consecutive IDs land in many different shards."""
+        self.assertGreater(len({shard(video_id)[:2] for video_id in range(1, 1001)}), 200)
+
+
+@override_settings(MEDIA_SWEEP_MIN_AGE=0)
+class LayoutMigrationTestCase(APITestCase):
+    """Test case for serving and migrating trees of the flat layout."""
+
+    def setUp(self):
+        """Set up a temporary MEDIA_ROOT with a video in the flat layout."""
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+        user = User.objects.create_user(username='test@example.com', password='testpass123')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}')
+        with mock.patch('video_content_app.signals.django_rq.enqueue'):
+            self.video = Video.objects.create(
+                title='Old', description='d', thumbnail='t.jpg', category=Category.objects.create(name='Drama'),
+                original_file='videos/original/old.mp4', hls_layout=FLAT,
+            )
+        Rendition.objects.create(video=self.video, resolution='480p', width=854, height=480, bitrate=1000, segment_count=1)
+        self.old_prefix = video_prefix(self.video.id, FLAT)
+        self.write(f'{self.old_prefix}/master.m3u8', b'#EXTM3U\n480p/index.m3u8')
+        self.write(f'{self.old_prefix}/480p/index.m3u8', b'#EXTM3U\n000.ts')
+        self.write(f'{self.old_prefix}/480p/000.ts', b'seg0')
+
+    def tearDown(self):
+        """Remove the temporary MEDIA_ROOT."""
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root)
+
+    def write(self, name, data):
+        """Write a file below the temporary MEDIA_ROOT."""
+        path = os.path.join(self.media_root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def test_flat_layout_still_served(self):
+        """Test that playlists and segments of a video in the flat layout are found."""
+        response = self.client.get(f'/api/video/{self.video.id}/480p/index.m3u8')
+        self.assertEqual(b''.join(response.streaming_content), b'#EXTM3U\n000.ts')
+        response = self.client.get(f'/api/video/{self.video.id}/480p/000.ts/')
+        self.assertEqual(b''.join(response.streaming_content), b'seg0')
+
+    def test_migrate_moves_tree(self):
+        """Test that the command relinks the tree into the sharded layout and switches the video."""
+        inode = os.stat(os.path.join(self.media_root, f'{self.old_prefix}/480p/000.ts')).st_ino
+        out = io.StringIO()
+        call_command('migrate_hls_layout', '--dry-run', stdout=out)
+        self.assertIn('Would move 1 videos to layout 2.', out.getvalue())
+
+        call_command('migrate_hls_layout', stdout=out)
+        self.assertIn('Moved 1 videos to layout 2.', out.getvalue())
+        self.assertEqual(Video.objects.get(pk=self.video.pk).hls_layout, SHARDED)
+        new_segment = os.path.join(self.media_root, f'{video_prefix(self.video.id)}/480p/000.ts')
+        self.assertEqual(os.stat(new_segment).st_ino, inode)  # Linked, not copied
+        self.assertFalse(os.path.exists(os.path.join(self.media_root, self.old_prefix)))
+        response = self.client.get(f'/api/video/{self.video.id}/480p/000.ts/')
+        self.assertEqual(b''.join(response.streaming_content), b'seg0')
+
+    def test_sweep_covers_all_layouts(self):
+        """Test that trees of deleted videos are swept in both layouts, and live ones kept."""
+        self.write(f'{video_prefix(9998, FLAT)}/480p/000.ts', b'a' * 3)
+        self.write(f'{video_prefix(9999)}/480p/000.ts', b'b' * 5)
+        time.sleep(0.01)  # Past the zero-second grace period
+        self.assertEqual(sweep_media(), {'files': 2, 'bytes': 8})
+        self.assertFalse(os.path.exists(os.path.join(self.media_root, video_prefix(9999))))
+        self.assertTrue(os.path.exists(os.path.join(self.media_root, f'{self.old_prefix}/480p/000.ts')))
@@ -0,0 +1,99 @@
+"""Unit tests for playback session tokens.
+
+This module contains test cases to verify that playback tokens are minted for
+existing videos, authenticate HLS segment requests without a JWT, and are
+rejected when forged, expired or presented for another video.
+"""
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+from video_content_app.layout import video_prefix
+from video_content_app.models import Category, Rendition, Video
+from video_content_app.playback import mint_playback_token
+from urllib.parse import urlencode
+import os
+
+
+class PlaybackTokenTestCase(APITestCase):
+    """Test case for the playback token endpoint and authentication."""
+
+    def setUp(self):
+        """Set up a user, a video with one segment on disk and a JWT for minting."""
+        self.user = User.objects.create_user(username='test@example.com', password='testpass123')
+        self.token = str(RefreshToken.for_user(self.user).access_token)
+        category = Category.objects.create(name='Drama')
+        self.video = Video.objects.create(
+            title='Test Video',
+            description='Test desc',
+            thumbnail='thumbnails/test.jpg',
+            category=category,
+            original_file='videos/original/test.mp4'
+        )
+        Rendition.objects.create(video=self.video, resolution='480p', width=854, height=480, bitrate=1000, segment_count=1)
+        segment_path = os.path.join(settings.MEDIA_ROOT, f'{video_prefix(self.video.id)}/480p/000.ts')
+        os.makedirs(os.path.dirname(segment_path), exist_ok=True)
+        with open(segment_path, 'wb') as f:
+            f.write(b'\x00\x01\x02')
+        self.segment_url = f'/api/video/{self.video.id}/480p/000.ts/'
+
+    def test_mint_sets_scoped_cookie(self):
+        """Test that minting returns a token and sets a cookie scoped to the video."""
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.token}')
+        response = self.client.post(f'/api/video/{self.video.id}/playback/')
+        self.assertEqual(response.status_code, 200)
+        cookie = response.cookies['playback_token']
+        self.assertEqual(cookie.value, response.data['token'])
+        self.assertEqual(cookie['path'], f'/api/video/{self.video.id}/')
+        self.assertTrue(cookie['httponly'])
+
+    def test_mint_requires_authentication_and_video(self):
+        """Test that minting needs a JWT and an existing video."""
+        self.assertEqual(self.client.post(f'/api/video/{self.video.id}/playback/').status_code, 401)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.token}')
+        self.assertEqual(self.client.post('/api/video/9999/playback/').status_code, 404)
+
+    def test_segment_with_playback_token_only(self):
+        """Test that a segment is served with the playback cookie and no auth queries."""
+        self.client.cookies['playback_token'], _ = mint_playback_token(self.user.id, self.video.id)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.segment_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), b'\x00\x01\x02')
+        self.assertFalse([query for query in queries if 'auth_user' in query['sql']])
+
+    def test_segment_with_query_parameter(self):
+        """Test that players without cookies can pass the token as a query parameter."""
+        token, _ = mint_playback_token(self.user.id, self.video.id)
+        response = self.client.get(self.segment_url, {'playback_token': token})
+        self.assertEqual(response.status_code, 200)
+
+    def test_playlist_passes_query_token_to_segments(self):
+        """Test that a playlist requested with a query token carries it in its segment URIs."""
+        playlist_path = os.path.join(settings.MEDIA_ROOT, f'{video_prefix(self.video.id)}/480p/index.m3u8')
+        with open(playlist_path, 'w') as f:
+            f.write('#EXTM3U\n#EXTINF:10.0,\n000.ts\n#EXT-X-ENDLIST\n')
+        self.addCleanup(os.remove, playlist_path)
+        token, _ = mint_playback_token(self.user.id, self.video.id)
+        response = self.client.get(f'/api/video/{self.video.id}/480p/index.m3u8', {'playback_token': token})
+        self.assertEqual(response.status_code, 200)
+        segment_uri = response.content.decode().splitlines()[2]
+        self.assertEqual(segment_uri, f'000.ts?{urlencode({"playback_token": token})}')
+        self.assertEqual(self.client.get(f'/api/video/{self.video.id}/480p/{segment_uri}', follow=True).status_code, 200)
+
+        self.client.cookies['playback_token'] = token  # Players with cookies get the file as stored
+        response = self.client.get(f'/api/video/{self.video.id}/480p/index.m3u8')
+        self.assertEqual(b''.join(response.streaming_content), b'#EXTM3U\n#EXTINF:10.0,\n000.ts\n#EXT-X-ENDLIST\n')
+
+    def test_rejected_tokens(self):
+        """Test that tokens for other videos, expired or tampered tokens are rejected."""
+        other_video, _ = mint_playback_token(self.user.id, self.video.id + 1)
+        expired, _ = mint_playback_token(self.user.id, self.video.id, lifetime=-1)
+        valid, _ = mint_playback_token(self.user.id, self.video.id)
+        tampered = valid.replace(f'{self.user.id}.{self.video.id}.', f'{self.user.id + 1}.{self.video.id}.', 1)
+        for token in [other_video, expired, tampered, 'garbage']:
+            self.client.cookies['playback_token'] = token
+            self.assertEqual(self.client.get(self.segment_url).status_code, 401, token)
@@ -0,0 +1,133 @@
+"""Unit tests for the pluggable HLS storage.
+
+This module contains test cases to verify that transcoding output is published to
+an S3-compatible storage, emulated in process by moto, that playlists are served
+through the API while segments redirect to presigned URLs, that identical videos
+are copied server-side, and that media files cannot escape the media storage.
+"""
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import override_settings
+from moto import mock_aws
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+from unittest import mock
+from video_content_app.dedupe import reuse_renditions
+from video_content_app.layout import video_prefix
+from video_content_app.models import Category, Rendition, Video
+from video_content_app.storage import hls_storage, publish_tree, work_dir
+import boto3
+import os
+
+BUCKET = 'videoflix-hls-test'
+S3_STORAGES = {
+    **settings.STORAGES,
+    'hls': {
+        'BACKEND': 'storages.backends.s3.S3Storage',
+        'OPTIONS': {
+            'bucket_name': BUCKET,
+            'access_key': 'testing',
+            'secret_key': 'testing',
+            'region_name': 'us-east-1',
+            'signature_version': 's3v4',
+            'querystring_auth': True,
+            'querystring_expire': 60,
+            'file_overwrite': True,
+        },
+    },
+}
+
+
+@override_settings(STORAGES=S3_STORAGES, HLS_UPLOAD_WORKERS=4)
+class S3StorageTestCase(APITestCase):
+    """Test case for publishing and serving HLS output from an S3 bucket."""
+
+    def setUp(self):
+        """Start the S3 emulation with an empty bucket and set up a video with a rendition."""
+        self.aws = mock_aws()
+        self.aws.start()
+        self.s3 = boto3.client('s3', region_name='us-east-1', aws_access_key_id='testing', aws_secret_access_key='testing')
+        self.s3.create_bucket(Bucket=BUCKET)
+        user = User.objects.create_user(username='test@example.com', password='testpass123')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}')
+        self.category = Category.objects.create(name='Drama')
+        with mock.patch('video_content_app.signals.django_rq.enqueue'):
+            self.video = Video.objects.create(
+                title='Test Video', description='d', thumbnail='t.jpg', category=self.category,
+                original_file='videos/original/test.mp4',
+            )
+        Rendition.objects.create(video=self.video, resolution='480p', width=854, height=480, bitrate=1000, segment_count=2)
+
+    def tearDown(self):
+        """Stop the S3 emulation."""
+        self.aws.stop()
+
+    def publish(self, video_id):
+        """Write a small HLS tree to a work directory and publish it."""
+        base_dir = work_dir(video_id)
+        os.makedirs(os.path.join(base_dir, '480p'))
+        files = {'master.m3u8': b'#EXTM3U\n480p/index.m3u8', '480p/index.m3u8': b'#EXTM3U\n000.ts\n001.ts'}
+        files.update({'480p/000.ts': b'seg0', '480p/001.ts': b'seg1'})
+        for name, data in files.items():
+            with open(os.path.join(base_dir, name), 'wb') as f:
+                f.write(data)
+        publish_tree(base_dir, video_prefix(video_id))
+        self.assertFalse(os.path.exists(base_dir))  # The temporary copy is removed
+
+    def test_publish_tree_uploads_with_content_types(self):
+        """Test that a published tree lands in the bucket with HLS content types."""
+        self.publish(self.video.id)
+        keys = {obj['Key'] for obj in self.s3.list_objects_v2(Bucket=BUCKET)['Contents']}
+        prefix = video_prefix(self.video.id)
+        self.assertEqual(keys, {f'{prefix}/master.m3u8', f'{prefix}/480p/index.m3u8', f'{prefix}/480p/000.ts', f'{prefix}/480p/001.ts'})
+        head = self.s3.head_object(Bucket=BUCKET, Key=f'{prefix}/480p/000.ts')
+        self.assertEqual(head['ContentType'], 'video/MP2T')
+
+    def test_playlist_proxied_and_segment_redirected(self):
+        """Test that playlists are served by the API and segments redirect to presigned URLs."""
+        self.publish(self.video.id)
+        response = self.client.get(f'/api/video/{self.video.id}/480p/index.m3u8')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), b'#EXTM3U\n000.ts\n001.ts')
+
+        response = self.client.get(f'/api/video/{self.video.id}/480p/001.ts/')
+        self.assertEqual(response.status_code, 302)
+        self.assertIn(f'/{video_prefix(self.video.id)}/480p/001.ts', response['Location'])
+        self.assertIn('X-Amz-Signature=', response['Location'])
+
+    def test_duplicates_copied_server_side(self):
+        """Test that reusing renditions copies the tree within the bucket."""
+        self.publish(self.video.id)
+        with mock.patch('video_content_app.signals.django_rq.enqueue'):
+            copy = Video.objects.create(
+                title='Copy', description='d', thumbnail='t.jpg', category=self.category,
+                original_file='videos/original/test.mp4',
+            )
+        reuse_renditions(copy, self.video)
+        body = self.s3.get_object(Bucket=BUCKET, Key=f'{video_prefix(copy.id)}/480p/001.ts')['Body'].read()
+        self.assertEqual(body, b'seg1')
+        self.assertTrue(hls_storage().exists(f'{video_prefix(copy.id)}/master.m3u8'))
+
+
+class MediaStorageTestCase(APITestCase):
+    """Test case for serving media files through the default storage."""
+
+    def test_path_traversal_is_rejected(self):
+        """Test that paths outside the media storage are not served."""
+        self.assertEqual(self.client.get('/api/media/../core/settings.py').status_code, 404)
+        self.assertEqual(self.client.get('/api/media/%2E%2E/manage.py').status_code, 404)
+        self.assertEqual(self.client.get('/api/media/thumbnails/missing.jpg').status_code, 404)
+
+    def test_only_thumbnails_are_served(self):
+        """Test that originals and partial uploads in the media storage are not served."""
+        default_storage.save('thumbnails/public.jpg', ContentFile(b'jpg'))
+        default_storage.save('videos/original/private.mp4', ContentFile(b'mp4'))
+        self.addCleanup(default_storage.delete, 'thumbnails/public.jpg')
+        self.addCleanup(default_storage.delete, 'videos/original/private.mp4')
+        self.assertEqual(self.client.get('/api/media/thumbnails/public.jpg').status_code, 200)
+        self.assertEqual(self.client.get('/api/media/videos/original/private.mp4').status_code, 404)
+        self.assertEqual(self.client.get('/api/media/thumbnails/../videos/original/private.mp4').status_code, 404)
+        self.assertEqual(self.client.get('/api/media/uploads/1.part').status_code, 404)
@@ -0,0 +1,188 @@
+"""Unit tests for tiered storage of originals and renditions.
+
+This module contains test cases to verify that idle originals and renditions move
+to the cold storage while the lowest rendition and popular videos stay hot, that
+requests for cold renditions queue a restore and fall back to a hot rendition,
+that failed and lost restores are queued again, and that the report shows the hot-tier bytes saved.
+"""
+
+from datetime import timedelta
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+from unittest import mock
+from video_content_app import tiering
+from video_content_app.layout import video_prefix
+from video_content_app.models import Category, Rendition, Video
+from video_content_app.tiering import (
+    ensure_original_hot, request_restore, restore_rendition, tier_media, tier_media_job, tiering_report,
+)
+import os
+import shutil
+import tempfile
+
+
+@override_settings(TIERING_RENDITION_IDLE_DAYS=30, TIERING_ORIGINAL_IDLE_DAYS=7, TIERING_HOT_PLAY_COUNT=100)
+class TieringTestCase(APITestCase):
+    """Test case for the tiering policy, restores and fallbacks."""
+
+    def setUp(self):
+        """Set up temporary hot and cold roots and an idle video with three renditions."""
+        cache.clear()
+        tiering._last_touch.clear()
+        self.media_root = tempfile.mkdtemp()
+        self.cold_root = tempfile.mkdtemp()
+        storages = {**settings.STORAGES, 'cold': {'BACKEND': 'django.core.files.storage.FileSystemStorage',
+                                                  'OPTIONS': {'location': self.cold_root}}}
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root, STORAGES=storages)
+        self.settings_override.enable()
+        user = User.objects.create_user(username='test@example.com', password='testpass123')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}')
+
+        self.write('videos/original/movie.mp4', b'o' * 1000)
+        with mock.patch('video_content_app.signals.django_rq.enqueue'):
+            self.video = Video.objects.create(
+                title='Idle', description='d', thumbnail='t.jpg', category=Category.objects.create(name='Drama'),
+                original_file='videos/original/movie.mp4',
+            )
+        Video.objects.filter(pk=self.video.pk).update(created_at=timezone.now() - timedelta(days=60))
+        for resolution, height, size in [('480p', 480, 10), ('720p', 720, 20), ('1080p', 1080, 40)]:
+            Rendition.objects.create(
+                video=self.video, resolution=resolution, width=height * 16 // 9, height=height,
+                bitrate=height, segment_count=1, total_bytes=size,
+            )
+            self.write(f'{video_prefix(self.video.id)}/{resolution}/index.m3u8', b'#EXTM3U\n000.ts')
+            self.write(f'{video_prefix(self.video.id)}/{resolution}/000.ts', b's' * (size - 14))
+
+    def tearDown(self):
+        """Remove the temporary roots."""
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root)
+        shutil.rmtree(self.cold_root)
+        cache.clear()
+
+    def write(self, name, data):
+        """Write a file below the temporary MEDIA_ROOT."""
+        path = os.path.join(self.media_root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(data)
+
+    def tiers(self):
+        """Return the tier of each rendition of the video."""
+        return dict(self.video.renditions.values_list('resolution', 'tier'))
+
+    def test_idle_media_moves_to_cold(self):
+        """Test that idle originals and all but the lowest rendition move to cold storage."""
+        stats = tier_media()
+        self.assertEqual(stats, {'renditions': 2, 'originals': 1, 'bytes': 1060})
+        self.assertEqual(self.tiers(), {'480p': 'hot', '720p': 'cold', '1080p': 'cold'})
+        self.assertEqual(Video.objects.get(pk=self.video.pk).original_tier, 'cold')
+        self.assertTrue(os.path.exists(os.path.join(self.cold_root, f'{video_prefix(self.video.id)}/1080p/000.ts')))
+        self.assertFalse(os.path.exists(os.path.join(self.media_root, f'{video_prefix(self.video.id)}/1080p')))
+        self.assertTrue(os.path.exists(os.path.join(self.cold_root, 'videos/original/movie.mp4')))
+        self.assertEqual(tiering_report()['hot_bytes_saved'], 1060)
+
+    def test_dry_run_moves_nothing(self):
+        """Test that a dry run only reports the candidates."""
+        self.assertEqual(tier_media(dry_run=True)['bytes'], 1060)
+        self.assertEqual(set(self.tiers().values()), {'hot'})
+
+    def test_watched_and_popular_media_stays_hot(self):
+        """Test that recently played renditions and popular videos stay hot."""
+        Rendition.objects.filter(video=self.video, resolution='720p').update(last_played_at=timezone.now())
+        Video.objects.filter(pk=self.video.pk).update(last_played_at=timezone.now())
+        tier_media()
+        self.assertEqual(self.tiers(), {'480p': 'hot', '720p': 'hot', '1080p': 'cold'})
+        self.assertEqual(Video.objects.get(pk=self.video.pk).original_tier, 'hot')
+
+        Rendition.objects.filter(video=self.video).update(tier='hot')
+        Video.objects.filter(pk=self.video.pk).update(play_count=100)
+        self.assertEqual(tier_media(dry_run=True)['renditions'], 0)
+
+    def test_cold_playlist_falls_back_and_restores(self):
+        """Test that a cold rendition's playlist redirects to a hot one and queues a restore."""
+        tier_media()
+        rendition = self.video.renditions.get(resolution='1080p')
+        with mock.patch('video_content_app.tiering.django_rq.enqueue') as enqueue:
+            response = self.client.get(f'/api/video/{self.video.id}/1080p/index.m3u8', {'playback_token': 'abc'})
+            self.client.get(f'/api/video/{self.video.id}/1080p/index.m3u8')
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response['Location'], f'/api/video/{self.video.id}/480p/index.m3u8?playback_token=abc')
+        enqueue.assert_called_once_with(restore_rendition, rendition.id)  # Queued once
+        self.assertEqual(self.tiers()['1080p'], 'restoring')
+
+        restore_rendition(rendition.id)
+        self.assertEqual(self.tiers()['1080p'], 'hot')
+        response = self.client.get(f'/api/video/{self.video.id}/1080p/index.m3u8')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), b'#EXTM3U\n000.ts')
+
+    def test_failed_restore_returns_to_cold(self):
+        """Test that a failed restore resets the rendition so the next request queues it again."""
+        tier_media()
+        rendition = self.video.renditions.get(resolution='1080p')
+        with mock.patch('video_content_app.tiering.django_rq.enqueue') as enqueue:
+            request_restore(rendition.id)
+            with mock.patch('video_content_app.tiering.move_file', side_effect=OSError):
+                with self.assertRaises(OSError):
+                    restore_rendition(rendition.id)
+            self.assertEqual(self.tiers()['1080p'], 'cold')
+            request_restore(rendition.id)
+        self.assertEqual(enqueue.call_count, 2)
+        restore_rendition(rendition.id)
+        self.assertEqual(self.tiers()['1080p'], 'hot')
+
+    @override_settings(TIERING_RESTORE_TIMEOUT=600)
+    def test_stale_restore_is_queued_again(self):
+        """Test that a restore pending past the timeout is queued again and reset by the tiering job."""
+        tier_media()
+        rendition = self.video.renditions.get(resolution='1080p')
+        with mock.patch('video_content_app.tiering.django_rq.enqueue') as enqueue:
+            request_restore(rendition.id)
+            request_restore(rendition.id)
+            self.assertEqual(enqueue.call_count, 1)  # Still underway
+            Rendition.objects.filter(pk=rendition.id).update(restore_started_at=timezone.now() - timedelta(seconds=601))
+            request_restore(rendition.id)
+            self.assertEqual(enqueue.call_count, 2)
+
+        Rendition.objects.filter(pk=rendition.id).update(restore_started_at=timezone.now() - timedelta(seconds=601))
+        tier_media()
+        self.assertEqual(self.tiers()['1080p'], 'cold')
+
+    def test_tiering_job_reschedules_after_failure(self):
+        """Test that a failing tiering run still schedules the next one."""
+        with mock.patch('video_content_app.tiering.tier_media', side_effect=OSError), \
+                mock.patch('video_content_app.tiering.schedule_tiering') as schedule:
+            with self.assertRaises(OSError):
+                tier_media_job()
+        schedule.assert_called_once_with()
+
+    def test_cold_segment_asks_to_retry(self):
+        """Test that segments of a cold rendition answer 503 with Retry-After."""
+        tier_media()
+        with mock.patch('video_content_app.tiering.django_rq.enqueue'):
+            response = self.client.get(f'/api/video/{self.video.id}/720p/000.ts/')
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '30')
+
+    def test_original_restored_before_transcode(self):
+        """Test that a cold original is moved back before it is read."""
+        tier_media()
+        video = Video.objects.get(pk=self.video.pk)
+        ensure_original_hot(video)
+        self.assertEqual(Video.objects.get(pk=self.video.pk).original_tier, 'hot')
+        self.assertTrue(os.path.exists(video.original_file.path))
+
+    def test_plays_and_playlist_requests_are_recorded(self):
+        """Test that minting a playback token counts a play and playlists record the last access."""
+        self.client.post(f'/api/video/{self.video.id}/playback/')
+        video = Video.objects.get(pk=self.video.pk)
+        self.assertEqual(video.play_count, 1)
+        self.assertIsNotNone(video.last_played_at)
+        self.client.get(f'/api/video/{self.video.id}/720p/index.m3u8')
+        self.assertIsNotNone(self.video.renditions.get(resolution='720p').last_played_at)
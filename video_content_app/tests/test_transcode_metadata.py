@@ -0,0 +1,33 @@
+"""Unit tests for the transcoding metadata helpers.
+
+This module contains test cases to verify how the aspect ratio is derived from
+ffprobe output and how rendition directories are inventoried.
+"""
+
+from django.test import SimpleTestCase
+from video_content_app.signals import aspect_ratio_of, scan_rendition_dir
+import os
+import tempfile
+
+
+class TranscodeMetadataTestCase(SimpleTestCase):
+    """Test case for the metadata helpers used by transcode_task."""
+
+    def test_aspect_ratio_from_probe(self):
+        """Test that the display aspect ratio is used when ffprobe reports one."""
+        probe = {'streams': [{'width': 1920, 'height': 1080, 'display_aspect_ratio': '16:9'}]}
+        self.assertEqual(aspect_ratio_of(probe), '16:9')
+
+    def test_aspect_ratio_from_dimensions(self):
+        """Test that the aspect ratio falls back to the reduced frame dimensions."""
+        probe = {'streams': [{'width': 1440, 'height': 1080, 'display_aspect_ratio': '0:1'}]}
+        self.assertEqual(aspect_ratio_of(probe), '4:3')
+        self.assertEqual(aspect_ratio_of({}), '')
+
+    def test_scan_rendition_dir(self):
+        """Test that segments are counted and all file sizes are summed."""
+        with tempfile.TemporaryDirectory() as output_dir:
+            for name, size in [('000.ts', 100), ('001.ts', 50), ('index.m3u8', 10)]:
+                with open(os.path.join(output_dir, name), 'wb') as f:
+                    f.write(b'\x00' * size)
+            self.assertEqual(scan_rendition_dir(output_dir), (2, 160))
@@ -0,0 +1,168 @@
+"""Unit tests for resumable uploads of original video files.
+
+This module contains test cases to verify that uploads are created for staff,
+receive chunks at matching offsets, verify chunk checksums, keep the bytes
+received before a disconnect, refuse concurrent requests for the same upload, and
+become a transcoded video when finalized, also after a failed first attempt.
+"""
+
+from django.contrib.auth.models import User
+from django.test import override_settings
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+from unittest import mock
+from video_content_app.models import Category, Upload, Video
+from video_content_app.uploads import UploadClaim, partial_path, write_chunk
+import base64
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+
+CONTENT = bytes(range(256)) * 40  # 10240 bytes
+
+
+class UploadTestCase(APITestCase):
+    """Test case for the resumable upload endpoints."""
+
+    def setUp(self):
+        """Set up a staff user, a category and a temporary MEDIA_ROOT."""
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root, UPLOAD_READ_SIZE=1000)
+        self.settings_override.enable()
+        self.user = User.objects.create_user(username='admin@example.com', password='testpass123', is_staff=True)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+        self.category = Category.objects.create(name='Drama')
+
+    def tearDown(self):
+        """Remove the temporary MEDIA_ROOT."""
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root)
+
+    def create_upload(self, size=len(CONTENT)):
+        """Create an upload through the API and return its URL."""
+        response = self.client.post('/api/uploads/', {
+            'filename': 'movie file.mp4',
+            'size': size,
+            'title': 'Uploaded',
+            'description': 'Uploaded in chunks',
+            'category': self.category.id,
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        return response['Location']
+
+    def send_chunk(self, url, offset, data, **headers):
+        """Send one chunk of the upload at an offset."""
+        return self.client.patch(
+            url, data, content_type='application/offset+octet-stream', HTTP_UPLOAD_OFFSET=str(offset), **headers
+        )
+
+    def test_create_requires_staff(self):
+        """Test that only staff users can create uploads."""
+        user = User.objects.create_user(username='test@example.com', password='testpass123')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}')
+        response = self.client.post('/api/uploads/', {'filename': 'a.mp4', 'size': 1}, format='json')
+        self.assertEqual(response.status_code, 403)
+
+    @override_settings(UPLOAD_MAX_SIZE=1000)
+    def test_create_rejects_oversized_upload(self):
+        """Test that uploads larger than UPLOAD_MAX_SIZE are refused."""
+        response = self.client.post('/api/uploads/', {
+            'filename': 'a.mp4', 'size': 1001, 'title': 't', 'description': 'd', 'category': self.category.id,
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('size', response.data)
+
+    def test_chunks_and_finalize(self):
+        """Test that chunks are appended in order and finalizing queues transcoding."""
+        url = self.create_upload()
+        response = self.send_chunk(url, 0, CONTENT[:4000])
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(response['Upload-Offset'], '4000')
+        self.assertEqual(self.client.head(url)['Upload-Offset'], '4000')
+        self.assertEqual(self.send_chunk(url, 4000, CONTENT[4000:]).status_code, 204)
+
+        with mock.patch('video_content_app.signals.django_rq.enqueue') as enqueue, \
+                self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(f'{url}finalize/')
+        self.assertEqual(response.status_code, 201)
+        video = Video.objects.get(pk=response.data['video'])
+        self.assertEqual(video.title, 'Uploaded')
+        self.assertEqual(video.category, self.category)
+        self.assertEqual(video.content_hash, '')  # Hashed by the transcode job, not the request
+        with open(video.original_file.path, 'rb') as f:
+            self.assertEqual(f.read(), CONTENT)
+        enqueue.assert_called_once()
+        self.assertEqual(self.client.post(f'{url}finalize/').data['video'], video.id)  # Idempotent
+
+    def test_offset_mismatch_and_incomplete_finalize(self):
+        """Test that chunks at the wrong offset and finalizing incomplete uploads conflict."""
+        url = self.create_upload()
+        self.send_chunk(url, 0, CONTENT[:1000])
+        response = self.send_chunk(url, 0, CONTENT[:1000])
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response['Upload-Offset'], '1000')
+        self.assertEqual(self.client.post(f'{url}finalize/').status_code, 409)
+        self.assertEqual(self.send_chunk(url, 1000, CONTENT).status_code, 413)  # Past the announced size
+
+    def test_checksum_mismatch_discards_chunk(self):
+        """Test that a chunk failing its checksum is discarded and a matching one is kept."""
+        url = self.create_upload()
+        chunk = CONTENT[:2500]
+        wrong = 'sha256 ' + base64.b64encode(hashlib.sha256(b'other').digest()).decode()
+        response = self.send_chunk(url, 0, chunk, HTTP_UPLOAD_CHECKSUM=wrong)
+        self.assertEqual(response.status_code, 460)
+        self.assertEqual(Upload.objects.get().offset, 0)
+        self.assertEqual(os.path.getsize(partial_path(Upload.objects.get())), 0)
+
+        right = 'sha256 ' + base64.b64encode(hashlib.sha256(chunk).digest()).decode()
+        self.assertEqual(self.send_chunk(url, 0, chunk, HTTP_UPLOAD_CHECKSUM=right).status_code, 204)
+        self.assertEqual(self.send_chunk(url, 2500, b'x', HTTP_UPLOAD_CHECKSUM='crc32 AAAA').status_code, 400)
+
+    def test_disconnect_keeps_received_bytes(self):
+        """Test that bytes received before a disconnect count toward the offset."""
+        self.create_upload()
+        upload = Upload.objects.get()
+        self.assertEqual(write_chunk(upload, io.BytesIO(CONTENT[:3000]), 8000), 3000)
+        upload.offset = 3000
+        self.assertEqual(write_chunk(upload, io.BytesIO(CONTENT[3000:]), len(CONTENT) - 3000), len(CONTENT))
+        with open(partial_path(upload), 'rb') as f:
+            self.assertEqual(f.read(), CONTENT)
+
+    def test_claimed_upload_is_locked(self):
+        """Test that requests for an upload another request holds answer 423 and succeed afterwards."""
+        url = self.create_upload()
+        upload = Upload.objects.get()
+        with UploadClaim(upload.pk):
+            self.assertEqual(self.send_chunk(url, 0, CONTENT[:1000]).status_code, 423)
+            self.assertEqual(self.client.delete(url).status_code, 423)
+        self.assertEqual(self.send_chunk(url, 0, CONTENT[:1000]).status_code, 204)
+        self.assertEqual(Upload.objects.get().offset, 1000)
+
+    def test_failed_finalize_can_be_retried(self):
+        """Test that a finalize whose video cannot be created keeps the upload intact for a retry."""
+        url = self.create_upload()
+        self.send_chunk(url, 0, CONTENT)
+        with mock.patch('video_content_app.uploads.Video.objects.create', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self.client.post(f'{url}finalize/')
+        self.assertTrue(os.path.exists(partial_path(Upload.objects.get())))
+        with mock.patch('video_content_app.signals.django_rq.enqueue'):
+            response = self.client.post(f'{url}finalize/')
+        self.assertEqual(response.status_code, 201)
+        with open(Video.objects.get(pk=response.data['video']).original_file.path, 'rb') as f:
+            self.assertEqual(f.read(), CONTENT)
+
+    def test_abort_and_ownership(self):
+        """Test that uploads are private to their creator and can be aborted."""
+        url = self.create_upload()
+        other = User.objects.create_user(username='other@example.com', password='testpass123', is_staff=True)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(other).access_token}')
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+        path = partial_path(Upload.objects.get())
+        self.assertEqual(self.client.delete(url).status_code, 204)
+        self.assertFalse(Upload.objects.exists())
+        self.assertFalse(os.path.exists(path))
@@ -0,0 +1,105 @@
+"""Unit tests for the video detail and batch API endpoints.
+
+This module contains test cases to verify single and batch video retrieval, the
+shared per-video cache, its invalidation on updates, and unauthenticated access.
+"""
+
+from video_content_app.models import Category, Rendition, Video
+from video_content_app.video_cache import video_cache_key
+from django.core.cache import cache
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+class VideoDetailTestCase(APITestCase):
+    """Test case for the video detail and batch endpoints."""
+
+    def setUp(self):
+        """Set up test data with a user, JWT token, and two videos."""
+        self.user = User.objects.create_user(username='test@example.com', password='testpass123')
+        self.token = str(RefreshToken.for_user(self.user).access_token)  # Generate JWT access token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.token}')  # Set JWT header for authentication
+        self.category = Category.objects.create(name='Drama')
+        self.first = self.create_video('First Video')
+        self.second = self.create_video('Second Video')
+
+    def tearDown(self):
+        """Clear cache for consistent test state."""
+        cache.clear()
+
+    def create_video(self, title):
+        """Create a video with the given title."""
+        return Video.objects.create(
+            title=title,
+            description='Test desc',
+            thumbnail='thumbnails/test.jpg',
+            category=self.category,
+            original_file='videos/original/test.mp4'
+        )
+
+    def test_video_detail(self):
+        """Test successful retrieval of a single video, which populates its cache entry."""
+        response = self.client.get(f'/api/video/{self.first.id}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['title'], 'First Video')
+        self.assertEqual(cache.get(video_cache_key(self.first.id))['title'], 'First Video')
+
+    def test_video_detail_includes_renditions(self):
+        """Test that the rendition inventory is exposed with the video details."""
+        Rendition.objects.create(
+            video=self.first, resolution='720p', width=1280, height=720, bitrate=2000,
+            codec='h264', segment_count=12, total_bytes=4096, duration=118.5
+        )
+        self.first.duration = 118.5
+        self.first.aspect_ratio = '16:9'
+        self.first.save()  # Invalidates any cached details
+        response = self.client.get(f'/api/video/{self.first.id}/')
+        self.assertEqual(response.data['duration'], 118.5)
+        self.assertEqual(response.data['aspect_ratio'], '16:9')
+        self.assertEqual(response.data['renditions'][0]['resolution'], '720p')
+        self.assertEqual(response.data['renditions'][0]['segment_count'], 12)
+
+    def test_video_detail_not_found(self):
+        """Test video detail access for a non-existent video."""
+        response = self.client.get('/api/video/9999/')
+        self.assertEqual(response.status_code, 404)
+
+    def test_video_batch(self):
+        """Test batch retrieval keeps request order and skips unknown IDs."""
+        data = {'ids': [self.second.id, 9999, self.first.id, self.second.id]}
+        response = self.client.post('/api/video/batch/', data, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([video['id'] for video in response.data], [self.second.id, self.first.id])
+
+    def test_video_batch_served_from_cache(self):
+        """Test that a warm batch request does not query videos from the database."""
+        data = {'ids': [self.first.id, self.second.id]}
+        self.client.post('/api/video/batch/', data, format='json')  # Warm the per-video cache
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post('/api/video/batch/', data, format='json')
+        self.assertEqual(len(response.data), 2)
+        self.assertFalse([query for query in queries if 'video_content_app_video' in query['sql']])
+
+    def test_video_update_invalidates_only_its_entry(self):
+        """Test that updating a video drops its own cache entry and keeps the others."""
+        self.client.post('/api/video/batch/', {'ids': [self.first.id, self.second.id]}, format='json')
+        self.first.title = 'Renamed Video'
+        self.first.save()
+        self.assertIsNone(cache.get(video_cache_key(self.first.id)))
+        self.assertIsNotNone(cache.get(video_cache_key(self.second.id)))
+        response = self.client.get(f'/api/video/{self.first.id}/')
+        self.assertEqual(response.data['title'], 'Renamed Video')
+
+    def test_video_batch_invalid_payload(self):
+        """Test batch failure with a missing or empty ID list."""
+        response = self.client.post('/api/video/batch/', {'ids': []}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_video_batch_unauthenticated(self):
+        """Test batch access without authentication."""
+        self.client.credentials()  # Clear JWT header
+        response = self.client.post('/api/video/batch/', {'ids': [self.first.id]}, format='json')
+        self.assertEqual(response.status_code, 401)
@@ -4,7 +4,7 @@ This module contains test cases to verify the behavior of the video list view,
 including authenticated access, unauthenticated access, caching, and cookie-based JWT authentication.
 """
 
-from video_content_app.models import Video
+from video_content_app.models import Category, Video
 from django.core.cache import cache
 from django.contrib.auth.models import User
 from rest_framework.test import APITestCase
@@ -19,11 +19,12 @@ class VideoListTestCase(APITestCase):
         self.user = User.objects.create_user(username='test@example.com', password='testpass123')
         self.token = str(RefreshToken.for_user(self.user).access_token)  # Generate JWT access token
         self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.token}')  # Set JWT header for authentication
+        self.category = Category.objects.create(name='Drama')
         self.video = Video.objects.create(
             title='Test Video',
             description='Test desc',
             thumbnail='thumbnails/test.jpg',
-            category='Drama',
+            category=self.category,
             original_file='videos/original/test.mp4'
         )
 
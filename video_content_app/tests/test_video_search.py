@@ -0,0 +1,69 @@
+"""Unit tests for the video search API endpoint.
+
+This module contains test cases to verify the behavior of the video search view,
+including relevance ranking, typo-tolerant fallback, pagination, missing queries
+and unauthenticated access.
+"""
+
+from video_content_app.models import Category, Video
+from django.contrib.auth.models import User
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+class VideoSearchTestCase(APITestCase):
+    """Test case for the video search endpoint."""
+
+    def setUp(self):
+        """Set up test data with a user, JWT token, and videos to search."""
+        self.user = User.objects.create_user(username='test@example.com', password='testpass123')
+        self.token = str(RefreshToken.for_user(self.user).access_token)  # Generate JWT access token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.token}')  # Set JWT header for authentication
+        self.category = Category.objects.create(name='Drama')
+        self.title_match = self.create_video('Ocean Adventure', 'A journey across the sea')
+        self.description_match = self.create_video('Deep Blue', 'An ocean documentary')
+        self.create_video('Mountain Story', 'Climbing the highest peaks')
+
+    def create_video(self, title, description):
+        """Create a video with the given title and description."""
+        return Video.objects.create(
+            title=title,
+            description=description,
+            thumbnail='thumbnails/test.jpg',
+            category=self.category,
+            original_file='videos/original/test.mp4'
+        )
+
+    def test_video_search_ranks_title_above_description(self):
+        """Test that a title match is ranked above a description match."""
+        response = self.client.get('/api/video/search/', {'q': 'ocean'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 2)
+        ids = [video['id'] for video in response.data['results']]
+        self.assertEqual(ids, [self.title_match.id, self.description_match.id])
+        self.assertIn('thumbnail_url', response.data['results'][0])  # Verify VideoSerializer shape
+
+    def test_video_search_typo_fallback(self):
+        """Test that a misspelled query falls back to trigram title similarity."""
+        response = self.client.get('/api/video/search/', {'q': 'Ocaen Adventur'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['results'][0]['id'], self.title_match.id)
+
+    def test_video_search_pagination(self):
+        """Test that search results are paginated."""
+        response = self.client.get('/api/video/search/', {'q': 'ocean', 'page_size': 1})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 2)
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertIsNotNone(response.data['next'])
+
+    def test_video_search_missing_query(self):
+        """Test search failure when no query is given."""
+        response = self.client.get('/api/video/search/')
+        self.assertEqual(response.status_code, 400)
+
+    def test_video_search_unauthenticated(self):
+        """Test video search access without authentication."""
+        self.client.credentials()  # Clear JWT header
+        response = self.client.get('/api/video/search/', {'q': 'ocean'})
+        self.assertEqual(response.status_code, 401)
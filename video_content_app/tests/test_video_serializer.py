@@ -0,0 +1,40 @@
+"""Unit tests for the VideoSerializer fast path.
+
+This module contains test cases to verify that the hand-written representation of
+VideoSerializer matches the generic ModelSerializer output of its declared fields.
+"""
+
+from video_content_app.api.serializers import GenericVideoSerializer, VideoSerializer
+from video_content_app.models import Category, Rendition, Video
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory
+
+
+class VideoSerializerTestCase(TestCase):
+    """Test case for the VideoSerializer fast path."""
+
+    def setUp(self):
+        """Set up test data with a video with renditions and one without a thumbnail."""
+        category = Category.objects.create(name='Drama')
+        self.video = Video.objects.create(
+            title='Test Video',
+            description='Test desc',
+            thumbnail='thumbnails/café poster.jpg',
+            category=category,
+            original_file='videos/original/test.mp4',
+            duration=61.5,
+            aspect_ratio='16:9',
+        )
+        Rendition.objects.create(video=self.video, resolution='480p', width=854, height=480, bitrate=1000, codec='h264')
+        Video.objects.create(title='No Thumbnail', description='', thumbnail='', category=category, original_file='x.mp4')
+        self.request = APIRequestFactory().get('/api/video/')
+
+    def test_fast_path_matches_generic_output(self):
+        """Test that the fast path yields exactly the generic serializer output."""
+        videos = Video.objects.select_related('category').prefetch_related('renditions').order_by('id')
+        context = {'request': self.request}
+        fast = VideoSerializer(videos, many=True, context=context).data
+        generic = GenericVideoSerializer(videos, many=True, context=context).data
+        self.assertEqual(fast, generic)
+        self.assertEqual(fast[0]['thumbnail_url'], 'http://testserver/api/media/thumbnails/caf%C3%A9%20poster.jpg')
+        self.assertIsNone(fast[1]['thumbnail_url'])
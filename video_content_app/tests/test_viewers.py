@@ -0,0 +1,146 @@
+"""Unit tests for active viewer tracking and concurrent stream limits.
+
+This module contains test cases to verify that playback token minting and
+JWT-authenticated HLS requests enforce the per-account stream cap, that a client
+minting a replacement token keeps its slot, that HLS requests record throttled
+heartbeats, and that staff can read the current viewers per video.
+"""
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import override_settings
+from django_redis import get_redis_connection
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+from unittest import mock
+from video_content_app import viewers
+from video_content_app.layout import video_prefix
+from video_content_app.models import Category, Rendition, Video
+import os
+
+
+@override_settings(MAX_CONCURRENT_STREAMS=2, VIEWER_HEARTBEAT_INTERVAL=30, VIEWER_TIMEOUT=90)
+class ActiveViewersTestCase(APITestCase):
+    """Test case for viewer heartbeats, stream caps and viewer counts."""
+
+    def setUp(self):
+        """Set up a user, a video with one segment on disk and empty viewer state."""
+        cache.clear()
+        viewers._last_heartbeat.clear()
+        self.user = User.objects.create_user(username='test@example.com', password='testpass123')
+        self.token = str(RefreshToken.for_user(self.user).access_token)
+        category = Category.objects.create(name='Drama')
+        self.video = Video.objects.create(
+            title='Test Video',
+            description='Test desc',
+            thumbnail='thumbnails/test.jpg',
+            category=category,
+            original_file='videos/original/test.mp4'
+        )
+        Rendition.objects.create(video=self.video, resolution='480p', width=854, height=480, bitrate=1000, segment_count=1)
+        segment_path = os.path.join(settings.MEDIA_ROOT, f'{video_prefix(self.video.id)}/480p/000.ts')
+        os.makedirs(os.path.dirname(segment_path), exist_ok=True)
+        with open(segment_path, 'wb') as f:
+            f.write(b'\x00\x01\x02')
+        self.segment_url = f'/api/video/{self.video.id}/480p/000.ts/'
+
+    def tearDown(self):
+        """Remove the viewer state from Redis."""
+        cache.clear()
+
+    def mint(self, new_client=True):
+        """Mint a playback token for the test video through the API, by default from a client without a token."""
+        if new_client:
+            self.client.cookies.pop('playback_token', None)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.token}')
+        return self.client.post(f'/api/video/{self.video.id}/playback/')
+
+    def other_video(self, title):
+        """Create another video with one rendition and return its segment URL."""
+        video = Video.objects.create(
+            title=title, description='d', thumbnail='t.jpg', category=self.video.category, original_file='o.mp4'
+        )
+        Rendition.objects.create(video=video, resolution='480p', width=854, height=480, bitrate=1000, segment_count=1)
+        segment_path = os.path.join(settings.MEDIA_ROOT, f'{video_prefix(video.id)}/480p/000.ts')
+        os.makedirs(os.path.dirname(segment_path), exist_ok=True)
+        with open(segment_path, 'wb') as f:
+            f.write(b'\x00')
+        return f'/api/video/{video.id}/480p/000.ts/'
+
+    def test_stream_cap_per_account(self):
+        """Test that minting beyond the concurrent stream cap is refused."""
+        self.assertEqual(self.mint().status_code, 200)
+        self.assertEqual(self.mint().status_code, 200)
+        response = self.mint()
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.data['detail'], 'Concurrent stream limit reached.')
+
+    def test_replacement_token_keeps_the_slot(self):
+        """Test that a reloaded player minting again keeps its playback session and slot."""
+        session = self.mint().data['session']
+        for _ in range(4):
+            response = self.mint(new_client=False)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data['session'], session)
+        self.assertEqual(get_redis_connection('default').zcard(viewers.user_streams_key(self.user.id)), 1)
+        self.assertEqual(self.mint().status_code, 200)  # A second client still gets the other slot
+
+    def test_jwt_streams_are_capped(self):
+        """Test that HLS requests with a plain JWT count against the stream cap."""
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.token}')
+        urls = [self.segment_url, self.other_video('Second'), self.other_video('Third')]
+        self.assertEqual([self.client.get(url).status_code for url in urls], [200, 200, 403])
+        self.assertEqual(self.client.get(urls[0]).status_code, 200)  # Running streams keep playing
+        self.assertEqual(self.mint().status_code, 403)
+
+    def test_stopped_streams_free_their_slot(self):
+        """Test that streams without a heartbeat within the timeout no longer count."""
+        self.mint()
+        self.mint()
+        with mock.patch('video_content_app.viewers.time.time', return_value=viewers.time.time() + 91):
+            self.assertEqual(self.mint().status_code, 200)
+
+    @override_settings(MAX_CONCURRENT_STREAMS=0)
+    def test_zero_cap_is_unlimited(self):
+        """Test that a cap of 0 disables the stream limit."""
+        for _ in range(5):
+            self.assertEqual(self.mint().status_code, 200)
+
+    def test_heartbeat_is_throttled(self):
+        """Test that segment requests write a heartbeat at most once per interval."""
+        session = self.mint().data['session']
+        redis = get_redis_connection('default')
+        key = viewers.user_streams_key(self.user.id)
+        member = f'{self.video.id}:{session}'
+        first = redis.zscore(key, member)
+        self.assertEqual(self.client.get(self.segment_url).status_code, 200)
+        self.assertEqual(redis.zscore(key, member), first)  # Within the interval of the mint
+
+        with mock.patch('video_content_app.viewers.time.monotonic', return_value=viewers.time.monotonic() + 31):
+            self.client.get(self.segment_url)
+        self.assertGreater(redis.zscore(key, member), first)
+
+    def test_jwt_requests_are_tracked(self):
+        """Test that HLS requests without a playback token count as a web viewer."""
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.token}')
+        self.client.get(self.segment_url)
+        self.assertEqual(viewers.current_viewers(), {self.video.id: 1})
+
+    def test_viewers_endpoint(self):
+        """Test that staff can read the current viewers per video, most watched first."""
+        other = Video.objects.create(
+            title='Other', description='d', thumbnail='t.jpg', category=self.video.category, original_file='o.mp4'
+        )
+        viewers.claim_stream(self.user.id, self.video.id, 'a')
+        viewers.claim_stream(self.user.id, other.id, 'b')
+        viewers.claim_stream(self.user.id + 1, other.id, 'c')
+
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.token}')
+        self.assertEqual(self.client.get('/api/video/viewers/').status_code, 403)
+
+        admin = User.objects.create_user(username='admin@example.com', password='testpass123', is_staff=True)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(admin).access_token}')
+        response = self.client.get('/api/video/viewers/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), [{'video': other.id, 'viewers': 2}, {'video': self.video.id, 'viewers': 1}])
@@ -0,0 +1,292 @@
+"""Access-driven tiering of originals and renditions between hot and cold storage.
+
+Playback sessions count plays per video, and playlist requests record when each
+rendition was last watched, at most once per TIERING_TOUCH_INTERVAL per process.
+A periodic job moves originals of transcoded videos idle for
+TIERING_ORIGINAL_IDLE_DAYS, and renditions idle for TIERING_RENDITION_IDLE_DAYS,
+to the 'cold' entry of STORAGES. The lowest rendition of a video and all renditions
+of videos with at least TIERING_HOT_PLAY_COUNT plays stay hot. Requests for a cold
+rendition queue its restore and are redirected to the best hot rendition below it
+in the meantime; a transcode restores a cold original before reading it. A failed
+restore puts the rendition back to 'cold', and a restore still pending after
+TIERING_RESTORE_TIMEOUT, e.g. because its worker died, is queued again.
+"""
+
+from datetime import timedelta
+from django.conf import settings
+from django.core.files.storage import default_storage, storages
+from django.db.models import F, Min, Q
+from django.utils import timezone
+from .models import Rendition, Video
+from .layout import rendition_prefix
+from .storage import hls_storage, is_local, walk
+import django_rq
+import os
+import shutil
+import time
+
+TIERING_JOB_ID = 'tier_media'  # Fixed job ID so only one tiering job is scheduled
+LOCAL_MAX_ENTRIES = 10000  # Bound on the per-process playlist touch throttle
+
+_last_touch = {}  # Rendition ID -> monotonic time of the last recorded playlist request
+
+
+def cold_storage():
+    """Return the storage holding cold originals and renditions."""
+    return storages['cold']
+
+
+def record_play(video_id):
+    """Count the start of a playback session of a video."""
+    Video.objects.filter(pk=video_id).update(play_count=F('play_count') + 1, last_played_at=timezone.now())
+
+
+def touch_rendition(rendition_id):
+    """Record that a rendition was watched, at most once per TIERING_TOUCH_INTERVAL per process."""
+    now = time.monotonic()
+    if now - _last_touch.get(rendition_id, float('-inf')) < settings.TIERING_TOUCH_INTERVAL:
+        return
+    if len(_last_touch) >= LOCAL_MAX_ENTRIES:
+        _last_touch.clear()
+    _last_touch[rendition_id] = now
+    Rendition.objects.filter(pk=rendition_id).update(last_played_at=timezone.now())
+
+
+def move_file(source, target, name):
+    """Move one file between storages, keeping its name.
+
+    Args:
+        source: The storage holding the file.
+        target: The storage to move it to.
+        name (str): The storage name of the file.
+
+    Returns:
+        int: The size of the file in bytes.
+    """
+    if is_local(source) and is_local(target):
+        path = target.path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        size = os.path.getsize(source.path(name))
+        shutil.move(source.path(name), path)  # A rename when both are on one filesystem
+        return size
+    size = source.size(name)
+    with source.open(name, 'rb') as f:
+        if target.exists(name):
+            target.delete(name)
+        target.save(name, f)
+    source.delete(name)
+    return size
+
+
+def move_tree(source, target, prefix):
+    """Move every file below a prefix between storages.
+
+    Args:
+        source: The storage holding the tree.
+        target: The storage to move it to.
+        prefix (str): The storage name of the tree.
+
+    Returns:
+        int: The number of bytes moved.
+    """
+    if is_local(source) and not os.path.isdir(source.path(prefix)):
+        return 0
+    moved = sum(move_file(source, target, name) for name in list(walk(source, prefix)))
+    if is_local(source):
+        shutil.rmtree(source.path(prefix), ignore_errors=True)
+    return moved
+
+
+def tree_of(rendition):
+    """Return the storage name of a rendition's directory in its video's layout."""
+    return rendition_prefix(rendition.video_id, rendition.resolution, rendition.video.hls_layout)
+
+
+def freeze_rendition(rendition):
+    """Move a rendition's playlist and segments to the cold storage."""
+    move_tree(hls_storage(), cold_storage(), tree_of(rendition))
+    Rendition.objects.filter(pk=rendition.pk).update(tier='cold')
+
+
+def freeze_original(name):
+    """Move an original to the cold storage for every video sharing it."""
+    move_file(default_storage, cold_storage(), name)
+    Video.objects.filter(original_file=name).update(original_tier='cold')
+
+
+def restore_rendition(rendition_id):
+    """Move a cold rendition back to the serving storage.
+
+    Args:
+        rendition_id (int): The ID of the rendition.
+    """
+    rendition = Rendition.objects.filter(pk=rendition_id).select_related('video').first()
+    if rendition is None or rendition.tier == 'hot':
+        return
+    try:
+        moved = move_tree(cold_storage(), hls_storage(), tree_of(rendition))
+    except Exception:
+        # Files moved so far are served once the next restore moves the rest
+        Rendition.objects.filter(pk=rendition_id, tier='restoring').update(tier='cold', restore_started_at=None)
+        raise
+    Rendition.objects.filter(pk=rendition_id).update(tier='hot', last_played_at=timezone.now(), restore_started_at=None)
+    print(f"Restored rendition {rendition} ({moved} bytes)")
+
+
+def stale_restores():
+    """Return the renditions whose restore was queued more than TIERING_RESTORE_TIMEOUT ago."""
+    cutoff = timezone.now() - timedelta(seconds=settings.TIERING_RESTORE_TIMEOUT)
+    return Rendition.objects.filter(tier='restoring').filter(
+        Q(restore_started_at__lt=cutoff) | Q(restore_started_at__isnull=True)
+    )
+
+
+def request_restore(rendition_id):
+    """Queue the restore of a cold rendition unless one is already underway.
+
+    A restore that has been pending for longer than TIERING_RESTORE_TIMEOUT is
+    considered lost and queued again.
+    """
+    pending = Rendition.objects.filter(pk=rendition_id, tier='cold') | stale_restores().filter(pk=rendition_id)
+    if pending.update(tier='restoring', restore_started_at=timezone.now()):
+        django_rq.enqueue(restore_rendition, rendition_id)
+
+
+def ensure_original_hot(video):
+    """Move a video's original back from the cold storage before it is read.
+
+    Args:
+        video: The Video whose original is needed.
+    """
+    if video.original_tier == 'hot':
+        return
+    if cold_storage().exists(video.original_file.name):
+        move_file(cold_storage(), default_storage, video.original_file.name)
+    Video.objects.filter(original_file=video.original_file.name).update(original_tier='hot')
+    video.original_tier = 'hot'
+
+
+def hot_fallback(video_id, height):
+    """Return the best hot rendition below a height, to serve while a higher one is restored.
+
+    Args:
+        video_id (int): The ID of the video.
+        height (int): The height of the unavailable rendition.
+
+    Returns:
+        str or None: The resolution of the fallback rendition.
+    """
+    return (
+        Rendition.objects.filter(video_id=video_id, tier='hot', height__lt=height)
+        .order_by('-height')
+        .values_list('resolution', flat=True)
+        .first()
+    )
+
+
+def cold_candidates():
+    """Return the renditions and originals the tiering policy would move to cold storage.
+
+    Returns:
+        tuple: A queryset of renditions and a list of original file names.
+    """
+    now = timezone.now()
+    rendition_cutoff = now - timedelta(days=settings.TIERING_RENDITION_IDLE_DAYS)
+    original_cutoff = now - timedelta(days=settings.TIERING_ORIGINAL_IDLE_DAYS)
+
+    renditions = (
+        Rendition.objects.filter(tier='hot', video__play_count__lt=settings.TIERING_HOT_PLAY_COUNT)
+        .annotate(lowest_height=Min('video__renditions__height'))
+        .filter(height__gt=F('lowest_height'))  # The lowest rendition always stays hot as a fallback
+        .filter(
+            Q(last_played_at__lt=rendition_cutoff)
+            | Q(last_played_at__isnull=True, video__created_at__lt=rendition_cutoff)
+        )
+        .select_related('video')
+    )
+    originals = (
+        Video.objects.filter(original_tier='hot', renditions__isnull=False)
+        .filter(Q(last_played_at__lt=original_cutoff) | Q(last_played_at__isnull=True, created_at__lt=original_cutoff))
+        .exclude(original_file='')
+        .values_list('original_file', flat=True)
+        .distinct()
+    )
+    # An original shared after deduplication stays hot while any of its videos is active
+    active = set(
+        Video.objects.filter(original_file__in=list(originals))
+        .filter(Q(last_played_at__gte=original_cutoff) | Q(last_played_at__isnull=True, created_at__gte=original_cutoff))
+        .values_list('original_file', flat=True)
+    )
+    return renditions, [name for name in originals if name not in active]
+
+
+def tier_media(dry_run=False):
+    """Move idle renditions and originals to the cold storage.
+
+    Args:
+        dry_run (bool): Report what would be moved without moving it.
+
+    Returns:
+        dict: The number of renditions and originals moved and their bytes.
+    """
+    renditions, originals = cold_candidates()
+    stats = {'renditions': 0, 'originals': 0, 'bytes': 0}
+    if not dry_run:
+        stale_restores().update(tier='cold', restore_started_at=None)  # The next request queues them again
+    for rendition in renditions:
+        stats['renditions'] += 1
+        stats['bytes'] += rendition.total_bytes
+        if not dry_run:
+            freeze_rendition(rendition)
+    for name in originals:
+        if not default_storage.exists(name):
+            continue
+        stats['originals'] += 1
+        stats['bytes'] += default_storage.size(name)
+        if not dry_run:
+            freeze_original(name)
+    verb = 'would move' if dry_run else 'moved'
+    print(f"Tiering {verb} {stats['renditions']} renditions and {stats['originals']} originals "
+          f"({stats['bytes']} bytes) to cold storage")
+    return stats
+
+
+def tiering_report():
+    """Report the bytes on each tier and the hot-tier bytes saved.
+
+    Returns:
+        dict: Hot and cold rendition and original bytes, and the total saved on the hot tier.
+    """
+    hot_renditions = cold_renditions = 0
+    for tier, total in Rendition.objects.values_list('tier', 'total_bytes'):
+        if tier == 'hot':
+            hot_renditions += total
+        else:
+            cold_renditions += total
+    cold = cold_storage()
+    cold_originals = sum(
+        cold.size(name)
+        for name in Video.objects.filter(original_tier='cold').values_list('original_file', flat=True).distinct()
+        if cold.exists(name)
+    )
+    return {
+        'hot_rendition_bytes': hot_renditions,
+        'cold_rendition_bytes': cold_renditions,
+        'cold_original_bytes': cold_originals,
+        'hot_bytes_saved': cold_renditions + cold_originals,
+    }
+
+
+def tier_media_job():
+    """Apply the tiering policy and schedule the next run, also if this run fails."""
+    try:
+        tier_media()
+    finally:
+        schedule_tiering()
+
+
+def schedule_tiering():
+    """Schedule the next tiering job; requires an RQ worker started with --with-scheduler."""
+    django_rq.get_queue('default').enqueue_in(
+        timedelta(seconds=settings.TIERING_INTERVAL), tier_media_job, job_id=TIERING_JOB_ID
+    )
@@ -0,0 +1,219 @@
+"""Resumable, chunked uploads of original video files.
+
+Uploads follow the tus protocol: a client creates an upload with the total size,
+sends the file in PATCH requests carrying the offset they start at, and finalizes
+it once all bytes arrived. Chunks are streamed from the request into a partial file
+in blocks of UPLOAD_READ_SIZE, so memory stays bounded regardless of chunk size.
+A chunk may carry an `Upload-Checksum` header, in which case it is only kept if its
+digest matches. Without a checksum, the bytes received before a disconnect are kept
+and the client resumes from the offset reported by the server. Finalizing only
+moves the file among the originals and creates the video; the transcode job
+hashes it and stores it under its content hash, so identical files are kept once.
+Requests that change an upload first claim it with a short-lived Redis lock
+instead of a database row lock, so no transaction stays open while a chunk
+streams in.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import UnreadablePostError
+from django_redis import get_redis_connection
+from redis.exceptions import LockError
+from .dedupe import STAGED_ORIGINALS
+from .models import Video
+import base64
+import binascii
+import hashlib
+import os
+import time
+
+CHECKSUM_ALGORITHMS = {'md5', 'sha1', 'sha256'}  # Digests accepted in Upload-Checksum
+
+
+class UploadError(Exception):
+    """Raised when a chunk cannot be accepted; carries the HTTP status to respond with."""
+
+    def __init__(self, message, status):
+        """Store the message and status.
+
+        Args:
+            message (str): The error detail for the client.
+            status (int): The HTTP status code.
+        """
+        super().__init__(message)
+        self.status = status
+
+
+class UploadClaim:
+    """Claim an upload for one request with a Redis lock.
+
+    The lock expires after UPLOAD_LOCK_TIMEOUT seconds, so a crashed request does
+    not block the upload for good; `keepalive` extends it while a chunk streams in.
+    """
+
+    def __init__(self, upload_id):
+        """Prepare the lock of an upload.
+
+        Args:
+            upload_id: The ID of the upload.
+        """
+        self.lock = get_redis_connection('default').lock(
+            cache.make_key(f'upload_claim:{upload_id}'), timeout=settings.UPLOAD_LOCK_TIMEOUT
+        )
+        self.extended_at = 0.0
+
+    def __enter__(self):
+        """Take the lock.
+
+        Raises:
+            UploadError: If another request holds the upload.
+        """
+        if not self.lock.acquire(blocking=False):
+            raise UploadError('Another chunk is being written.', 423)
+        self.extended_at = time.monotonic()
+        return self
+
+    def __exit__(self, *exc_info):
+        """Release the lock unless it already expired."""
+        try:
+            self.lock.release()
+        except LockError:
+            pass
+
+    def keepalive(self):
+        """Extend the lock once a third of its timeout has passed."""
+        if time.monotonic() - self.extended_at > settings.UPLOAD_LOCK_TIMEOUT / 3:
+            self.lock.reacquire()
+            self.extended_at = time.monotonic()
+
+
+def partial_path(upload):
+    """Return the path of the file receiving an upload's chunks."""
+    return os.path.join(settings.MEDIA_ROOT, settings.UPLOAD_TEMP_DIR, f'{upload.pk}.part')
+
+
+def staged_name(upload):
+    """Return the storage name of a finalized upload's original until it is hashed."""
+    return f'{STAGED_ORIGINALS}{upload.pk}{os.path.splitext(upload.filename)[1].lower()}'
+
+
+def create_partial_file(upload):
+    """Create the empty partial file of a new upload."""
+    path = partial_path(upload)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    open(path, 'wb').close()
+
+
+def parse_checksum(header):
+    """Parse an `Upload-Checksum` header of the form '<algorithm> <base64 digest>'.
+
+    Args:
+        header (str): The header value, or None.
+
+    Returns:
+        tuple: The algorithm name and the raw digest, or None if no header was sent.
+
+    Raises:
+        UploadError: If the header is malformed or names an unsupported algorithm.
+    """
+    if not header:
+        return None
+    algorithm, _, encoded = header.partition(' ')
+    if algorithm not in CHECKSUM_ALGORITHMS:
+        raise UploadError('Unsupported checksum algorithm.', 400)
+    try:
+        return algorithm, base64.b64decode(encoded, validate=True)
+    except (binascii.Error, ValueError):
+        raise UploadError('Malformed checksum.', 400)
+
+
+def write_chunk(upload, stream, length, checksum=None, keepalive=None):
+    """Stream a chunk into the partial file at the upload's current offset.
+
+    The caller must hold the upload's UploadClaim and save the returned offset.
+
+    Args:
+        upload: The Upload receiving the chunk.
+        stream: A file-like object to read the chunk from.
+        length (int): The announced length of the chunk in bytes.
+        checksum (tuple, optional): The algorithm and expected digest of the chunk.
+        keepalive (callable, optional): Called after every block, e.g. UploadClaim.keepalive.
+
+    Returns:
+        int: The new offset after the chunk.
+
+    Raises:
+        UploadError: If the chunk exceeds the upload size or fails its checksum.
+    """
+    if upload.offset + length > upload.size:
+        raise UploadError('Chunk exceeds the upload size.', 413)
+    digest = hashlib.new(checksum[0]) if checksum else None
+    received = 0
+    with open(partial_path(upload), 'r+b') as f:
+        f.seek(upload.offset)
+        try:
+            while received < length:
+                block = stream.read(min(settings.UPLOAD_READ_SIZE, length - received))
+                if not block:
+                    break  # Client disconnected
+                f.write(block)
+                received += len(block)
+                if digest:
+                    digest.update(block)
+                if keepalive:
+                    keepalive()
+        except (UnreadablePostError, OSError):
+            pass  # Keep what arrived unless a checksum has to cover the whole chunk
+        if digest and (received < length or digest.digest() != checksum[1]):
+            f.truncate(upload.offset)
+            raise UploadError('Checksum mismatch.', 460)
+        f.flush()
+        os.fsync(f.fileno())  # The stored offset must never run ahead of the data on disk
+    return upload.offset + received
+
+
+def finalize_upload(upload):
+    """Turn a complete upload into a Video, which queues its transcoding.
+
+    The file is only moved, so finalizing takes the same time for any size. The
+    transcode job hashes it, stores it under its hash and deduplicates it. If the
+    video cannot be created, the partial file is kept so the upload can be
+    finalized again.
+
+    Args:
+        upload: The Upload whose bytes have all been received.
+
+    Returns:
+        Video: The created video.
+    """
+    name = staged_name(upload)
+    path = os.path.join(settings.MEDIA_ROOT, name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if os.path.exists(path):
+        os.remove(path)  # Left by an earlier attempt that failed
+    os.link(partial_path(upload), path)  # The partial file stays until the video exists
+    try:
+        with transaction.atomic():
+            video = Video.objects.create(
+                title=upload.title,
+                description=upload.description,
+                category=upload.category,
+                original_file=name,
+            )
+            upload.video = video
+            upload.save(update_fields=['video', 'updated_at'])
+    except Exception:
+        os.remove(path)
+        raise
+    os.remove(partial_path(upload))
+    return video
+
+
+def abort_upload(upload):
+    """Delete an unfinished upload and its partial file."""
+    try:
+        os.remove(partial_path(upload))
+    except FileNotFoundError:
+        pass
+    upload.delete()
@@ -0,0 +1,72 @@
+"""Per-video caching of serialized video details.
+
+This module stores one cache entry per video so that detail and batch requests
+can read many videos with a single Redis ``MGET`` (``cache.get_many``) and load
+only the cache misses from the database with one ``in_bulk`` query. Updates
+invalidate just the keys that contain the changed video.
+"""
+
+from django.core.cache import cache
+from .models import Video
+from .api.serializers import VideoSerializer
+
+VIDEO_CACHE_TIMEOUT = 300  # Cache for 5 minutes, same as the video list
+
+
+def video_cache_key(video_id):
+    """Return the cache key of a serialized video.
+
+    Args:
+        video_id (int): The ID of the video.
+
+    Returns:
+        str: The cache key for the video's details.
+    """
+    return f'video_detail:{video_id}'
+
+
+def video_list_cache_key(category_id=None):
+    """Return the cache key of the (optionally category-filtered) video list.
+
+    Args:
+        category_id (int, optional): The ID of the category filter.
+
+    Returns:
+        str: The cache key for the video list.
+    """
+    return f'video_list:category:{category_id}' if category_id else 'video_list'
+
+
+def get_serialized_videos(video_ids, request):
+    """Return serialized videos for the given IDs, reading through the cache.
+
+    Args:
+        video_ids (list[int]): The IDs of the videos, in the order to return them.
+        request: The HTTP request object, used to build absolute thumbnail URLs.
+
+    Returns:
+        list[dict]: Serialized videos in request order; unknown IDs are skipped.
+    """
+    keys = {video_cache_key(video_id): video_id for video_id in video_ids}
+    found = {keys[key]: data for key, data in cache.get_many(keys).items()}  # One MGET round trip
+    missing = [video_id for video_id in video_ids if video_id not in found]
+    if missing:
+        videos = Video.objects.select_related('category').prefetch_related('renditions').in_bulk(missing)  # One query for all misses
+        serializer = VideoSerializer(list(videos.values()), many=True, context={'request': request})
+        fresh = {data['id']: dict(data) for data in serializer.data}
+        cache.set_many({video_cache_key(video_id): data for video_id, data in fresh.items()}, timeout=VIDEO_CACHE_TIMEOUT)
+        found.update(fresh)
+    return [found[video_id] for video_id in video_ids if video_id in found]
+
+
+def invalidate_videos(video_ids, category_ids=()):
+    """Delete the cached entries that contain the given videos.
+
+    Args:
+        video_ids (Iterable[int]): The IDs of the changed videos.
+        category_ids (Iterable[int]): The IDs of the categories the videos belong or belonged to.
+    """
+    keys = [video_cache_key(video_id) for video_id in video_ids]
+    keys.append(video_list_cache_key())
+    keys.extend(video_list_cache_key(category_id) for category_id in category_ids if category_id)
+    cache.delete_many(keys)
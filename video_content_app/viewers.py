@@ -0,0 +1,114 @@
+"""Active viewer tracking and concurrent stream limits.
+
+Every stream is identified by (user, video, device), where the device is the
+playback session ID of the stream's token. Playlist and segment requests record a
+heartbeat at most once per VIEWER_HEARTBEAT_INTERVAL seconds per stream and
+process, into two Redis sorted sets scored by time: one per user of its
+(video, device) streams, and one per video of its (user, device) viewers. Entries
+older than VIEWER_TIMEOUT are considered stopped. Minting a playback token and
+every heartbeat check and claim a stream slot in one atomic Lua call, so an
+account cannot exceed MAX_CONCURRENT_STREAMS, whether it streams with playback
+tokens or with a plain JWT. Streams that are already registered keep their slot.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django_redis import get_redis_connection
+import time
+
+LOCAL_MAX_ENTRIES = 10000  # Bound on the per-process heartbeat throttle
+
+CLAIM_STREAM_SCRIPT = """
+local now, timeout, cap = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - timeout)
+if cap > 0 and not redis.call('ZSCORE', KEYS[1], ARGV[4]) and redis.call('ZCARD', KEYS[1]) >= cap then
+    return 0
+end
+redis.call('ZADD', KEYS[1], now, ARGV[4])
+redis.call('ZADD', KEYS[2], now, ARGV[5])
+redis.call('ZADD', KEYS[3], now, ARGV[6])
+redis.call('EXPIRE', KEYS[1], timeout)
+redis.call('EXPIRE', KEYS[2], timeout)
+return 1
+"""
+
+_claim_script = None
+_last_heartbeat = {}  # (user_id, video_id, device) -> monotonic time of the last heartbeat
+
+
+def user_streams_key(user_id):
+    """Return the Redis key of a user's active streams."""
+    return cache.make_key(f'viewers:user:{user_id}')
+
+
+def video_viewers_key(video_id):
+    """Return the Redis key of a video's active viewers."""
+    return cache.make_key(f'viewers:video:{video_id}')
+
+
+def active_videos_key():
+    """Return the Redis key of the videos with recent viewer activity."""
+    return cache.make_key('viewers:videos')
+
+
+def claim_stream(user_id, video_id, device):
+    """Register or refresh a stream unless it is new and the user is at the concurrent stream cap.
+
+    Args:
+        user_id (int): The ID of the user.
+        video_id (int): The ID of the video.
+        device (str): The stream's device or playback session ID.
+
+    Returns:
+        bool: True if the stream is registered, False if the cap is reached.
+    """
+    global _claim_script
+    if _claim_script is None:
+        _claim_script = get_redis_connection('default').register_script(CLAIM_STREAM_SCRIPT)
+    claimed = _claim_script(
+        keys=[user_streams_key(user_id), video_viewers_key(video_id), active_videos_key()],
+        args=[time.time(), settings.VIEWER_TIMEOUT, settings.MAX_CONCURRENT_STREAMS,
+              f'{video_id}:{device}', f'{user_id}:{device}', video_id],
+    )
+    if claimed:
+        if len(_last_heartbeat) >= LOCAL_MAX_ENTRIES:
+            _last_heartbeat.clear()
+        _last_heartbeat[(user_id, video_id, device)] = time.monotonic()
+    return bool(claimed)
+
+
+def record_heartbeat(user_id, video_id, device):
+    """Record that a stream is still active, at most once per heartbeat interval.
+
+    A stream that is not registered, e.g. one that stopped sending heartbeats or
+    that plays with a JWT instead of a playback token, claims a new slot.
+
+    Args:
+        user_id (int): The ID of the user.
+        video_id (int): The ID of the video.
+        device (str): The stream's device or playback session ID.
+
+    Returns:
+        bool: False if the stream is not registered and the user is at the cap.
+    """
+    last = _last_heartbeat.get((user_id, video_id, device), float('-inf'))
+    if time.monotonic() - last < settings.VIEWER_HEARTBEAT_INTERVAL:
+        return True
+    return claim_stream(user_id, video_id, device)
+
+
+def current_viewers():
+    """Return the number of current viewers of every video with recent activity.
+
+    Returns:
+        dict: Video IDs mapped to their current viewer counts, highest first.
+    """
+    redis = get_redis_connection('default')
+    cutoff = time.time() - settings.VIEWER_TIMEOUT
+    redis.zremrangebyscore(active_videos_key(), '-inf', cutoff)
+    video_ids = [int(video_id) for video_id in redis.zrange(active_videos_key(), 0, -1)]
+    pipe = redis.pipeline(transaction=False)
+    for video_id in video_ids:
+        pipe.zcount(video_viewers_key(video_id), cutoff, '+inf')
+    counts = {video_id: count for video_id, count in zip(video_ids, pipe.execute()) if count}
+    return dict(sorted(counts.items(), key=lambda item: item[1], reverse=True))